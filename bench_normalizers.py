@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Reference-level estimator check: does each normalizer follow the signal level?
+
+Feeds every estimator in common.normalize frames of random magnitudes whose
+level steps up by ``--factor`` and, separately, down by the same factor, and
+reports how many frames it takes to get within ``--tolerance`` of the level
+it reaches on the new signal, plus the update cost. Exits non-zero when an
+estimator doesn't get there within ``--max-frames`` in either direction, so a
+reference that only follows rises (and leaves visualizers dark after a loud
+passage) fails.
+
+    python bench_normalizers.py
+    python bench_normalizers.py --bins 1024 --json
+"""
+
+import argparse
+import json
+import sys
+import time
+import numpy as np
+
+from common.normalize import NORMALIZERS, make_normalizer
+
+LOUD = 1e5
+
+
+def frames_at(rng, level, count, bins):
+    """Exponentially distributed magnitudes with a little frame-to-frame gain wobble"""
+    gain = rng.uniform(0.5, 1.5, (count, 1))
+    return rng.exponential(1.0, (count, bins)) * gain * level
+
+
+def steady_level(method, level, frames, bins, seed):
+    """Median reference a fresh estimator settles to on a constant level"""
+    estimator = make_normalizer(method)
+    rng = np.random.default_rng(seed)
+    levels = [estimator.update(v) for v in frames_at(rng, level, frames, bins)]
+    return float(np.median(levels[frames // 2:]))
+
+
+def frames_to_reach(method, before, after, frames, bins, tolerance, seed):
+    """Frames after the step until the reference is within ``tolerance`` of its steady value"""
+    target = steady_level(method, after, frames, bins, seed + 1)
+    estimator = make_normalizer(method)
+    rng = np.random.default_rng(seed)
+    for v in frames_at(rng, before, frames, bins):
+        estimator.update(v)
+    ratios = np.array([estimator.update(v) / target for v in frames_at(rng, after, frames, bins)])
+    inside = np.flatnonzero((ratios <= tolerance) & (ratios >= 1 / tolerance))
+    return int(inside[0]) if len(inside) else None
+
+
+def run_one(method, args):
+    quiet = LOUD / args.factor
+    estimator = make_normalizer(method)
+    values = frames_at(np.random.default_rng(args.seed), LOUD, 2000, args.bins)
+    start = time.perf_counter_ns()
+    for v in values:
+        estimator.update(v)
+    cost = (time.perf_counter_ns() - start) / len(values) / 1000
+    return {
+        "method": method,
+        "update_us": cost,
+        "rise_frames": frames_to_reach(method, quiet, LOUD, args.max_frames, args.bins, args.tolerance, args.seed),
+        "drop_frames": frames_to_reach(method, LOUD, quiet, args.max_frames, args.bins, args.tolerance, args.seed),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--methods", nargs="*", default=list(NORMALIZERS))
+    parser.add_argument("--bins", type=int, default=64, help="values per frame")
+    parser.add_argument("--factor", type=float, default=10.0, help="size of the level step")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="within this ratio of the steady level")
+    parser.add_argument("--max-frames", type=int, default=5000, help="frames allowed after the step")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = [run_one(method, args) for method in args.methods]
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'method':<12}{'update us':>11}{'rise':>8}{'drop':>8}")
+        for r in results:
+            rise, drop = (f"{r[k]}" if r[k] is not None else "never" for k in ("rise_frames", "drop_frames"))
+            print(f"{r['method']:<12}{r['update_us']:>11.1f}{rise:>8}{drop:>8}")
+        print(f"(frames to get within x{args.tolerance:g} after a x{args.factor:g} step; {args.bins} bins)")
+
+    failed = [r["method"] for r in results if r["rise_frames"] is None or r["drop_frames"] is None]
+    if failed:
+        print(f"Reference does not follow the level: {', '.join(failed)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Processor benchmark and detection check against synthetic ground truth.
+
+Runs every registered processor at every chunk size in possible_chunk_sizes
+over a SynthSource signal (no sound hardware, no pacing) and reports:
+
+  - per-frame processor time (p50 / p95, and how many times faster than real time)
+  - kick / snare / hat hit rate, false hits and mean detection latency
+  - onset hit rate and the tracked BPM against the synth tempo
+
+    python bench_processors.py
+    python bench_processors.py --seconds 30 --bpm 128 --processors default rfft --json
+"""
+
+import argparse
+import json
+import time
+import numpy as np
+
+from common.config import interface_configs, possible_chunk_sizes
+from common.engine import AudioEngine
+from common.processors import PROCESSORS
+
+PERCUSSION = ("kick", "snare", "hat")
+# A detection this long after a hit (plus one chunk) still counts as that hit
+TOLERANCE = 0.1
+# Percussion ratio that counts as a hit on its rising edge
+HIT_THRESHOLD = 0.5
+
+
+def match_hits(events, detections, window):
+    """(hits, false detections, latencies) matching detection positions to event positions"""
+    detections = sorted(detections)
+    used = set()
+    latencies = []
+    for event in events:
+        for i, position in enumerate(detections):
+            if i in used or position < event:
+                continue
+            if position - event <= window:
+                used.add(i)
+                latencies.append(position - event)
+            break
+    return len(latencies), len(detections) - len(used), latencies
+
+
+def run_one(engine, processor, chunk_size, seconds, signal, bpm):
+    interface_configs["bench"] = dict(interface_configs["synth_fast"], chunk_size=chunk_size, signal=signal, bpm=bpm,
+                                       record_events=True)
+    engine.initialize(interface_type="bench", processor_type=processor)
+    source = engine.stream
+    sample_rate = engine.config["sample_rate"]
+    features = engine.features
+
+    times = []
+    detections = {kind: [] for kind in PERCUSSION + ("onset",)}
+    previous = dict.fromkeys(PERCUSSION, 0.0)
+    bpm_estimates = []
+    while source.frames_read < seconds * sample_rate:
+        start = time.perf_counter_ns()
+        frame = engine.processor(engine.source, engine.config, engine.prev_fft, False)
+        engine.prev_fft = frame["prev_fft"]
+        # Lazy features are part of the cost a visualizer pays
+        values = {kind: frame[f"{kind}_energy"] for kind in PERCUSSION if f"{kind}_energy" in features}
+        onset = frame["onset"] if "onset" in features else False
+        times.append(time.perf_counter_ns() - start)
+
+        position = source.frames_read
+        for kind, value in values.items():
+            if value >= HIT_THRESHOLD > previous[kind]:
+                detections[kind].append(position)
+            previous[kind] = value
+        if onset:
+            detections["onset"].append(position)
+        if "bpm" in features:
+            bpm_estimates.append(frame["bpm"])
+
+    times = np.array(times) / 1e6
+    chunk_ms = 1000 * chunk_size / sample_rate
+    window = int((TOLERANCE + chunk_size / sample_rate) * sample_rate)
+    result = {
+        "processor": processor,
+        "chunk_size": chunk_size,
+        "frames": len(times),
+        "p50_ms": float(np.percentile(times, 50)),
+        "p95_ms": float(np.percentile(times, 95)),
+        "realtime_factor": float(chunk_ms / np.percentile(times, 50)),
+    }
+
+    truth = {kind: [p for p, k in source.events if k == kind] for kind in PERCUSSION}
+    truth["onset"] = sorted({p for p, _ in source.events})
+    for kind, events in truth.items():
+        if kind != "onset" and f"{kind}_energy" not in features or kind == "onset" and "onset" not in features:
+            continue
+        hits, false, latencies = match_hits(events, detections[kind], window)
+        result[kind] = {
+            "events": len(events),
+            "hit_rate": hits / len(events) if events else 0.0,
+            "false": false,
+            "latency_ms": float(1000 * np.mean(latencies) / sample_rate) if latencies else None,
+        }
+    if bpm_estimates:
+        # Ignore the first half while the tempo estimate settles
+        result["bpm"] = float(np.median(bpm_estimates[len(bpm_estimates) // 2:]))
+    engine.cleanup()
+    return result
+
+
+def print_table(results, bpm):
+    print(f"{'processor':<14}{'chunk':>7}{'p50 ms':>9}{'p95 ms':>9}{'xRT':>8}"
+          f"{'kick':>13}{'snare':>13}{'hat':>13}{'onset':>13}{'bpm':>7}")
+    for r in results:
+        cells = []
+        for kind in PERCUSSION + ("onset",):
+            d = r.get(kind)
+            if d is None:
+                cells.append(f"{'-':>13}")
+            else:
+                latency = f"{d['latency_ms']:.0f}ms" if d["latency_ms"] is not None else "-"
+                cells.append(f"{d['hit_rate'] * 100:>5.0f}%/{latency:>6}")
+        tempo = f"{r['bpm']:.0f}" if "bpm" in r else "-"
+        print(f"{r['processor']:<14}{r['chunk_size']:>7}{r['p50_ms']:>9.3f}{r['p95_ms']:>9.3f}"
+              f"{r['realtime_factor']:>8.0f}{''.join(cells)}{tempo:>7}")
+    print(f"(hit rate / mean latency; synth tempo {bpm:g} BPM)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=20.0, help="audio per run")
+    parser.add_argument("--signal", default="drums", help="synth signal (drums, clicks, sweep, pink)")
+    parser.add_argument("--bpm", type=float, default=120.0)
+    # Everything that analyses audio (replay only plays back a trace)
+    parser.add_argument("--processors", nargs="*", default=[p for p in PROCESSORS if p != "replay"])
+    parser.add_argument("--chunk-sizes", nargs="*", type=int, default=possible_chunk_sizes)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    engine = AudioEngine()
+    results = []
+    for processor in args.processors:
+        for chunk_size in args.chunk_sizes:
+            results.append(run_one(engine, processor, chunk_size, args.seconds, args.signal, args.bpm))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results, args.bpm)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Headless render benchmark for every visualizer in supported_visualizers.
+
+Each visualizer runs in its own process on a synthetic (or replayed) feature
+stream with no pacing, stdout going to a byte-counting sink and /dev/fb0
+replaced by a plain file. The engine times each loop_func call (see
+common/bench.py) and the results for all visualizers are printed as JSON:
+render p50/p95/p99, terminal bytes and framebuffer bytes per frame.
+
+    python bench_visualizers.py > before.json
+    python bench_visualizers.py --trace /tmp/run.trace --frames 600 > after.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from common.config import supported_visualizers
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def bench_visualizer(name, args, workdir):
+    result_path = os.path.join(workdir, f"{name}.json")
+    env = dict(os.environ)
+    env.update({
+        "VISPI_BENCH": result_path,
+        "VISPI_BENCH_FRAMES": str(args.frames),
+        "VISPI_FB": os.path.join(workdir, "fb0"),
+        "VISPI_INTERFACE": "replay_fast" if args.trace else "synth_fast",
+        "COLUMNS": str(args.cols),
+        "LINES": str(args.rows),
+    })
+    if args.trace:
+        env["VISPI_TRACE"] = os.path.abspath(args.trace)
+    else:
+        env["VISPI_SYNTH_SIGNAL"] = args.signal
+
+    try:
+        proc = subprocess.run([sys.executable, f"{name}.py"], cwd=HERE, env=env, timeout=args.timeout,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        error = None
+        if proc.returncode:
+            lines = proc.stderr.decode(errors="replace").strip().splitlines()
+            error = lines[-1] if lines else f"exit code {proc.returncode}"
+    except subprocess.TimeoutExpired:
+        error = f"timed out after {args.timeout}s"
+
+    if os.path.exists(result_path):
+        with open(result_path) as f:
+            result = json.load(f)
+    else:
+        result = {"visualizer": name, "frames": 0}
+    if error:
+        result["error"] = error
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("visualizers", nargs="*", default=supported_visualizers)
+    parser.add_argument("--frames", type=int, default=300, help="frames timed per visualizer")
+    parser.add_argument("--trace", help="replay this feature trace instead of the synth source")
+    parser.add_argument("--signal", default="drums", help="synth signal when no trace is given")
+    parser.add_argument("--cols", type=int, default=120)
+    parser.add_argument("--rows", type=int, default=40)
+    parser.add_argument("--fb-size", default="1920x1080", help="framebuffer stub geometry (16 bpp)")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.fb_size.split("x"))
+    results = []
+    with tempfile.TemporaryDirectory(prefix="vispi_bench_") as workdir:
+        # Sparse file the size of the display, so mmap and seeks land like on the device
+        with open(os.path.join(workdir, "fb0"), "wb") as f:
+            f.truncate(width * height * 2)
+        for name in args.visualizers:
+            results.append(bench_visualizer(name, args, workdir))
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
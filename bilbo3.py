@@ -1,11 +1,10 @@
 import numpy as np
-import pyaudio
 import random
 import time
-import sys
 import shutil
-from scipy.ndimage import median_filter
 from common import engine
+from common import glyphs
+from common.canvas import BrailleCanvas
 
 # === INITIALIZE ENGINE ===
 engine_data = engine.initialize(
@@ -15,15 +14,18 @@ engine_data = engine.initialize(
 )
 cols = engine_data["cols"]
 rows = engine_data["rows"]
+# Everything drawn in a frame goes out in one write when the engine flushes
+out = engine.AudioEngine.get_instance().frame_output()
 
 # === CONSTANTS ===
-wave_chars = ['▁', '▂', '▃', '▄', '▅', '▆', '▇', '█']
 RESET = "\033[0m"
 colors = [
     "\033[91m", "\033[92m", "\033[93m",
     "\033[94m", "\033[95m", "\033[96m"
 ]
 decay_chars = list(".*:,'`> &")
+# Waveform across the bottom in braille dots: two samples per cell, eight dots tall over two rows
+wave_canvas = BrailleCanvas(cols, 2)
 
 # === EXPLOSIONS ===
 explosions = [
@@ -77,16 +79,15 @@ def main_loop(data):
     samples = data["samples"]
 
     if is_silent:
-        print("\033[2J\033[H", end="")
+        out.clear()
         state["lyric_state"]["timer"] = 0
         state["lyric_state"]["fade_frames"].clear()
         state["pat_timer"] = 0
         state["explosion_active"] = False
         state["explosion_cooldown"] = 0
-        sys.stdout.flush()
         return
 
-    print("\033[2J\033[H", end="")
+    out.clear()
 
     # === CHAOS CHARACTERS ===
     if high_energy > 0.15:
@@ -98,11 +99,11 @@ def main_loop(data):
             x = random.randint(0, cols - 1)
             char = random.choice("~!@#$%^&*()_+=-▌▐▒░█▓▄▀▁▂▃▅▆")
             color = random.choice(colors)
-            print(f"\033[{y};{x}H{color}{char}{RESET}")
+            out.text(x, y, char, color)
 
     # === EXPLOSIONS ===
     if not state["explosion_active"] and state["explosion_cooldown"] <= 0:
-        if low_energy > 0.45 and total_energy > 0.4 and random.random() < 0.2:
+        if data["beat"] and total_energy > 0.4 and random.random() < 0.5:
             state["explosion_active"] = True
             state["explosion_frame"] = 0
             state["explosion_delay"] = 3
@@ -117,9 +118,7 @@ def main_loop(data):
         if state["explosion_frame"] < len(explosions):
             frame = explosions[state["explosion_frame"]]
             x, y = state["explosion_pos"]
-            for i, line in enumerate(frame):
-                if 0 <= y + i < rows:
-                    print(f"\033[{y+i};{x}H{state['explosion_color']}{line}{RESET}")
+            out.sprite(x, y, frame, state["explosion_color"], rows=rows)
             state["explosion_delay"] -= 1
             if state["explosion_delay"] <= 0:
                 state["explosion_frame"] += 1
@@ -137,9 +136,7 @@ def main_loop(data):
 
     if state["pat_timer"] > 0:
         px, py = state["pat_pos"]
-        for i, line in enumerate(pat_sprite):
-            if 0 <= py + i < rows:
-                print(f"\033[{py+i};{px}H\033[95m{line}{RESET}")
+        out.sprite(px, py, pat_sprite, "\033[95m", rows=rows)
         state["pat_timer"] -= 1
 
     # === LYRICS ===
@@ -160,7 +157,7 @@ def main_loop(data):
         })
 
     if state["lyric_state"]["timer"] > 0:
-        print(f"\033[{state['lyric_state']['y']};{state['lyric_state']['x']}H{state['lyric_state']['color']}{state['lyric_state']['text']}{RESET}")
+        out.text(state["lyric_state"]["x"], state["lyric_state"]["y"], state["lyric_state"]["text"], state["lyric_state"]["color"])
         state["lyric_state"]["timer"] -= 1
 
         if state["lyric_state"]["timer"] == 0:
@@ -172,23 +169,21 @@ def main_loop(data):
             if state["lyric_state"]["fade_frames"][i] != " ":
                 state["lyric_state"]["fade_frames"][i] = random.choice(decay_chars)
         fade_line = ''.join(state["lyric_state"]["fade_frames"])
-        print(f"\033[{state['lyric_state']['y']};{state['lyric_state']['x']}H{state['lyric_state']['color']}{fade_line}{RESET}")
+        out.text(state["lyric_state"]["x"], state["lyric_state"]["y"], fade_line, state["lyric_state"]["color"])
         if all(c == " " for c in fade_line):
             state["lyric_state"]["fade_frames"].clear()
 
     # === HUD BAR CHART UNDER LYRICS ===
     hud_bands = 8
     band_vals = np.mean(fft.reshape(hud_bands, -1), axis=1)
-    hud_chars = [' ', '▁', '▂', '▃', '▄', '▅', '▆', '█']
+    hud_chars = " ▁▂▃▄▅▆█"
     hud_height = len(hud_chars) - 1
 
     hud_y = state["lyric_state"]["y"] + 3
     hud_x = max((cols - hud_bands) // 2, 0)
 
-    for i, val in enumerate(band_vals):
-        level = min(int(val * hud_height * 1.5), hud_height)
-        char = hud_chars[level]
-        print(f"\033[{hud_y};{hud_x + i}H\033[96m{char}{RESET}")
+    bars = glyphs.row(band_vals * (hud_height * 1.5), hud_chars, hi=len(hud_chars))
+    out.text(hud_x, hud_y, bars, "\033[96m")
 
     # === ENERGY NUMBER CENTERED TOO ===
     
@@ -199,24 +194,25 @@ def main_loop(data):
     kick_x = max((cols - len(energy_label)) // 2, 0)
     # Place it just below the HUD bar chart
     kick_y = hud_y + 1
-    print(f"\033[{kick_y};{kick_x}H\033[94m{energy_label}{RESET}")
+    out.text(kick_x, kick_y, energy_label, "\033[94m")
 
     # Hat line
     hat_val_pct = int(hat_val * 100)
     hat_label = f"Hat:  {hat_val_pct:3d}%"
-    print(f"\033[{hud_y+2};{kick_x}H\033[93m{hat_label}{RESET}")
+    out.text(kick_x, hud_y + 2, hat_label, "\033[93m")
 
     # Snare line
     snare_val_pct = int(snare_val * 100)
     snare_label = f"Snare:{snare_val_pct:3d}%"
-    print(f"\033[{hud_y+3};{kick_x}H\033[95m{snare_label}{RESET}")
+    out.text(kick_x, hud_y + 3, snare_label, "\033[95m")
 
     # === ASCII WAVEFORM ===
-    wave_y = rows - 2
-    wave = samples[::len(samples)//cols][:cols]
-    norm_wave = np.interp(wave, (-30000, 30000), (0, 7)).astype(int)
-    for x, idx in enumerate(norm_wave):
-        char = wave_chars[idx]
-        print(f"\033[{wave_y};{x}H\033[92m{char}{RESET}")
-
-engine.run(engine_data, main_loop)
\ No newline at end of file
+    wave_y = rows - 3
+    wave_canvas.clear()
+    wave_canvas.trace(samples, lo=-30000, hi=30000)
+    for i, line in enumerate(wave_canvas.lines()):
+        out.text(1, wave_y + i, line, "\033[92m")
+
+# === RUN ===
+if __name__ == "__main__":
+    engine.run(engine_data, main_loop)
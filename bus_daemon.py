@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Capture/analysis daemon for the shared-memory feature bus (see common/bus.py).
+
+Owns the audio interface and runs the engine's processor, publishing every
+frame for any number of visualizers started with VISPI_INTERFACE=bus. They
+attach and detach freely; the device stays open and analysis stays on this
+process's core.
+
+    python3 bus_daemon.py                       # focusrite2i4, default processor
+    python3 bus_daemon.py --interface synth --capacity 64
+    VISPI_INTERFACE=bus python3 conway.py       # in another terminal
+"""
+
+import argparse
+import signal
+import sys
+
+from common.engine import AudioEngine
+from common.bus import BusWriter, DEFAULT_NAME
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--interface", default="focusrite2i4")
+    parser.add_argument("--processor", default="default")
+    parser.add_argument("--name", default=DEFAULT_NAME, help="shared memory block name")
+    parser.add_argument("--capacity", type=int, default=32, help="frames kept in the ring")
+    parser.add_argument("--debug", action="store_true")
+    args = parser.parse_args()
+
+    engine = AudioEngine()
+    engine.initialize(interface_type=args.interface, processor_type=args.processor, debug=args.debug)
+    writer = BusWriter(engine.features, engine.run_metadata(), args.name, args.capacity)
+    # Unlink the block on SIGTERM too, not just Ctrl-C
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    print(f"[bus_daemon] Publishing {engine.processor_type} frames from {engine.interface_type} on {args.name}")
+    try:
+        engine.run(writer.publish)
+    finally:
+        writer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+from functools import lru_cache
+import numpy as np
+from scipy.signal import get_window
+
+
+class StreamingSTFT:
+    """Short-time Fourier transform over a rolling mono sample buffer.
+
+    Samples are pushed in whatever block size the device delivers; the
+    spectrum is always taken over the newest ``window_size`` samples, so the
+    analysis rate is set by how often ``hop_size`` new samples arrive rather
+    than by the stream's chunk size.
+    """
+
+    def __init__(self, window_size: int = 4096, hop_size: int = 800, window: str = "hann"):
+        if hop_size > window_size:
+            raise ValueError(f"hop_size {hop_size} larger than window_size {window_size}")
+        self.window_size = window_size
+        self.hop_size = hop_size
+        self.window = get_window(window, window_size).astype(np.float32)
+        self.buffer = np.zeros(window_size, dtype=np.float32)
+        self.pending = 0
+
+    def push(self, samples: np.ndarray) -> int:
+        """Append new mono samples, returning how many hops completed"""
+        n = len(samples)
+        if n >= self.window_size:
+            self.buffer[:] = samples[-self.window_size:]
+        elif n:
+            self.buffer[:-n] = self.buffer[n:]
+            self.buffer[-n:] = samples
+        self.pending += n
+        hops, self.pending = divmod(self.pending, self.hop_size)
+        return hops
+
+    def spectrum(self) -> np.ndarray:
+        """Magnitude spectrum of the newest window"""
+        return np.abs(np.fft.rfft(self.buffer * self.window))
+
+
+def fold_bins(spectrum: np.ndarray, num_bins: int, group: int = 1) -> np.ndarray:
+    """First ``num_bins * group`` spectrum bins averaged in groups of ``group``"""
+    group = max(1, group)
+    return spectrum[:num_bins * group].reshape(num_bins, group).mean(axis=1)
+
+
+# Largest chunk evaluated as a direct DFT; the O(num_bins * size) product loses to
+# rfft's O(size log size) beyond this, and its tables grow with the chunk
+DFT_MAX_SIZE = 1024
+
+
+class PartialRFFT:
+    """Magnitudes of the lowest ``num_bins`` real-FFT bins with zero per-frame allocations.
+
+    Small chunks evaluate just those bins directly against precomputed float32
+    cosine/sine rows. Larger ones (over ``DFT_MAX_SIZE``) take a full rfft into
+    a preallocated spectrum buffer (numpy >= 2.0; older numpy allocates the
+    spectrum). Every other intermediate lives in a buffer allocated here once;
+    ``process`` writes through ``out=`` arguments only.
+    """
+
+    def __init__(self, size: int, num_bins: int, channels: int = 2, dtype=np.int16):
+        self.size = size
+        self.num_bins = num_bins
+        self.channels = channels
+        self.direct = size <= DFT_MAX_SIZE
+        self.mono = np.zeros(size, dtype=np.float32)
+        if self.direct:
+            phase = 2 * np.pi * np.outer(np.arange(num_bins), np.arange(size)) / size
+            self.cos = np.cos(phase).astype(np.float32)
+            self.sin = np.sin(phase).astype(np.float32)
+        else:
+            self.spectrum = np.zeros(size // 2 + 1, dtype=np.complex64)
+            try:
+                np.fft.rfft(self.mono, out=self.spectrum)
+                self.rfft_out = True
+            except TypeError:
+                self.rfft_out = False
+
+        self.raw = np.zeros(size * channels, dtype=dtype)
+        self.re = np.zeros(num_bins, dtype=np.float32)
+        self.im = np.zeros(num_bins, dtype=np.float32)
+        self.magnitude = np.zeros(num_bins, dtype=np.float32)
+        self.padded = np.zeros(num_bins + 2, dtype=np.float32)
+        self.low = np.zeros(num_bins, dtype=np.float32)
+        self.high = np.zeros(num_bins, dtype=np.float32)
+        self.filtered = np.zeros(num_bins, dtype=np.float32)
+        self.scaled = np.zeros(num_bins, dtype=np.float32)
+        self.fft = np.zeros(num_bins, dtype=np.float32)
+
+    def process(self) -> np.ndarray:
+        """Left channel of ``raw`` -> ``magnitude``"""
+        np.copyto(self.mono, self.raw[::self.channels])
+        if not self.direct:
+            spectrum = np.fft.rfft(self.mono, out=self.spectrum) if self.rfft_out else np.fft.rfft(self.mono)
+            return np.abs(spectrum[:self.num_bins], out=self.magnitude)
+        np.dot(self.cos, self.mono, out=self.re)
+        np.dot(self.sin, self.mono, out=self.im)
+        np.multiply(self.re, self.re, out=self.re)
+        np.multiply(self.im, self.im, out=self.im)
+        np.add(self.re, self.im, out=self.magnitude)
+        return np.sqrt(self.magnitude, out=self.magnitude)
+
+    def median3(self) -> np.ndarray:
+        """Size-3 median filter of ``magnitude`` into ``filtered`` (scipy 'reflect' edges)"""
+        padded = self.padded
+        padded[1:-1] = self.magnitude
+        padded[0] = self.magnitude[0]
+        padded[-1] = self.magnitude[-1]
+        left, centre, right = padded[:-2], padded[1:-1], padded[2:]
+        np.minimum(left, centre, out=self.low)
+        np.maximum(left, centre, out=self.high)
+        np.minimum(self.high, right, out=self.high)
+        return np.maximum(self.low, self.high, out=self.filtered)
+
+
+def _hz_to_mel(hz):
+    return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+
+def _mel_to_hz(mel):
+    return 700.0 * (10.0 ** (mel / 2595.0) - 1.0)
+
+
+@lru_cache(maxsize=16)
+def filterbank(sample_rate: int, window_size: int, num_bands: int, scale: str = "mel",
+               fmin: float = 40.0, fmax: float = 16000.0) -> np.ndarray:
+    """Triangular band weights, shape (num_bands, window_size // 2 + 1).
+
+    Band centres are evenly spaced on the mel or log-frequency scale, and each
+    row sums to 1 so a band is the weighted mean magnitude of its bins. Built
+    once per (sample_rate, window, bands) and reused: applying it is a single
+    matrix-vector product per frame.
+    """
+    fmax = min(fmax, sample_rate / 2)
+    if scale == "mel":
+        edges = _mel_to_hz(np.linspace(_hz_to_mel(fmin), _hz_to_mel(fmax), num_bands + 2))
+    elif scale == "log":
+        edges = np.geomspace(fmin, fmax, num_bands + 2)
+    else:
+        raise ValueError(f"Unknown band scale {scale}")
+
+    freqs = np.fft.rfftfreq(window_size, 1.0 / sample_rate)
+    weights = np.zeros((num_bands, len(freqs)), dtype=np.float32)
+    for i in range(num_bands):
+        lo, centre, hi = edges[i], edges[i + 1], edges[i + 2]
+        rising = (freqs - lo) / (centre - lo)
+        falling = (hi - freqs) / (hi - centre)
+        weights[i] = np.clip(np.minimum(rising, falling), 0, None)
+        if not weights[i].any():
+            # Low bands narrower than one FFT bin take the nearest bin
+            weights[i, np.argmin(np.abs(freqs - centre))] = 1.0
+    weights /= weights.sum(axis=1, keepdims=True)
+    # Read-only: the cached array is shared by every caller
+    weights.flags.writeable = False
+    return weights
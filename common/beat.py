@@ -0,0 +1,123 @@
+import numpy as np
+
+
+class BeatTracker:
+    """Spectral-flux onsets, tempo from onset autocorrelation, and a beat clock.
+
+    Everything runs incrementally, one spectrum per ``update``:
+
+    - flux: summed positive change of the log-compressed spectrum
+    - onset: flux above an adaptive threshold (mean + ``sensitivity`` * std of
+      the last ``threshold_seconds``), with a refractory gap
+    - bpm: the autocorrelation of the onset-strength signal is kept as a
+      running, exponentially decaying sum, updated only for the lags in the
+      tempo range, and its best lag (weighted towards ``prior_bpm``) gives
+      the period
+    - confidence: the autocorrelation at that lag relative to the onset
+      strength's own (lag 0) energy; near 1 for a steady pulse, near 0 for
+      noise. ``bpm`` stays 0 while it is below ``min_confidence``
+    - beat / beat_phase: a phase clock advanced by 1 / period per frame and
+      pulled towards detected onsets; ``beat`` is True on the frame the
+      phase wraps, once there is a confident tempo
+    """
+
+    def __init__(self, frame_rate: float, min_bpm: float = 70, max_bpm: float = 180,
+                 prior_bpm: float = 120, threshold_seconds: float = 0.5, sensitivity: float = 1.5,
+                 acf_decay: float = 0.995, phase_pull: float = 0.2, min_confidence: float = 0.3):
+        self.frame_rate = frame_rate
+        self.min_confidence = min_confidence
+        self.sensitivity = sensitivity
+        self.acf_decay = acf_decay
+        self.phase_pull = phase_pull
+        self.refractory = max(1, int(frame_rate * 0.1))
+
+        # Lags (in frames) covering the tempo range, and a log-normal tempo prior
+        self.lags = np.arange(max(1, int(frame_rate * 60 / max_bpm)), int(np.ceil(frame_rate * 60 / min_bpm)) + 1)
+        lag_bpm = 60 * frame_rate / self.lags
+        self.prior = np.exp(-0.5 * (np.log2(lag_bpm / prior_bpm) / 0.5) ** 2)
+
+        self.history = np.zeros(self.lags[-1] + 1)
+        self.lag_index = np.zeros(len(self.lags), dtype=np.intp)
+        self.lagged = np.zeros(len(self.lags))
+        self.acf = np.zeros(len(self.lags))
+        self.energy = 0.0
+        self.weighted = np.zeros(len(self.lags))
+        self.flux_window = np.zeros(max(2, int(frame_rate * threshold_seconds)))
+
+        self.log_spectrum = None
+        self.prev_log = None
+        self.frame = 0
+        self.last_onset = -self.refractory
+
+        self.flux = 0.0
+        self.onset = False
+        self.beat = False
+        self.beat_phase = 0.0
+        self.period = 60 * frame_rate / prior_bpm
+        self.bpm = 0.0
+        self.confidence = 0.0
+
+    def update(self, spectrum: np.ndarray):
+        if self.log_spectrum is None or len(spectrum) != len(self.log_spectrum):
+            self.log_spectrum = np.zeros(len(spectrum))
+            self.prev_log = np.zeros(len(spectrum))
+
+        # === Spectral flux ===
+        np.log1p(spectrum, out=self.log_spectrum)
+        np.subtract(self.log_spectrum, self.prev_log, out=self.prev_log)
+        np.maximum(self.prev_log, 0, out=self.prev_log)
+        flux = float(self.prev_log.sum()) / len(spectrum)
+        self.log_spectrum, self.prev_log = self.prev_log, self.log_spectrum
+
+        # === Adaptive threshold ===
+        window = self.flux_window
+        mean = float(window.mean())
+        threshold = mean + self.sensitivity * float(window.std())
+        window[self.frame % len(window)] = flux
+        self.flux = flux
+        self.onset = (
+            flux > threshold and flux > 1e-3 and
+            self.frame - self.last_onset >= self.refractory
+        )
+        if self.onset:
+            self.last_onset = self.frame
+
+        # === Incremental onset autocorrelation ===
+        strength = max(flux - mean, 0.0)
+        size = len(self.history)
+        self.history[self.frame % size] = strength
+        np.subtract(self.frame, self.lags, out=self.lag_index)
+        np.mod(self.lag_index, size, out=self.lag_index)
+        np.take(self.history, self.lag_index, out=self.lagged)
+        self.lagged *= strength
+        self.acf *= self.acf_decay
+        self.acf += self.lagged
+        self.energy = self.energy * self.acf_decay + strength * strength
+
+        np.multiply(self.acf, self.prior, out=self.weighted)
+        best = int(self.weighted.argmax())
+        if self.weighted[best] > 0:
+            lag = float(self.lags[best])
+            if 0 < best < len(self.lags) - 1:
+                # Parabolic interpolation for a sub-frame period
+                a, b, c = self.weighted[best - 1], self.weighted[best], self.weighted[best + 1]
+                denom = a - 2 * b + c
+                if denom:
+                    lag += 0.5 * (a - c) / denom
+            self.period = 0.9 * self.period + 0.1 * lag
+            self.confidence = min(float(self.acf[best]) / (self.energy + 1e-12), 1.0)
+        else:
+            self.confidence = 0.0
+        # Without a confident tempo the period is just the prior: no bpm, no beats
+        locked = self.confidence >= self.min_confidence
+        self.bpm = 60 * self.frame_rate / self.period if locked else 0.0
+
+        # === Beat clock ===
+        phase = self.beat_phase + 1 / self.period
+        if self.onset:
+            # Pull the clock towards the onset: error is distance to the nearest beat
+            error = phase - round(phase)
+            phase -= self.phase_pull * error
+        self.beat = locked and phase >= 1.0
+        self.beat_phase = phase % 1.0
+        self.frame += 1
@@ -0,0 +1,90 @@
+"""
+Render benchmark hook for AudioEngine.run (see bench_visualizers.py).
+
+With VISPI_BENCH=<path> set, the engine times every ``loop_func`` call (plus
+the stdout flush) for VISPI_BENCH_FRAMES frames, sends stdout to a sink that
+only counts bytes, and writes the results to <path> as JSON when the run ends.
+"""
+
+import io
+import json
+import os
+import sys
+import time
+import numpy as np
+
+from . import framebuffer
+
+
+class _CountingSink(io.RawIOBase):
+    def __init__(self):
+        self.bytes = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.bytes += len(data)
+        return len(data)
+
+
+class RenderBench:
+    def __init__(self, path: str, frames: int = 300):
+        self.path = path
+        self.frames = frames
+        self.times = np.zeros(frames)
+        self.count = 0
+        self.sink = _CountingSink()
+        # Same text layer as a real terminal, so encoding cost is still paid
+        self.stdout = io.TextIOWrapper(io.BufferedWriter(self.sink), encoding="utf-8")
+        self.real_stdout = None
+        self.started = None
+        self.t0 = 0
+
+    @property
+    def done(self):
+        return self.count >= self.frames
+
+    def start(self):
+        self.real_stdout = sys.stdout
+        sys.stdout = self.stdout
+        self.started = time.perf_counter()
+
+    def frame_start(self):
+        self.t0 = time.perf_counter_ns()
+
+    def frame_end(self):
+        self.times[self.count] = (time.perf_counter_ns() - self.t0) / 1e6
+        self.count += 1
+
+    def report(self, **extra) -> dict:
+        """Write the results to ``path`` and restore stdout"""
+        self.stdout.flush()
+        if self.real_stdout:
+            sys.stdout = self.real_stdout
+        times = self.times[:self.count]
+        elapsed = time.perf_counter() - self.started if self.started else 0.0
+        result = dict(extra)
+        result.update({
+            "frames": self.count,
+            "elapsed_s": elapsed,
+            "render_p50_ms": float(np.percentile(times, 50)) if self.count else None,
+            "render_p95_ms": float(np.percentile(times, 95)) if self.count else None,
+            "render_p99_ms": float(np.percentile(times, 99)) if self.count else None,
+            "render_max_ms": float(times.max()) if self.count else None,
+            "stdout_bytes": self.sink.bytes,
+            "stdout_bytes_per_frame": self.sink.bytes / self.count if self.count else 0.0,
+            "fb_bytes": framebuffer.counters["bytes"],
+            "fb_bytes_per_frame": framebuffer.counters["bytes"] / self.count if self.count else 0.0,
+        })
+        with open(self.path, "w") as f:
+            json.dump(result, f, indent=2)
+        return result
+
+
+def from_env():
+    """A RenderBench when VISPI_BENCH is set, else None"""
+    path = os.environ.get("VISPI_BENCH")
+    if not path:
+        return None
+    return RenderBench(path, int(os.environ.get("VISPI_BENCH_FRAMES", 300)))
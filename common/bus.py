@@ -0,0 +1,178 @@
+"""
+Shared-memory feature bus: one analysis process, any number of visualizers.
+
+``bus_daemon.py`` runs the engine against the audio interface and publishes
+every processed frame into a ring of fixed-size records (the trace record
+layout from common/trace.py) in a ``multiprocessing.shared_memory`` block.
+Visualizers started with ``VISPI_INTERFACE=bus`` attach as readers and get
+each new frame as zero-copy numpy views, with no audio device or FFT of
+their own.
+
+Block layout:
+
+    header      uint64[4]: magic, capacity, record size, last published sequence
+    metadata    JSON (dtype, features, rates), NUL padded to METADATA_SIZE
+    sequences   uint64[capacity]: sequence held by each slot, 0 while being written
+    records     capacity records
+
+The writer zeroes a slot's sequence while it fills the record and sets it
+once the record is complete. A reader takes the newest published sequence
+and uses its slot only if the slot holds that sequence, else it retries with
+the newest again. Views stay valid until the writer comes round to the slot
+again, ``capacity`` frames later.
+"""
+
+import json
+import time
+import numpy as np
+from multiprocessing import shared_memory, resource_tracker
+
+from .trace import recorded_features, record_dtype, dtype_from_descr, fill_record, TraceFrame
+
+DEFAULT_NAME = "vispi_features"
+MAGIC = 0x56495350_49425553  # "VISPIBUS"
+HEADER_SIZE = 32
+METADATA_SIZE = 4096
+
+
+def _attach(name):
+    """Attach to an existing block without this process's resource tracker unlinking it on exit"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 always registers; undo it so only the daemon owns the block
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+class _Layout:
+    def __init__(self, buf, capacity, dtype):
+        self.header = np.ndarray(4, dtype=np.uint64, buffer=buf)
+        self.sequences = np.ndarray(capacity, dtype=np.uint64, buffer=buf, offset=HEADER_SIZE + METADATA_SIZE)
+        self.records = np.ndarray(capacity, dtype=dtype, buffer=buf,
+                                  offset=HEADER_SIZE + METADATA_SIZE + 8 * capacity)
+
+    @staticmethod
+    def size(capacity, dtype):
+        return HEADER_SIZE + METADATA_SIZE + capacity * (8 + dtype.itemsize)
+
+
+class BusWriter:
+    """Publishes engine frames into the shared ring (the block is created on the first frame)"""
+
+    def __init__(self, features, metadata=None, name: str = DEFAULT_NAME, capacity: int = 32):
+        self.name = name
+        self.capacity = capacity
+        self.features = recorded_features(features)
+        self.metadata = dict(metadata or {})
+        self.shm = None
+        self.layout = None
+        self.sequence = 0
+        self.started = time.perf_counter()
+
+    def _create(self, frame):
+        dtype = record_dtype(self.features, frame)
+        self.metadata.update(features=self.features, dtype=dtype.descr, capacity=self.capacity)
+        metadata = json.dumps(self.metadata).encode()
+        if len(metadata) > METADATA_SIZE:
+            raise ValueError(f"Bus metadata is {len(metadata)} bytes (max {METADATA_SIZE})")
+        try:
+            # A block left behind by a daemon that was killed
+            stale = _attach(self.name)
+            stale.close()
+            stale.unlink()
+        except FileNotFoundError:
+            pass
+        self.shm = shared_memory.SharedMemory(name=self.name, create=True, size=_Layout.size(self.capacity, dtype))
+        self.layout = _Layout(self.shm.buf, self.capacity, dtype)
+        self.shm.buf[HEADER_SIZE:HEADER_SIZE + len(metadata)] = metadata
+        self.layout.sequences[:] = 0
+        self.layout.header[:] = (MAGIC, self.capacity, dtype.itemsize, 0)
+
+    def publish(self, frame):
+        if self.shm is None:
+            self._create(frame)
+        self.sequence += 1
+        slot = self.sequence % self.capacity
+        sequences = self.layout.sequences
+        sequences[slot] = 0
+        fill_record(self.layout.records[slot], self.features, frame, time.perf_counter() - self.started)
+        sequences[slot] = self.sequence
+        self.layout.header[3] = self.sequence
+
+    def close(self):
+        if self.shm:
+            self.layout = None
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+
+class BusReader:
+    """Attaches to a running daemon's ring and returns each new frame as views into it.
+
+    Stands in for the engine's stream like ``TraceReplayer``. ``next_frame``
+    blocks until the daemon publishes a newer frame (so the daemon paces the
+    visualizer) and raises ``EOFError`` if none arrives within ``timeout``.
+    """
+
+    def __init__(self, name: str = DEFAULT_NAME, timeout: float = 2.0, attach_timeout: float = 10.0):
+        self.name = name
+        self.timeout = timeout
+        deadline = time.perf_counter() + attach_timeout
+        while True:
+            try:
+                self.shm = _attach(name)
+                magic = int(np.ndarray(1, dtype=np.uint64, buffer=self.shm.buf)[0])
+                if magic == MAGIC:
+                    break
+                # Daemon is still setting the block up
+                self.shm.close()
+            except FileNotFoundError:
+                pass
+            if time.perf_counter() > deadline:
+                raise RuntimeError(f"No feature bus {name} (is bus_daemon.py running?)")
+            time.sleep(0.05)
+
+        raw = bytes(self.shm.buf[HEADER_SIZE:HEADER_SIZE + METADATA_SIZE]).rstrip(b"\0")
+        self.metadata = json.loads(raw)
+        capacity = self.metadata["capacity"]
+        self.layout = _Layout(self.shm.buf, capacity, dtype_from_descr(self.metadata["dtype"]))
+        self.features = tuple(self.metadata["features"]) + (("prev_fft",) if "fft" in self.metadata["features"] else ())
+        self.capacity = capacity
+        self.last = int(self.layout.header[3])
+        self.skipped = 0
+
+    def next_frame(self) -> TraceFrame:
+        header, sequences = self.layout.header, self.layout.sequences
+        give_up = time.perf_counter() + self.timeout
+        while True:
+            newest = int(header[3])
+            if newest > self.last:
+                slot = newest % self.capacity
+                if int(sequences[slot]) == newest:
+                    self.skipped += newest - self.last - 1
+                    self.last = newest
+                    return TraceFrame(self.layout.records[slot], self.features)
+                # Being rewritten right now; the next pass sees a newer sequence
+                continue
+            if time.perf_counter() > give_up:
+                raise EOFError(f"Feature bus {self.name}: no frames for {self.timeout}s")
+            time.sleep(0.001)
+
+    def is_active(self):
+        return True
+
+    def stop_stream(self):
+        pass
+
+    def close(self):
+        if self.shm:
+            self.layout = None
+            try:
+                self.shm.close()
+            except BufferError:
+                # A frame handed to the visualizer still views the block; it goes at exit
+                pass
+            self.shm = None
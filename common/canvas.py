@@ -0,0 +1,171 @@
+"""
+Sub-cell pixel canvases for terminal visualizers.
+
+A terminal cell can show more than one pixel:
+
+- ``BrailleCanvas``: 2x4 on/off dots per cell (U+2800 braille patterns),
+  eight times the resolution of one value per cell, in one color.
+- ``HalfBlockCanvas``: 1x2 colored pixels per cell ('▀' with the top pixel
+  as foreground and the bottom one as background).
+
+Both keep a numpy ``pixels`` array (``height`` x ``width``) to draw into and
+pack it into cells in a few array operations: a braille cell's dots are the
+bits of its codepoint, so packing is a weighted sum over each 4x2 block.
+
+    canvas = BrailleCanvas(cols, rows)
+    canvas.fill_columns(fft)                       # spectrum, 0..1 per pixel column
+    canvas.trace(samples, lo=-30000, hi=30000)     # waveform as a connected line
+    print("\\r\\n".join(canvas.lines()))
+    canvas.draw(renderer, x, y, fg=96)             # or into a CellRenderer
+
+Values are scaled from lo..hi to the canvas height and resampled to its
+width, so any length of FFT or sample array can be drawn.
+"""
+
+import numpy as np
+from .renderer import RESET, Attributes, encode_row
+
+# Braille dot bits by position in the 4x2 block
+BRAILLE_BITS = np.array([[0x01, 0x08],
+                         [0x02, 0x10],
+                         [0x04, 0x20],
+                         [0x40, 0x80]], dtype=np.uint32)
+BRAILLE_BASE = 0x2800
+UPPER, LOWER, FULL = ord("▀"), ord("▄"), ord("█")
+
+
+class _Canvas:
+    CELL_W = CELL_H = 1
+    DTYPE = bool
+
+    def __init__(self, cols: int, rows: int):
+        self.cols, self.rows = cols, rows
+        self.width, self.height = cols * self.CELL_W, rows * self.CELL_H
+        self.pixels = np.zeros((self.height, self.width), dtype=self.DTYPE)
+        # Pixel row index counted from the bottom, for filling columns
+        self._from_bottom = np.arange(self.height - 1, -1, -1)[:, None]
+        self._y = np.arange(self.height)[:, None]
+
+    def clear(self):
+        self.pixels[:] = 0
+
+    def _fit(self, values, lo: float, hi: float) -> np.ndarray:
+        """``values`` resampled to one per pixel column, scaled to 0..height"""
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) != self.width:
+            values = values[np.linspace(0, len(values) - 1, self.width).astype(np.intp)]
+        return np.clip((values - lo) * (self.height / (hi - lo)), 0, self.height)
+
+    # === Drawing ===
+    def fill_columns(self, values, lo: float = 0.0, hi: float = 1.0, value=1):
+        """Bars: each pixel column filled from the bottom to its value.
+
+        ``value`` is what filled pixels are set to: a color index, or an array
+        with one per pixel row (top first) for a vertical gradient.
+        """
+        heights = self._fit(values, lo, hi).astype(np.intp)
+        mask = self._from_bottom < heights[None, :]
+        self._set(mask, value)
+
+    def trace(self, values, lo: float = 0.0, hi: float = 1.0, value=1):
+        """A connected line through one point per pixel column"""
+        ys = np.clip(self.height - 1 - self._fit(values, lo, hi).astype(np.intp), 0, self.height - 1)
+        # Join each point to the previous column's so steep edges stay continuous
+        prev = np.concatenate((ys[:1], ys[:-1]))
+        low, high = np.minimum(ys, prev), np.maximum(ys, prev)
+        mask = (self._y >= low[None, :]) & (self._y <= high[None, :])
+        self._set(mask, value)
+
+    def _set(self, mask, value):
+        if np.ndim(value):
+            value = np.broadcast_to(np.asarray(value)[:, None], mask.shape)
+            self.pixels[mask] = value[mask]
+        else:
+            self.pixels[mask] = value
+
+
+class BrailleCanvas(_Canvas):
+    CELL_W, CELL_H = 2, 4
+
+    def codes(self) -> np.ndarray:
+        """Codepoint per cell (rows x cols); empty cells are spaces"""
+        blocks = self.pixels.reshape(self.rows, 4, self.cols, 2)
+        bits = (blocks * BRAILLE_BITS[:, None, :]).sum(axis=(1, 3), dtype=np.uint32)
+        return np.where(bits, BRAILLE_BASE + bits, 32).astype(np.uint32)
+
+    def lines(self) -> list:
+        text = self.codes().tobytes().decode("utf-32-le")
+        return [text[i:i + self.cols] for i in range(0, len(text), self.cols)]
+
+    def draw(self, renderer, x: int = 0, y: int = 0, fg: int = 0):
+        """Copy into a CellRenderer's back buffer at cell (x, y), 0-based; clipped to the screen"""
+        window = _clip(renderer, x, y, self.cols, self.rows)
+        if window:
+            (ry, rx), (cy, cx) = window
+            back = renderer.back
+            back.chars[ry, rx] = self.codes()[cy, cx].view("<U1")
+            back.fg[ry, rx] = fg
+            back.bg[ry, rx] = 0
+
+
+class HalfBlockCanvas(_Canvas):
+    """Two pixels per cell; a pixel is an index into ``colors`` (0 is off)"""
+
+    CELL_W, CELL_H = 1, 2
+    DTYPE = np.uint8
+
+    def __init__(self, cols: int, rows: int, colors=(91, 92, 93, 94, 95, 96, 97)):
+        super().__init__(cols, rows)
+        # Foreground SGR code per color index
+        self.colors = np.array((0,) + tuple(colors), dtype=np.int16)
+        self._sgr = Attributes()
+
+    def cells(self):
+        """(codepoints, fg, bg) per cell: '▀'/'▄'/'█' with the lit pixels' colors"""
+        top, bottom = self.pixels[0::2], self.pixels[1::2]
+        fg_top, fg_bottom = self.colors[top], self.colors[bottom]
+        codes = np.full(top.shape, 32, dtype=np.uint32)
+        fg = np.zeros(top.shape, dtype=np.int16)
+        bg = np.zeros(top.shape, dtype=np.int16)
+        same = top == bottom
+        only_bottom = (top == 0) & (bottom != 0)
+        upper = ~same & ~only_bottom
+        codes[same & (top != 0)] = FULL
+        codes[only_bottom] = LOWER
+        codes[upper] = UPPER
+        fg[:] = np.where(only_bottom, fg_bottom, fg_top)
+        # Background SGR is the foreground code + 10; only where both pixels are lit
+        both = upper & (bottom != 0)
+        bg[both] = fg_bottom[both] + 10
+        return codes, fg, bg
+
+    def lines(self) -> list:
+        """One string per cell row, each starting and ending in the default colors"""
+        codes, fg, bg = self.cells()
+        text = codes.tobytes().decode("utf-32-le")
+        keys = (fg.astype(np.int32) << 8) | bg
+        lines = []
+        for y in range(self.rows):
+            line, current = encode_row(text[y * self.cols:(y + 1) * self.cols], keys[y], self._sgr)
+            lines.append(line + RESET if current else line)
+        return lines
+
+    def draw(self, renderer, x: int = 0, y: int = 0):
+        """Copy into a CellRenderer's back buffer at cell (x, y), 0-based; clipped to the screen"""
+        window = _clip(renderer, x, y, self.cols, self.rows)
+        if window:
+            (ry, rx), (cy, cx) = window
+            codes, fg, bg = self.cells()
+            back = renderer.back
+            back.chars[ry, rx] = codes[cy, cx].view("<U1")
+            back.fg[ry, rx] = fg[cy, cx]
+            back.bg[ry, rx] = bg[cy, cx]
+
+
+def _clip(renderer, x, y, cols, rows):
+    """((screen rows, cols), (canvas rows, cols)) slices of the visible overlap, or None"""
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + cols, renderer.cols), min(y + rows, renderer.rows)
+    if x0 >= x1 or y0 >= y1:
+        return None
+    return (slice(y0, y1), slice(x0, x1)), (slice(y0 - y, y1 - y), slice(x0 - x, x1 - x))
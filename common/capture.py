@@ -0,0 +1,85 @@
+import numpy as np
+try:
+    import pyaudio
+except ImportError:
+    pyaudio = None
+
+
+class CaptureRing:
+    """Preallocated ring buffer fed by the PyAudio stream callback.
+
+    There is exactly one writer (the PortAudio callback thread) and one reader
+    (the engine loop), so no lock is taken: the writer copies the new block into
+    the ring and only then publishes it by advancing ``write_pos``. The reader
+    snapshots ``write_pos`` and copies the newest window behind it, retrying if
+    the writer lapped it during the copy. A read still lapped after the last
+    retry returns a block that may be torn and counts as an ``overrun``.
+    """
+
+    def __init__(self, frames: int, channels: int, dtype=np.int16):
+        self.frames = frames
+        self.channels = channels
+        self.size = frames * channels
+        self.buffer = np.zeros(self.size, dtype=dtype)
+        # Total samples ever written / last position handed to the reader
+        self.write_pos = 0
+        self.read_pos = 0
+        self.overflows = 0
+        self.reported_overflows = 0
+        # Reads the writer lapped on every attempt: the block handed out may mix two periods
+        self.overruns = 0
+        self.callbacks = 0
+
+    def callback(self, in_data, frame_count, time_info, status):
+        """PyAudio ``stream_callback``: copy the block in and publish it"""
+        if status & pyaudio.paInputOverflow:
+            self.overflows += 1
+        incoming = np.frombuffer(in_data, dtype=self.buffer.dtype)
+        n = incoming.size
+        if n > self.size:
+            incoming = incoming[-self.size:]
+            n = self.size
+
+        start = self.write_pos % self.size
+        first = min(n, self.size - start)
+        self.buffer[start:start + first] = incoming[:first]
+        if first < n:
+            self.buffer[:n - first] = incoming[first:]
+
+        self.write_pos += n
+        self.callbacks += 1
+        return (None, pyaudio.paContinue)
+
+    def pending(self) -> int:
+        """Frames written since the last read"""
+        return (self.write_pos - self.read_pos) // self.channels
+
+    def read_into(self, out: np.ndarray) -> np.ndarray:
+        """Copy the newest ``out.size`` interleaved samples into ``out`` without blocking"""
+        n = out.size
+        if n > self.size:
+            raise ValueError(f"Window of {n} samples exceeds ring of {self.size}")
+
+        for _ in range(3):
+            end = self.write_pos
+            start = (end - n) % self.size
+            first = min(n, self.size - start)
+            out[:first] = self.buffer[start:start + first]
+            if first < n:
+                out[first:] = self.buffer[:n - first]
+            # The copy is only torn if the writer advanced into our window meanwhile
+            if self.write_pos - end <= self.size - n:
+                break
+        else:
+            self.overruns += 1
+
+        self.read_pos = end
+        return out
+
+    def read(self, num_frames: int, exception_on_overflow: bool = False) -> bytes:
+        """Stream-compatible read: newest ``num_frames`` frames as raw bytes"""
+        if exception_on_overflow and self.overflows > self.reported_overflows:
+            self.reported_overflows = self.overflows
+            raise IOError(pyaudio.paInputOverflowed, "Input overflowed")
+        out = np.empty(num_frames * self.channels, dtype=self.buffer.dtype)
+        return self.read_into(out).tobytes()
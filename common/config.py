@@ -1,6 +1,12 @@
 import shutil
-import pyaudio
 import numpy as np
+try:
+    import pyaudio
+    PA_INT16 = pyaudio.paInt16
+except ImportError:
+    # Build boxes without PortAudio can still run the file/synth sources
+    pyaudio = None
+    PA_INT16 = 8  # pyaudio.paInt16
 
 supported_visualizers = ["fftv_pat", "routercore4", "conway", "bilbo3", "debug_energy"]
 possible_chunk_sizes = [1024, 2048, 4096, 8192, 16384]
@@ -10,7 +16,7 @@ interface_configs = {
     "default": {
         "chunk_size": 2048,
         "sample_rate": 48000,
-        "format": pyaudio.paInt16,
+        "format": PA_INT16,
         "np_format": np.int16,
         "channels": 2,
         "input_index": 1,
@@ -19,11 +25,97 @@ interface_configs = {
     "focusrite2i4": {
         "chunk_size": 2048,
         "sample_rate": 48000,
-        "format": pyaudio.paInt16,
+        "format": PA_INT16,
         "np_format": np.int16,
         "channels": 2,
         "input_index": 1,
         "output_index": 1,
+        # "blocking" reads the device inline; "callback" fills a ring buffer from PortAudio's thread
+        "capture": "callback",
+        "ring_chunks": 8,
+    },
+    # The Behringer interface pat2.py and void.py were written against
+    "behringer": {
+        "chunk_size": 1024,
+        "sample_rate": 44100,
+        "format": PA_INT16,
+        "np_format": np.int16,
+        "channels": 2,
+        "input_index": 1,
+        "output_index": 1,
+    },
+    # === Offline sources: no sound hardware needed ===
+    # Select with interface_type, or VISPI_INTERFACE=<name> for any visualizer.
+    # VISPI_AUDIO_FILE overrides "path". WAV headers override channels/sample_rate.
+    "file": {
+        "source": "file",
+        "path": "test_audio.wav",
+        "realtime": True,
+        "loop": True,
+        "chunk_size": 2048,
+        "sample_rate": 48000,
+        "format": PA_INT16,
+        "np_format": np.int16,
+        "channels": 2,
+    },
+    # Same file at full speed, for profiling and regression runs
+    "file_fast": {
+        "source": "file",
+        "path": "test_audio.wav",
+        "realtime": False,
+        "loop": False,
+        "chunk_size": 2048,
+        "sample_rate": 48000,
+        "format": PA_INT16,
+        "np_format": np.int16,
+        "channels": 2,
+        "scheduler": {"mode": "free"},
+    },
+    # Generated test signals with known hits (see SynthSource in common/sources.py).
+    # signal: "drums", "clicks", "sweep" or "pink"; VISPI_SYNTH_SIGNAL overrides it.
+    # record_events: keep every hit as ground truth in source.events (grows without bound; benchmarks only).
+    "synth": {
+        "source": "synth",
+        "signal": "drums",
+        "bpm": 120.0,
+        "realtime": True,
+        "chunk_size": 2048,
+        "sample_rate": 48000,
+        "format": PA_INT16,
+        "np_format": np.int16,
+        "channels": 2,
+    },
+    "synth_fast": {
+        "source": "synth",
+        "signal": "drums",
+        "bpm": 120.0,
+        "realtime": False,
+        "chunk_size": 2048,
+        "sample_rate": 48000,
+        "format": PA_INT16,
+        "np_format": np.int16,
+        "channels": 2,
+        "scheduler": {"mode": "free"},
+    },
+    # Recorded feature trace (see common/trace.py): no audio or FFT work at all.
+    # VISPI_TRACE overrides "path"; rates and features come from the trace itself.
+    "replay": {
+        "source": "trace",
+        "path": "features.trace",
+        "loop": True,
+    },
+    "replay_fast": {
+        "source": "trace",
+        "path": "features.trace",
+        "loop": False,
+        "scheduler": {"mode": "free"},
+    },
+    # Frames published by bus_daemon.py (see common/bus.py); the daemon paces the reader.
+    # VISPI_BUS overrides "name".
+    "bus": {
+        "source": "bus",
+        "name": "vispi_features",
+        "scheduler": {"mode": "free"},
     },
 }
 
@@ -31,6 +123,44 @@ interface_configs = {
 SMOOTHING = 0.5
 FFT_SIZE = 64
 
+# === Perceptual Bands (frame["bands"]) ===
+# "mel" or "log" spaced triangular bands over the full spectrum
+BANDS = {
+    "num_bands": 32,
+    "scale": "mel",
+    "fmin": 40.0,
+    "fmax": 16000.0,
+}
+
+# === STFT Analysis (processor_type="stft") ===
+# Window length sets frequency resolution, hop sets analysis rate:
+# 48000 / 800 = 60 frames per second, independent of chunk_size
+STFT = {
+    "window_size": 4096,
+    "hop_size": 800,
+    "window": "hann",
+}
+
+# === Frame Scheduling (see common/scheduler.py) ===
+# mode: "target" (fixed fps), "audio" (locked to incoming audio), "free" (no sleeping)
+# Sources whose reads block (devices without capture="callback", realtime file/synth)
+# default to "audio" unless the interface or initialize() sets a mode
+# late_policy: "drop", "catchup" or "stretch" when a frame overruns its deadline
+# fps: None paces at the processor's analysis rate
+SCHEDULER = {
+    "mode": "target",
+    "fps": None,
+    "late_policy": "drop",
+}
+
+# === Visualizer host transitions (see common/transition.py) ===
+# frames: length of the crossfade at each swap (0 cuts straight over)
+# style: "dissolve" (random cells, framebuffer crossfade) or "wipe" (left to right)
+TRANSITION = {
+    "frames": 12,
+    "style": "dissolve",
+}
+
 # === random loop settings ===
 min_frames = 23 * 1
 max_frames = 23 * 2
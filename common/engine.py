@@ -1,14 +1,28 @@
 import shutil
-import pyaudio
 import numpy as np
 import time
 import logging
 import os
+import tracemalloc
 from datetime import datetime
 from scipy.ndimage import median_filter
 import sys
-from .config import interface_configs, FFT_SIZE, SMOOTHING, possible_chunk_sizes, min_frames, max_frames
-from collections import defaultdict
+from .config import interface_configs, FFT_SIZE, SMOOTHING, BANDS, SCHEDULER, possible_chunk_sizes, min_frames, max_frames, pyaudio
+from .capture import CaptureRing
+from .sources import FileSource, SynthSource
+from .trace import TraceRecorder, TraceReplayer
+from .bus import BusReader
+from . import bench as render_bench
+from .timing import StageTimer
+from . import metrics
+from . import heartbeat
+from .processors import get_processor_spec
+from .frame import Frame
+from .normalize import make_normalizer
+from .beat import BeatTracker
+from .scheduler import FrameScheduler
+from .output import FrameOutput
+from .analysis import filterbank, fold_bins
 import random
 
 # Logger will be initialized conditionally
@@ -54,41 +68,6 @@ def _setup_logger(debug: bool):
 def _get_terminal_size():
     return shutil.get_terminal_size(fallback=(80, 24))
 
-class StageDebugTimer:
-    def __init__(self):
-        self.stage_times = defaultdict(float)
-        self.global_time = 0
-    
-    def get_global_time(self):
-        return time.time() - self.global_start_time
-    
-    def global_start(self):
-        self.global_start_time = time.time()
-
-    def start(self, stage_name):
-        self.stage_times[stage_name] = time.time()
-
-    def stop(self, stage_name):
-        self.stage_times[stage_name] = time.time() - self.stage_times[stage_name]
-    
-    def global_stop(self):
-        self.global_time = time.time() - self.global_start_time
-        
-        # Calculate actual FPS
-        actual_fps = 1 / self.global_time
-        
-        # Log actual times and proportions
-        logger.info("=== Stage Debug Timer ===")
-        logger.info(f"Total frame time: {self.global_time:.6f}s")
-        logger.info(f"Actual FPS: {actual_fps:.2f}")
-        
-        # Log each stage with both time and percentage
-        for stage_name, stage_time in self.stage_times.items():
-            percentage = (stage_time / self.global_time) * 100
-            logger.info(f"{stage_name}: {stage_time:.6f}s ({percentage:.1f}%)")
-        
-        logger.info("=" * 25)
-
 class AudioEngine:
     _instance = None
     _initialized = False
@@ -101,16 +80,44 @@ class AudioEngine:
     def __init__(self):
         if not self._initialized:
             self.stream = None
+            self.capture = None
+            self.source = None
             self.p = None
             self.config = None
             self.processor = None
+            self.features = ()
             self.prev_fft = None
+            self.stft = None
+            self.beat_tracker = None
+            self.analysis_rate = None
+            self.rfft = None
+            self.rfft_frame = None
             self.fps = None
             self.debug = False
+            self.scheduler = None
+            self.scheduler_options = None
+            self.timer = StageTimer()
+            self.allocations = {"peak": 0, "retained": 0, "calls": 0}
+            self.metrics = None
+            self.heartbeat = None
+            # A visualizer's CellRenderer; its output stats join the summaries and metrics
+            self.renderer = None
+            # FrameOutput from frame_output(), written out once per frame after stdout
+            self.output = None
+            # Set by vis_host.py: one engine and stream shared by every plugin it loads
+            self.hosted = False
+            self.frames_left = 0
+            self.active_visualizer = None
             self.cols = None
             self.rows = None
+            self.interface_type = None
+            self.processor_type = None
+            self.recorder = None
             # Audio processing state
             self.reference_level = 1000.0
+            self.normalizer = None
+            self.band_normalizer = None
+            self.prev_bands = None
             self.prev_percussion = {
                 'kick': 0.0,
                 'snare': 0.0, 
@@ -118,62 +125,248 @@ class AudioEngine:
             }
             self._initialized = True
     
-    def initialize(self, interface_type: str = "default", processor_type: str = "default", debug=False):
-        """Initialize the audio engine with specified parameters"""
+    def initialize(self, interface_type: str = "default", processor_type: str = "default", debug=False, normalizer=None,
+                   scheduler=None):
+        """Initialize the audio engine with specified parameters
+
+        ``normalizer`` overrides the processor's reference-level estimator
+        ("percentile", "p2", "ema_peak" or "histogram"). ``scheduler`` is a
+        dict overriding ``SCHEDULER`` from config (mode, fps, late_policy).
+
+        Inside the visualizer host (``hosted``) the stream is already open and
+        this returns the running engine unchanged.
+        """
+        if self.hosted:
+            return self
         _setup_logger(debug)
+        if self.heartbeat is None:
+            # Before the device is opened, so a hang from here on is a stall, not an unsupervised script
+            self.heartbeat = heartbeat.from_env()
+            if self.heartbeat:
+                self.heartbeat.start()
+        # Lets any visualizer run from a file (or other source) without code changes
+        interface_type = os.environ.get("VISPI_INTERFACE", interface_type)
         self.cols, self.rows = _get_terminal_size()
+        self._reset_state()
         self.stream, self.p, self.config = self._setup_audio(interface_type)
-        self.processor = self._get_processor(processor_type)
+        if self.config.get("source") in ("trace", "bus"):
+            # Frames come ready-made from the trace or the bus, whatever the visualizer asked for
+            processor_type = "replay"
+        self.interface_type = interface_type
+        self.processor_type = processor_type
+        # Processors read from the capture ring when the stream runs in callback mode
+        self.source = self.capture if self.capture else self.stream
         self.prev_fft = np.zeros(64)
         self.fps = self.config["sample_rate"] / self.config["chunk_size"] * 1.025
+        # Spectra per second of audio; the beat tracker's time base
+        self.analysis_rate = self.config["sample_rate"] / self.config["chunk_size"]
+        # Processor factories may override both (e.g. stft runs at the hop rate)
+        self.processor = self._get_processor(processor_type, normalizer)
         self.debug = debug
+        self.scheduler_options = scheduler
         
         return self
     
+    def _reset_state(self):
+        """Drop per-run analysis state so initialize() can be called again (benchmarks, source switches)"""
+        self.capture = None
+        self.stft = None
+        self.rfft = None
+        self.rfft_frame = None
+        self.beat_tracker = None
+        self.scheduler = None
+        self.prev_bands = None
+        self.prev_percussion = {'kick': 0.0, 'snare': 0.0, 'hat': 0.0}
+    
     def _setup_audio(self, interface_type: str = "default"):
         """Setup audio stream and configuration"""
+        config = dict(interface_configs[interface_type])
+        source = config.get("source", "device")
+        
+        if source == "file":
+            config["path"] = os.environ.get("VISPI_AUDIO_FILE", config["path"])
+            stream = FileSource(config["path"], config["channels"], config["sample_rate"],
+                                config["np_format"], config.get("realtime", True), config.get("loop", True))
+            config["channels"] = stream.channels
+            config["sample_rate"] = stream.sample_rate
+            if logger:
+                logger.info(f"File source: {config['path']} ({stream.frames} frames, realtime={stream.realtime})")
+            return stream, None, config
+        
+        if source == "trace":
+            config["path"] = os.environ.get("VISPI_TRACE", config["path"])
+            stream = TraceReplayer(config["path"], config.get("loop", True))
+            for key in ("sample_rate", "chunk_size", "channels"):
+                config[key] = stream.metadata[key]
+            if logger:
+                logger.info(f"Trace replay: {config['path']} ({stream.frames} frames of {', '.join(stream.features)})")
+            return stream, None, config
+        
+        if source == "bus":
+            config["name"] = os.environ.get("VISPI_BUS", config["name"])
+            stream = BusReader(config["name"])
+            for key in ("sample_rate", "chunk_size", "channels"):
+                config[key] = stream.metadata[key]
+            if logger:
+                logger.info(f"Feature bus: {config['name']} ({', '.join(stream.features)})")
+            return stream, None, config
+        
+        if source == "synth":
+            config["signal"] = os.environ.get("VISPI_SYNTH_SIGNAL", config.get("signal", "drums"))
+            stream = SynthSource(config["signal"], config["channels"], config["sample_rate"], config["np_format"],
+                                 config.get("realtime", True), config.get("bpm", 120.0),
+                                 record_events=config.get("record_events", False))
+            if logger:
+                logger.info(f"Synth source: {config['signal']} at {stream.bpm} BPM (realtime={stream.realtime})")
+            return stream, None, config
+        
+        if pyaudio is None:
+            raise RuntimeError(f"PyAudio is not installed; interface {interface_type} needs it (try VISPI_INTERFACE=file)")
         p = pyaudio.PyAudio()
-        config = interface_configs[interface_type]
+        
+        callback = None
+        if config.get("capture", "blocking") == "callback":
+            # PortAudio fills the ring from its own thread; run() never waits on the device
+            self.capture = CaptureRing(
+                config["chunk_size"] * config.get("ring_chunks", 8),
+                config["channels"],
+                config["np_format"],
+            )
+            callback = self.capture.callback
         
         stream = p.open(format=config["format"],
                         channels=config["channels"],
                         rate=config["sample_rate"],
                         input=True,
                         input_device_index=config["input_index"],
-                        frames_per_buffer=config["chunk_size"]
+                        frames_per_buffer=config["chunk_size"],
+                        stream_callback=callback
                         )
         
         return stream, p, config
     
-    def _get_processor(self, processor_type: str = "default"):
-        """Get the audio processor function"""
-        if processor_type == "default":
-            return self._default_process_audio
-        else:
-            raise ValueError(f"Processor {processor_type} not found")
+    def _get_processor(self, processor_type: str = "default", normalizer=None):
+        """Build the audio processor function registered as ``processor_type``"""
+        spec = get_processor_spec(processor_type)
+        self.features = spec.features
+        options = dict(spec.normalizer)
+        if normalizer:
+            options = {"method": normalizer}
+        self.normalizer = make_normalizer(**options)
+        self.band_normalizer = make_normalizer(**options)
+        if logger:
+            logger.info(f"Processor {spec.name} provides: {', '.join(spec.features)}")
+            logger.info(f"Normalizer: {options}")
+        return spec.build(self)
     
     def _default_process_audio(self, stream, config, prev_fft, debug):
         """Default audio processing function"""
-        SMOOTHING = 0.2
         data = stream.read(config["chunk_size"], exception_on_overflow=debug)
         samples = np.frombuffer(data, dtype=config["np_format"])[::2]
         is_silent = np.max(np.abs(samples)) < 100
 
-        fft = np.abs(np.fft.fft(samples))[:64]
-        fft = median_filter(fft, size=3)
+        spectrum = np.abs(np.fft.rfft(samples))
+        return self._spectrum_features(samples, is_silent, spectrum, prev_fft)
+    
+    def _stft_process_audio(self, stream, config, prev_fft, debug):
+        """Overlapping STFT: one analysis frame per hop instead of per device chunk"""
+        stft = self.stft
+        if self.capture:
+            # Take whatever arrived since the last frame (up to a full window)
+            num_frames = min(self.capture.pending(), stft.window_size)
+        else:
+            num_frames = stft.hop_size
+        if num_frames:
+            data = stream.read(num_frames, exception_on_overflow=debug)
+            stft.push(np.frombuffer(data, dtype=config["np_format"])[::2])
+        
+        samples = stft.buffer.copy()
+        is_silent = np.max(np.abs(samples)) < 100
+
+        # Fold the finer STFT bins back onto the default 64-bin layout so
+        # band slices (kick/snare/hat) keep their meaning
+        spectrum = stft.spectrum()
+        fft = fold_bins(spectrum, FFT_SIZE, stft.window_size // config["chunk_size"])
+        return self._spectrum_features(samples, is_silent, fft, prev_fft, spectrum)
+    
+    def _rfft_process_audio(self, stream, config, prev_fft, debug):
+        """Default pipeline on persistent float32 buffers; arrays in the output are reused every frame"""
+        SMOOTHING = 0.2
+        work = self.rfft
+        if self.capture:
+            self.capture.read_into(work.raw)
+        else:
+            data = stream.read(config["chunk_size"], exception_on_overflow=debug)
+            np.copyto(work.raw, np.frombuffer(data, dtype=config["np_format"]))
         
-        # Percentile-based normalization
-        current_95th = np.percentile(fft, 95)
-        decay_rate = 0.999  # How fast to adapt to new levels
-        self.reference_level = (
-            decay_rate * self.reference_level + 
-            (1 - decay_rate) * current_95th
-        )
+        magnitude = work.process()
+        is_silent = max(work.mono.max(), -work.mono.min()) < 100
+        filtered = work.median3()
         
-        fft = np.clip(fft / (self.reference_level + 1e-6), 0, 1)
+        self.reference_level = self.normalizer.update(filtered)
+        if self.beat_tracker:
+            self.beat_tracker.update(filtered)
         
-        low_energy = np.mean(fft[:8])
+        # Normalize into magnitude (kept for percussion), then smooth
+        # into work.fft, which still holds last frame's smoothed spectrum
+        np.multiply(filtered, 1 / (self.reference_level + 1e-6), out=magnitude)
+        np.clip(magnitude, 0, 1, out=magnitude)
+        np.multiply(work.fft, SMOOTHING, out=work.fft)
+        np.multiply(magnitude, 1 - SMOOTHING, out=work.scaled)
+        np.add(work.fft, work.scaled, out=work.fft)
+        
+        return self.rfft_frame.load(self, work.mono, is_silent, magnitude, work.fft)
+    
+    def _spectrum_features(self, samples, is_silent, spectrum, prev_fft, full_spectrum=None):
+        """Shared post-FFT stage: normalization and smoothing; energies and bands are left lazy
+
+        ``spectrum`` supplies the 64 display bins; ``full_spectrum`` (default:
+        ``spectrum``) is the whole magnitude spectrum the perceptual bands use.
+        """
+        SMOOTHING = 0.2
+        if full_spectrum is None:
+            full_spectrum = spectrum
+        fft = median_filter(spectrum[:FFT_SIZE], size=3)
+        
+        # Adaptive reference level from the processor's streaming estimator
+        self.reference_level = self.normalizer.update(fft)
+        
+        if self.beat_tracker:
+            self.beat_tracker.update(full_spectrum)
+        
+        normalized = np.clip(fft / (self.reference_level + 1e-6), 0, 1)
+        fft = SMOOTHING * prev_fft + (1 - SMOOTHING) * normalized
+
+        return Frame(self, samples, is_silent, normalized, fft, full_spectrum)
+    
+    def _band_features(self, spectrum):
+        """Perceptual bands: one product against a cached filterbank, then normalized and smoothed"""
+        SMOOTHING = 0.2
+        window_size = (len(spectrum) - 1) * 2
+        bands = filterbank(self.config["sample_rate"], window_size, **BANDS) @ spectrum
+        
+        band_reference = self.band_normalizer.update(bands)
+        bands = np.clip(bands / (band_reference + 1e-6), 0, 1)
+        
+        if self.prev_bands is None or len(self.prev_bands) != len(bands):
+            self.prev_bands = bands
+        self.prev_bands = SMOOTHING * self.prev_bands + (1 - SMOOTHING) * bands
+        return self.prev_bands
+    
+    def _get_beat_tracker(self):
+        """Beat tracker, started the first time a visualizer reads a beat feature.
 
+        From then on processors update it every frame, since onset history
+        and tempo have to be built incrementally.
+        """
+        if self.beat_tracker is None:
+            self.beat_tracker = BeatTracker(self.analysis_rate)
+            if logger:
+                logger.info(f"Beat tracking started at {self.analysis_rate:.2f} frames/s")
+        return self.beat_tracker
+    
+    def _percussion_features(self, fft, low_energy):
+        """Kick/snare/hat transient ratios from a normalized (unsmoothed) spectrum"""
         # Define frequency bands for percussion elements
         # Assuming 44.1kHz sample rate, 1024 chunk size -> each bin ≈ 43Hz
         kick_min = 1
@@ -188,75 +381,233 @@ class AudioEngine:
         prev_perc = self.prev_percussion
 
         # Calculate current energy levels for each percussion element
-        kick_energy_current = np.mean(fft[kick_range])
-        snare_energy_current = np.mean(fft[snare_range])
-        hat_energy_current = np.mean(fft[hat_range])
+        kick_energy_current = float(fft[kick_range].mean())
+        snare_energy_current = float(fft[snare_range].mean())
+        hat_energy_current = float(fft[hat_range].mean())
 
         # Transient detection: compare current vs previous energy
         # Use ratio-based detection with minimum threshold
         low_end_kick_coeff = 0.35
-        kick_ratio = np.clip(((kick_energy_current + low_energy*low_end_kick_coeff) / (prev_perc['kick'] + 1e-6))-1, 0, 1)
-        snare_ratio = np.clip((snare_energy_current / (prev_perc['snare'] + 1e-6))-1, 0, 1) 
-        hat_ratio = np.clip((hat_energy_current / (prev_perc['hat'] + 1e-6))-1, 0, 1)
+        kick_ratio = min(max(((kick_energy_current + low_energy*low_end_kick_coeff) / (prev_perc['kick'] + 1e-6))-1, 0), 1)
+        snare_ratio = min(max((snare_energy_current / (prev_perc['snare'] + 1e-6))-1, 0), 1)
+        hat_ratio = min(max((hat_energy_current / (prev_perc['hat'] + 1e-6))-1, 0), 1)
 
-        
         # Update previous energies with conditional smoothing
         perc_smoothing = 0.96
         prev_perc['kick'] = perc_smoothing * prev_perc['kick'] + (1 - perc_smoothing) * kick_energy_current
         prev_perc['snare'] = perc_smoothing * prev_perc['snare'] + (1 - perc_smoothing) * snare_energy_current
         prev_perc['hat'] = perc_smoothing * prev_perc['hat'] + (1 - perc_smoothing) * hat_energy_current
-        
-        fft = SMOOTHING * prev_fft + (1 - SMOOTHING) * fft
 
-        output = {
-            "is_silent": is_silent,
-            "samples": samples,
-            "fft": fft,
-            "prev_fft": fft.copy(),
-            "low_energy": low_energy,
-            "high_energy": np.mean(fft[32:]),
-            "total_energy": np.mean(fft),
-            "kick_energy": kick_ratio,
-            "snare_energy": snare_ratio,
-            "hat_energy": hat_ratio,
-        }
+        return kick_ratio, snare_ratio, hat_ratio
+    
+    def _scheduler_options(self) -> dict:
+        """SCHEDULER config plus the interface's and initialize()'s overrides"""
+        overrides = dict(self.config.get("scheduler", {}))
+        overrides.update(self.scheduler_options or {})
+        options = dict(SCHEDULER)
+        options.update(overrides)
+        # Blocking device reads and realtime file/synth sources already wait for
+        # their audio; on a "target" grid that wait would count as a missed deadline
+        paced_by_read = self.capture is None and getattr(self.stream, "realtime", self.p is not None)
+        if "mode" not in overrides and paced_by_read:
+            options["mode"] = "audio"
+        # No fps configured: pace at the processor's rate
+        options["fps"] = options.get("fps") or self.fps
+        return options
 
-        return output
+    @property
+    def frame_rate(self) -> float:
+        """Frames per second run() will produce: the audio's analysis rate when
+        the source paces the loop, otherwise the scheduler's target"""
+        options = self._scheduler_options()
+        return self.analysis_rate if options["mode"] == "audio" else options["fps"]
+
+    def _make_scheduler(self):
+        """Frame scheduler from SCHEDULER config plus any initialize() overrides"""
+        options = self._scheduler_options()
+        return FrameScheduler(
+            capture=self.capture,
+            frames_per_tick=int(round(self.config["sample_rate"] / self.analysis_rate)),
+            **options,
+        )
     
-    def run(self, loop_func, loop=False):
-        """Run the main audio processing loop"""
+    def run(self, loop_func, loop=False, record=None, on_expire=None):
+        """Run the main audio processing loop
+
+        ``record`` (or VISPI_RECORD) is a path to write every frame's features
+        to as a trace (see common/trace.py) for replay with the "replay" interface.
+
+        ``on_expire`` is called when ``frames_left`` runs out; it returns the
+        ``loop_func`` for the next frame (the host swaps visualizers here) and a
+        new random frame budget starts instead of the loop ending.
+        """
         global logger
         self.frames_left = random.randint(min_frames, max_frames)
-        stage_timer = StageDebugTimer()
+        timer = self.timer = StageTimer()
+        # Processor allocations since the last summary (VISPI_ALLOC=1 only)
+        self.allocations = {"peak": 0, "retained": 0, "calls": 0}
+        # tracemalloc slows every allocation, so it only ever wraps one processor call per
+        # summary interval, and that call is kept out of the stage timings
+        sample_allocations = os.environ.get("VISPI_ALLOC") == "1"
+        # Halfway into the first interval, past the first frames' one-off setup
+        next_sample = time.perf_counter() + timer.summary_interval / 2
+        scheduler = self.scheduler = self._make_scheduler()
+        record = record or os.environ.get("VISPI_RECORD")
+        if record and self.processor_type != "replay":
+            self.recorder = TraceRecorder(record, self.features, self.run_metadata(),
+                                          all_features=os.environ.get("VISPI_RECORD_ALL") == "1")
+            if logger:
+                logger.info(f"Recording features to {record}")
         if logger:
             logger.info("Starting audio engine main loop")
+        bench = render_bench.from_env()
+        if self.metrics is None:
+            try:
+                self.metrics = metrics.from_env(self)
+            except OSError as e:
+                # Metrics are an extra; a taken or unusable address must not stop the visualizer
+                message = f"Metrics disabled: {e}"
+                if logger:
+                    logger.warning(message)
+                else:
+                    print(message, file=sys.stderr)
+            if self.metrics and logger:
+                logger.info(f"Serving metrics on {self.metrics.address}")
+        if bench:
+            bench.start()
+        frame = 0
             
         try:
-            while self.frames_left > 0 or not loop:
-                stage_timer.global_start()
-                self.debug and stage_timer.start("processor")
-                proc_output = self.processor(self.stream, self.config, self.prev_fft, self.debug)
-                self.debug and stage_timer.stop("processor")
+            while (self.frames_left > 0 or not loop) and not (bench and bench.done):
+                timer.frame_start()
+                if sample_allocations and time.perf_counter() >= next_sample:
+                    next_sample = time.perf_counter() + timer.summary_interval
+                    proc_output = self._traced_processor_call()
+                    # Restart the frame clock: the traced call is not part of any timing
+                    timer.frame_start()
+                else:
+                    timer.start("processor")
+                    proc_output = self.processor(self.source, self.config, self.prev_fft, self.debug)
+                    timer.stop("processor")
                 self.prev_fft = proc_output["prev_fft"]
-                self.debug and stage_timer.start("loop_func")
+                timer.start("loop_func")
+                bench and bench.frame_start()
                 loop_func(proc_output)
-                self.debug and stage_timer.stop("loop_func")
+                timer.stop("loop_func")
+                if self.recorder:
+                    # After loop_func, so features it already read are cached on the frame
+                    self.recorder.write(proc_output)
+                timer.start("flush")
                 sys.stdout.flush()
-                self.debug and stage_timer.start("sleep")
-                if not proc_output['is_silent']:
-                    time_left = (1 / self.fps) - stage_timer.get_global_time()
-                    time.sleep(max(time_left, 0))
-                self.debug and stage_timer.stop("sleep")
-                self.debug and stage_timer.global_stop()
+                if self.output:
+                    self.output.flush()
+                timer.stop("flush")
+                bench and bench.frame_end()
+                timer.start("sleep")
+                scheduler.wait()
+                timer.stop("sleep")
+                if self.heartbeat:
+                    frame += 1
+                    self.heartbeat.beat(frame, (time.perf_counter_ns() - timer.frame_started) / 1e6)
+                timer.frame_end()
                 self.frames_left -= 1
-                self.debug and logger.info(f"Frames left: {self.frames_left}")
+                if self.frames_left <= 0 and on_expire:
+                    loop_func = on_expire()
+                    self.frames_left = random.randint(min_frames, max_frames)
+                # Aggregates only: logging every frame would distort what it measures
+                if self.debug and timer.summary_due():
+                    self._log_summary()
         except KeyboardInterrupt:
             print("Keyboard interrupt")
+        except EOFError as e:
+            # Non-looping file sources end the run
+            if logger:
+                logger.info(f"Audio source finished: {e}")
         finally:
+            if logger:
+                logger.info("At exit:")
+                self._log_summary()
+            if bench:
+                bench.report(visualizer=os.path.splitext(os.path.basename(sys.argv[0]))[0],
+                             interface=self.interface_type, processor=self.processor_type,
+                             cols=self.cols, rows=self.rows)
             self.cleanup()
     
+    def _traced_processor_call(self):
+        """One processor call under tracemalloc; its peak and retained bytes go into ``allocations``"""
+        already = tracemalloc.is_tracing()
+        if already:
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            proc_output = self.processor(self.source, self.config, self.prev_fft, self.debug)
+            after, peak = tracemalloc.get_traced_memory()
+        finally:
+            if not already:
+                tracemalloc.stop()
+        allocations = self.allocations
+        allocations["peak"] = max(allocations["peak"], peak - before)
+        allocations["retained"] += after - before
+        allocations["calls"] += 1
+        return proc_output
+
+    def run_metadata(self) -> dict:
+        """What a consumer of this engine's frames needs to know (traces, the feature bus)"""
+        return {
+            "interface": self.interface_type,
+            "processor": self.processor_type,
+            "sample_rate": self.config["sample_rate"],
+            "chunk_size": self.config["chunk_size"],
+            "channels": self.config["channels"],
+            "fps": self.fps,
+            "analysis_rate": self.analysis_rate,
+        }
+    
+    def frame_output(self) -> FrameOutput:
+        """The engine's FrameOutput (see common/output.py); run() writes it out once per frame"""
+        if self.output is None:
+            self.output = FrameOutput()
+        return self.output
+
+    def stage(self, name: str):
+        """Context manager timing a visualizer sub-step as a stage of the current frame
+
+            with engine.stage("display_grid"):
+                display_grid(grid)
+        """
+        return self.timer.stage(name)
+    
+    def _log_summary(self):
+        """Stage percentiles, scheduler and capture stats as one log entry"""
+        lines = [f"Frames left: {self.frames_left}", self.timer.format_summary(), f"Scheduler: {self.scheduler.stats()}"]
+        if self.capture:
+            lines.append(f"Capture: {self.capture.pending()} frames behind, {self.capture.overflows} overflows, "
+                         f"{self.capture.overruns} torn reads")
+        allocations = self.allocations
+        if allocations["calls"]:
+            lines.append(f"Processor allocations: {allocations['peak']} B peak, "
+                         f"{allocations['retained'] // allocations['calls']} B retained per call "
+                         f"over {allocations['calls']} sampled calls")
+            allocations.update(peak=0, retained=0, calls=0)
+        if self.renderer:
+            lines.append(f"Renderer: {self.renderer.summary()}")
+        if self.output:
+            lines.append(f"Frame output: {self.output.summary()}")
+        logger.info("=== Stage timings ===\n" + "\n".join(lines))
+    
     def cleanup(self):
         """Clean up audio resources"""
+        if self.recorder:
+            self.recorder.close()
+            self.recorder = None
+        if self.metrics:
+            self.metrics.stop()
+            self.metrics = None
+        if self.heartbeat:
+            self.heartbeat.close()
+            self.heartbeat = None
         if self.stream:
             self.stream.stop_stream()
             self.stream.close()
@@ -269,10 +620,11 @@ class AudioEngine:
         return cls()
 
 # Backward compatibility functions
-def initialize(interface_type: str = "default", processor_type: str = "default", debug=False):
+def initialize(interface_type: str = "default", processor_type: str = "default", debug=False, normalizer=None,
+               scheduler=None):
     """Backward compatibility function - creates and initializes singleton engine"""
     engine = AudioEngine()
-    engine.initialize(interface_type, processor_type, debug)
+    engine.initialize(interface_type, processor_type, debug, normalizer, scheduler)
     return {
         "cols": engine.cols,
         "rows": engine.rows,
@@ -282,6 +634,7 @@ def initialize(interface_type: str = "default", processor_type: str = "default",
         "processor": engine.processor,
         "prev_fft": engine.prev_fft,
         "fps": engine.fps,
+        "frame_rate": engine.frame_rate,
         "debug": engine.debug
     }
 
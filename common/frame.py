@@ -0,0 +1,132 @@
+class Frame:
+    """Processor output for one frame, with derived features computed on first access.
+
+    The spectrum itself (``fft``) and the percussion ratios are computed
+    eagerly because state carries them from frame to frame (smoothing, the
+    percussion running averages). Other reductions - energies and bands -
+    are only computed when a visualizer reads them, and then cached for the
+    rest of the frame.
+
+    Supports the dict-style access visualizers already use (``data["fft"]``).
+    """
+
+    __slots__ = (
+        "engine", "is_silent", "samples", "normalized", "fft", "spectrum",
+        "_low_energy", "_high_energy", "_total_energy", "_percussion", "_bands",
+    )
+
+    def __init__(self, engine, samples, is_silent, normalized, fft, spectrum=None):
+        self.load(engine, samples, is_silent, normalized, fft, spectrum)
+
+    def load(self, engine, samples, is_silent, normalized, fft, spectrum=None):
+        """(Re)fill the frame and drop cached features; lets processors reuse one instance"""
+        self.engine = engine
+        self.samples = samples
+        self.is_silent = is_silent
+        # Normalized spectrum before inter-frame smoothing (percussion uses it)
+        self.normalized = normalized
+        self.fft = fft
+        # Full-resolution magnitude spectrum, if the processor kept one
+        self.spectrum = spectrum
+        self._low_energy = None
+        self._high_energy = None
+        self._total_energy = None
+        self._bands = None
+        # Every frame, read or not, so the running averages don't depend on who reads them
+        self._percussion = engine._percussion_features(normalized, self.low_energy)
+        return self
+
+    @property
+    def prev_fft(self):
+        return self.fft
+
+    @property
+    def low_energy(self):
+        if self._low_energy is None:
+            self._low_energy = float(self.normalized[:8].mean())
+        return self._low_energy
+
+    @property
+    def high_energy(self):
+        if self._high_energy is None:
+            self._high_energy = float(self.fft[32:].mean())
+        return self._high_energy
+
+    @property
+    def total_energy(self):
+        if self._total_energy is None:
+            self._total_energy = float(self.fft.mean())
+        return self._total_energy
+
+    @property
+    def percussion(self):
+        """(kick, snare, hat) transient ratios"""
+        return self._percussion
+
+    @property
+    def bands(self):
+        """Mel/log-spaced bands (``BANDS`` in config), normalized 0-1"""
+        if self._bands is None:
+            if self.spectrum is None:
+                raise AttributeError("bands: processor keeps no full spectrum")
+            self._bands = self.engine._band_features(self.spectrum)
+        return self._bands
+
+    @property
+    def kick_energy(self):
+        return self.percussion[0]
+
+    @property
+    def snare_energy(self):
+        return self.percussion[1]
+
+    @property
+    def hat_energy(self):
+        return self.percussion[2]
+
+    # === Beat tracking (see common/beat.py) ===
+    # The tracker starts on first access and is updated by the processor every
+    # frame after that, so these reflect the current frame
+    @property
+    def onset(self):
+        return self.engine._get_beat_tracker().onset
+
+    @property
+    def beat(self):
+        return self.engine._get_beat_tracker().beat
+
+    @property
+    def beat_phase(self):
+        return self.engine._get_beat_tracker().beat_phase
+
+    @property
+    def bpm(self):
+        return self.engine._get_beat_tracker().bpm
+
+    def is_computed(self, key) -> bool:
+        """Whether reading ``key`` costs nothing beyond this frame's cheap reductions:
+        bands and beat tracking count only once something has read them"""
+        if key == "bands":
+            return self._bands is not None
+        if key in ("onset", "beat", "beat_phase", "bpm"):
+            return self.engine.beat_tracker is not None
+        return True
+
+    # === dict-style access ===
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key):
+        return key in self.engine.features
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return self.engine.features
@@ -0,0 +1,84 @@
+"""
+Framebuffer access for the visualizers that draw on the Pi's display.
+
+VISPI_FB points them at another path: headless runs and benchmarks use a
+plain file big enough for the display. While a render benchmark is running
+(VISPI_BENCH is set), bytes written through these helpers are counted in
+``counters["bytes"]``.
+"""
+
+import mmap
+import os
+
+FB_PATH = os.environ.get("VISPI_FB", "/dev/fb0")
+COUNT_WRITES = bool(os.environ.get("VISPI_BENCH"))
+
+counters = {"bytes": 0}
+
+
+class _CountingFile:
+    def __init__(self, f):
+        self.f = f
+
+    def write(self, data):
+        counters["bytes"] += len(data)
+        return self.f.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self.f, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.f.close()
+
+
+class _CountingMap:
+    def __init__(self, m):
+        self.m = m
+
+    def __setitem__(self, key, value):
+        counters["bytes"] += 1 if isinstance(value, int) else len(value)
+        self.m[key] = value
+
+    def __getitem__(self, key):
+        return self.m[key]
+
+    def __len__(self):
+        return len(self.m)
+
+    def __getattr__(self, name):
+        return getattr(self.m, name)
+
+
+def open_framebuffer(mode: str = "rb+"):
+    """The framebuffer as a file"""
+    f = open(FB_PATH, mode)
+    return _CountingFile(f) if COUNT_WRITES else f
+
+
+def map_framebuffer(size: int):
+    """The first ``size`` bytes of the framebuffer memory-mapped for writing"""
+    with open(FB_PATH, "rb+") as f:
+        m = mmap.mmap(f.fileno(), size)
+    return _CountingMap(m) if COUNT_WRITES else m
+
+
+def framebuffer_geometry():
+    """(width, height, bits per pixel) of the display from sysfs"""
+    sysfs = os.path.join("/sys/class/graphics", os.path.basename(FB_PATH))
+    with open(os.path.join(sysfs, "virtual_size")) as f:
+        width, height = (int(v) for v in f.read().strip().split(","))
+    with open(os.path.join(sysfs, "bits_per_pixel")) as f:
+        bits = int(f.read().strip())
+    return width, height, bits
+
+
+def framebuffer_size() -> int:
+    """Size of the framebuffer in bytes (a plain VISPI_FB file's size, else the display's)"""
+    size = os.path.getsize(FB_PATH)
+    if size:
+        return size
+    width, height, bits = framebuffer_geometry()
+    return width * height * bits // 8
@@ -0,0 +1,82 @@
+"""
+Vectorized value-to-glyph mapping for bars, waveforms and histograms.
+
+A palette is a string of glyphs from lowest to highest, kept as a numpy
+array of codepoints. ``levels`` turns a value array into palette indices in
+one step (uniform bins between ``lo`` and ``hi``, or explicit ``bins``
+thresholds), and a row is the indexed codepoints decoded as UTF-32, so no
+per-glyph Python runs at all.
+
+    row(fft, "blocks")                               # '▁▃█▅...'
+    row(samples, "blocks", lo=-30000, hi=30000)      # waveform
+    row(fft, " ░▒▓█", bins=[0.1, 0.3, 0.5, 0.7])     # any string is a palette
+    put(renderer.back.chars, x, y, fft, "shades")    # straight into a cell grid
+
+Values outside the range clamp to the first/last glyph.
+"""
+
+import functools
+import numpy as np
+
+PALETTES = {
+    "blocks": "▁▂▃▄▅▆▇█",
+    "shades": "░▒▓█",
+    # Braille cells filling from the bottom, two dots per level
+    "braille": "⣀⣤⣶⣿",
+}
+
+
+@functools.lru_cache(maxsize=32)
+def palette(name: str) -> np.ndarray:
+    """Codepoints of a named palette, or of ``name`` itself as a string of glyphs"""
+    chars = PALETTES.get(name, name)
+    return np.frombuffer(chars.encode("utf-32-le"), dtype=np.uint32)
+
+
+def levels(values, count: int, lo: float = 0.0, hi: float = 1.0, bins=None) -> np.ndarray:
+    """Index 0..count-1 for each value: ``count`` equal bins over lo..hi, or ``bins`` thresholds.
+
+    Thresholds are exclusive: a value must be above ``bins[i]`` to get index
+    ``i + 1``.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if bins is not None:
+        return np.minimum(np.digitize(values, bins, right=True), count - 1)
+    scaled = (values - lo) * (count / (hi - lo))
+    return np.clip(scaled, 0, count - 1).astype(np.intp)
+
+
+def codes(values, name: str = "blocks", lo: float = 0.0, hi: float = 1.0, bins=None) -> np.ndarray:
+    """Codepoint (uint32) for each value"""
+    table = palette(name)
+    return table[levels(values, len(table), lo, hi, bins)]
+
+
+def row(values, name: str = "blocks", lo: float = 0.0, hi: float = 1.0, bins=None) -> str:
+    """One glyph per value, as a string"""
+    return codes(values, name, lo, hi, bins).tobytes().decode("utf-32-le")
+
+
+def column(values, name: str = "blocks", lo: float = 0.0, hi: float = 1.0, bins=None) -> list:
+    """One glyph per value, top to bottom, as a list of single-character rows"""
+    return list(row(values, name, lo, hi, bins))
+
+
+def put(cells: np.ndarray, x: int, y: int, values, name: str = "blocks", lo: float = 0.0, hi: float = 1.0,
+        bins=None, vertical: bool = False):
+    """Write the glyphs into a ``<U1`` cell grid (e.g. ``CellRenderer.back.chars``) from column ``x``,
+    row ``y`` (0-based), along the row or down the column; clipped to the grid"""
+    glyphs = codes(values, name, lo, hi, bins).view("<U1")
+    rows, cols = cells.shape
+    if vertical:
+        if not 0 <= x < cols or y >= rows:
+            return
+        start = max(-y, 0)
+        glyphs = glyphs[start:start + rows - y - start]
+        cells[y + start:y + start + len(glyphs), x] = glyphs
+    else:
+        if not 0 <= y < rows or x >= cols:
+            return
+        start = max(-x, 0)
+        glyphs = glyphs[start:start + cols - x - start]
+        cells[y, x + start:x + start + len(glyphs)] = glyphs
@@ -0,0 +1,151 @@
+"""
+Per-frame heartbeat from the engine to a supervising process.
+
+The supervisor (launch_random.py) creates a pipe, passes the write end to the
+visualizer and sets VISPI_HEARTBEAT to its fd number. ``AudioEngine.initialize``
+announces itself with a start record as soon as it finds the fd, and
+``AudioEngine.run`` then writes one small record per frame: the frame number
+and how long the frame took. The write end is non-blocking, so a supervisor that stops
+reading costs the visualizer dropped beats, never a stalled frame.
+
+``HeartbeatMonitor`` is the supervisor's side. It wakes on every beat
+(``poll``) and reports a visualizer as "stalled" when no frame arrives for
+``stall_after`` seconds, or "slow" after ``slow_frames`` consecutive frames
+slower than ``slow_frame``. An engine visualizer that has announced itself but sends no
+first frame within ``startup_grace`` (hung opening the device, say) is
+"stalled" too. Scripts with their own PyAudio loop never use the engine and
+never write anything; after ``startup_grace`` they are "unsupervised", and
+only their exit can be detected.
+"""
+
+import os
+import select
+import struct
+import time
+
+BEAT = struct.Struct("<If")  # frame number, frame duration in ms
+# Frame number of the start record: the engine is up, no frame yet
+START = 0xFFFFFFFF
+
+
+class Heartbeat:
+    def __init__(self, fd: int):
+        self.fd = fd
+        os.set_blocking(fd, False)
+        self.dropped = 0
+
+    def start(self):
+        """Tell the supervisor this process runs on the engine, before its first frame"""
+        self._write(BEAT.pack(START, 0.0))
+
+    def beat(self, frame: int, frame_ms: float):
+        # Frame numbers wrap below START
+        self._write(BEAT.pack(frame % START, frame_ms))
+
+    def _write(self, record: bytes):
+        if self.fd is None:
+            return
+        try:
+            os.write(self.fd, record)
+        except BlockingIOError:
+            self.dropped += 1
+        except OSError:
+            # Supervisor went away; carry on unsupervised
+            self.close()
+
+    def close(self):
+        if self.fd is not None:
+            try:
+                os.close(self.fd)
+            except OSError:
+                pass
+            self.fd = None
+
+    def __bool__(self):
+        return self.fd is not None
+
+
+def from_env():
+    """A Heartbeat on the fd in VISPI_HEARTBEAT, else None"""
+    fd = os.environ.get("VISPI_HEARTBEAT")
+    if not fd:
+        return None
+    try:
+        return Heartbeat(int(fd))
+    except (ValueError, OSError):
+        return None
+
+
+class HeartbeatMonitor:
+    """Reads one visualizer's beats and judges its frame loop"""
+
+    def __init__(self, fd: int, stall_after: float = 0.5, slow_frame: float = 0.2, slow_frames: int = 5,
+                 startup_grace: float = 15.0):
+        self.fd = fd
+        os.set_blocking(fd, False)
+        self.stall_after = stall_after
+        self.slow_frame_ms = slow_frame * 1000
+        self.slow_frames = slow_frames
+        self.startup_grace = startup_grace
+        self.started = time.perf_counter()
+        self.last_beat = None
+        self.engine = False
+        self.frame = None
+        self.frame_ms = 0.0
+        self.slow_run = 0
+        self.closed = False
+        self._partial = b""
+
+    def poll(self, timeout: float) -> int:
+        """Wait up to ``timeout`` s for beats and consume them; returns how many arrived"""
+        if self.closed:
+            time.sleep(timeout)
+            return 0
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return 0
+        try:
+            data = os.read(self.fd, 4096)
+        except BlockingIOError:
+            return 0
+        if not data:
+            # Every write end closed: the visualizer has exited
+            self.closed = True
+            return 0
+        data = self._partial + data
+        whole = len(data) - len(data) % BEAT.size
+        self._partial = data[whole:]
+        beats = 0
+        for frame, frame_ms in BEAT.iter_unpack(data[:whole]):
+            if frame == START:
+                self.engine = True
+                continue
+            self.frame, self.frame_ms = frame, frame_ms
+            self.slow_run = self.slow_run + 1 if frame_ms > self.slow_frame_ms else 0
+            beats += 1
+        if beats:
+            self.last_beat = time.perf_counter()
+        return beats
+
+    def silence(self) -> float:
+        """Seconds since the last beat (or since monitoring started, before the first one)"""
+        return time.perf_counter() - (self.last_beat or self.started)
+
+    def status(self) -> str:
+        """"starting", "unsupervised", "ok", "slow", "stalled" or "exited" """
+        if self.closed:
+            return "exited"
+        if self.last_beat is None:
+            if self.silence() <= self.startup_grace:
+                return "starting"
+            return "stalled" if self.engine else "unsupervised"
+        if self.silence() > self.stall_after:
+            return "stalled"
+        if self.slow_run >= self.slow_frames:
+            return "slow"
+        return "ok"
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+        self.closed = True
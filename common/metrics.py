@@ -0,0 +1,163 @@
+"""
+Live metrics for a running engine over a UNIX socket (or localhost TCP port).
+
+With VISPI_METRICS set, ``AudioEngine.run`` starts a daemon thread that
+answers every connection with one JSON snapshot and closes it: fps, stage
+percentiles, capture overflows, dropped frames, process CPU/memory and the
+active visualizer. ``watch_metrics.py`` polls it.
+
+A socket path that another engine still answers on is left alone: ``start``
+raises instead of taking the endpoint over. Only a stale path (nothing
+listening) is replaced.
+
+    VISPI_METRICS=/tmp/vispi.sock python3 conway.py
+    VISPI_METRICS=127.0.0.1:9100 python3 conway.py
+"""
+
+import errno
+import json
+import os
+import socket
+import sys
+import threading
+import time
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+DEFAULT_SOCKET = "/tmp/vispi-metrics.sock"
+
+
+def parse_address(address: str):
+    """(family, address) for a socket path or a host:port"""
+    if ":" in address:
+        host, port = address.rsplit(":", 1)
+        return socket.AF_INET, (host or "127.0.0.1", int(port))
+    return socket.AF_UNIX, address
+
+
+class MetricsServer:
+    def __init__(self, engine, address: str = DEFAULT_SOCKET):
+        self.engine = engine
+        self.family, self.address = parse_address(address)
+        self.visualizer = os.path.splitext(os.path.basename(sys.argv[0]))[0]
+        self.started = time.time()
+        self.process = psutil.Process() if psutil else None
+        if self.process:
+            # First call only sets the baseline
+            self.process.cpu_percent(None)
+        self.sock = None
+        self.thread = None
+
+    def start(self):
+        """Bind and start serving; OSError if the address is taken or can't be bound"""
+        if self.family == socket.AF_UNIX and os.path.exists(self.address):
+            if _answers(self.address):
+                raise OSError(errno.EADDRINUSE, f"Metrics socket {self.address} is served by another process")
+            # Left behind by an engine that didn't shut down cleanly
+            os.unlink(self.address)
+        sock = socket.socket(self.family, socket.SOCK_STREAM)
+        try:
+            if self.family == socket.AF_INET:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind(self.address)
+            sock.listen(4)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+        self.thread = threading.Thread(target=self._serve, name="vispi-metrics", daemon=True)
+        self.thread.start()
+        return self
+
+    def _serve(self):
+        while self.sock:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                break
+            with conn:
+                try:
+                    conn.sendall(json.dumps(self.snapshot()).encode() + b"\n")
+                except Exception:
+                    # A snapshot racing the engine thread fails this request, not the server
+                    pass
+
+    def snapshot(self) -> dict:
+        """Current metrics; read from the engine thread's state without locking"""
+        engine = self.engine
+        scheduler = engine.scheduler.stats() if engine.scheduler else {}
+        capture = engine.capture
+        snapshot = {
+            "visualizer": engine.active_visualizer or self.visualizer,
+            "pid": os.getpid(),
+            "uptime_s": time.time() - self.started,
+            "interface": engine.interface_type,
+            "processor": engine.processor_type,
+            "fps": scheduler.get("actual_fps", 0.0),
+            "target_fps": scheduler.get("target_fps"),
+            "frames": scheduler.get("frames", 0),
+            "frames_left": getattr(engine, "frames_left", None),
+            "dropped_frames": scheduler.get("dropped_frames", 0),
+            "missed_deadlines": scheduler.get("missed_deadlines", 0),
+            "jitter_p99_ms": scheduler.get("jitter_p99_ms", 0.0),
+            "input_overflows": capture.overflows if capture else 0,
+            "capture_overruns": capture.overruns if capture else 0,
+            "capture_pending": capture.pending() if capture else 0,
+            "stages": engine.timer.summary(),
+            "output": engine.renderer.summary() if engine.renderer else None,
+            "frame_output": engine.output.summary() if engine.output else None,
+        }
+        if self.process:
+            memory = self.process.memory_info()
+            snapshot.update({
+                "cpu_percent": self.process.cpu_percent(None),
+                "rss_mb": memory.rss / 2 ** 20,
+                "system_cpu_percent": psutil.cpu_percent(None),
+                "system_memory_percent": psutil.virtual_memory().percent,
+            })
+        return snapshot
+
+    def stop(self):
+        sock, self.sock = self.sock, None
+        if sock:
+            sock.close()
+            # Only the path this server bound; never another engine's
+            if self.family == socket.AF_UNIX and os.path.exists(self.address):
+                os.unlink(self.address)
+
+
+def _answers(path: str) -> bool:
+    """Whether something is accepting connections on the UNIX socket at ``path``"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        probe.settimeout(0.5)
+        try:
+            probe.connect(path)
+        except OSError:
+            return False
+    return True
+
+
+def from_env(engine):
+    """A started MetricsServer when VISPI_METRICS is set ("1" for the default socket), else None"""
+    address = os.environ.get("VISPI_METRICS")
+    if not address:
+        return None
+    return MetricsServer(engine, DEFAULT_SOCKET if address == "1" else address).start()
+
+
+def fetch(address: str = DEFAULT_SOCKET, timeout: float = 1.0) -> dict:
+    """One snapshot from a running engine"""
+    family, address = parse_address(address)
+    with socket.socket(family, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(address)
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return json.loads(b"".join(chunks))
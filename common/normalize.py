@@ -0,0 +1,200 @@
+"""
+Streaming reference-level estimators for spectrum normalization.
+
+Each estimator takes one frame of magnitudes per ``update`` and returns the
+current reference level to divide by. All of them are O(bins) per frame with
+no sorting, and keep their scratch buffers between frames.
+
+    "percentile"  per-frame np.percentile smoothed by an EMA (the original engine behaviour)
+    "p2"          P² quantile estimate over all bins of recent frames
+    "ema_peak"    instant-attack / slow-release tracking of the frame peak
+    "histogram"   quantile of a log-bucketed histogram over the last ``window`` frames
+"""
+
+import numpy as np
+
+
+class PercentileEMA:
+    """EMA of the per-frame percentile. Sorts every frame; kept for comparison"""
+
+    def __init__(self, q: float = 95, decay: float = 0.999, initial: float = 1000.0):
+        self.q = q
+        self.decay = decay
+        self.level = initial
+
+    def update(self, values: np.ndarray) -> float:
+        current = np.percentile(values, self.q)
+        self.level = self.decay * self.level + (1 - self.decay) * current
+        return self.level
+
+
+class P2Quantile:
+    """P² quantile estimator (Jain & Chlamtac) fed a frame of values at a time.
+
+    Five markers track the minimum, q/2, q, (1+q)/2 quantiles and the maximum.
+    A frame moves marker positions by how many values fall below each marker
+    (one vectorized comparison), then each middle marker is nudged towards its
+    desired position with the usual parabolic step (taken in one move of
+    however many positions the frame shifted it). Positions decay by
+    ``decay`` per frame, with a memory of roughly ``1 / (1 - decay)`` frames,
+    and each frame also pulls the heights towards its own distribution at
+    ``rate`` (log-scale, by how far each marker's share of values below it is
+    from its quantile), so the estimate comes back down after a loud passage
+    as quickly as it goes up.
+    """
+
+    def __init__(self, q: float = 95, decay: float = 0.999, rate: float = 0.05):
+        p = q / 100
+        self.increments = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+        self.decay = decay
+        self.rate = rate
+        self.heights = None
+        self.positions = None
+        self.desired = None
+        self.below = None
+        self.counts = None
+
+    def _start(self, values):
+        self.heights = [float(h) for h in np.percentile(values, [i * 100 for i in self.increments])]
+        self.positions = [1 + (len(values) - 1) * i for i in self.increments]
+        self.desired = list(self.positions)
+        self.below = np.zeros((len(values), 3), dtype=bool)
+        self.counts = np.zeros(3, dtype=np.intp)
+
+    def update(self, values: np.ndarray) -> float:
+        if self.heights is None or len(values) != len(self.below):
+            self._start(values)
+            return self.heights[2]
+
+        q, n, want = self.heights, self.positions, self.desired
+        m = len(values)
+        # Extremes follow the frame both ways: instantly outwards, at ``rate`` inwards
+        low, high = float(values.min()), float(values.max())
+        q[0] = min(low, q[0] + self.rate * (low - q[0]))
+        q[4] = max(high, q[4] + self.rate * (high - q[4]))
+
+        # How many of this frame's values land below each middle marker
+        np.less(values[:, None], q[1:4], out=self.below)
+        self.below.sum(axis=0, out=self.counts)
+        decay = self.decay
+        for i in range(1, 4):
+            n[i] = 1 + (n[i] - 1) * decay + int(self.counts[i - 1])
+        n[4] = 1 + (n[4] - 1) * decay + m
+        for i in range(1, 5):
+            want[i] = 1 + (want[i] - 1) * decay + m * self.increments[i]
+
+        for i in range(1, 4):
+            d = want[i] - n[i]
+            # A whole frame can shift a marker many positions; step straight
+            # there, stopping one short of the neighbouring markers
+            if d >= 1 and n[i + 1] - n[i] > 1:
+                s = min(d, n[i + 1] - n[i] - 1)
+                side = 1
+            elif d <= -1 and n[i - 1] - n[i] < -1:
+                s = max(d, n[i - 1] - n[i] + 1)
+                side = -1
+            else:
+                continue
+            parabolic = q[i] + s / (n[i + 1] - n[i - 1]) * (
+                (n[i] - n[i - 1] + s) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+                (n[i + 1] - n[i] - s) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+            )
+            if q[i - 1] < parabolic < q[i + 1]:
+                q[i] = parabolic
+            else:
+                q[i] = q[i] + s * (q[i + side] - q[i]) / (n[i + side] - n[i])
+            n[i] += s
+
+        # The steps above only interpolate between neighbouring heights, which
+        # hardly moves them once the decayed positions hold ~1/(1 - decay)
+        # frames: after a level drop every value lands below the markers and
+        # they stay put. Pull each middle marker towards this frame's own
+        # quantile by the gap between its target and its share of values below.
+        for i in range(1, 4):
+            q[i] *= np.exp(self.rate * (self.increments[i] - self.counts[i - 1] / m))
+            q[i] = min(max(q[i], q[i - 1]), q[4])
+        return q[2]
+
+
+class EMAPeak:
+    """Frame peak with instant attack and exponential release"""
+
+    def __init__(self, decay: float = 0.995, initial: float = 0.0):
+        self.decay = decay
+        self.level = initial
+
+    def update(self, values: np.ndarray) -> float:
+        peak = float(values.max())
+        if peak > self.level:
+            self.level = peak
+        else:
+            self.level = self.decay * self.level + (1 - self.decay) * peak
+        return self.level
+
+
+class WindowedHistogram:
+    """Quantile of a log-bucketed histogram over the last ``window`` frames.
+
+    Each frame's values are bucketed by log10 magnitude into a row of a ring
+    of per-frame histograms; a running total is kept by subtracting the row
+    that falls out of the window, so the quantile is one cumulative sum.
+    """
+
+    def __init__(self, q: float = 95, window: int = 256, buckets: int = 128,
+                 lo: float = 1.0, hi: float = 1e8):
+        self.q = q / 100
+        self.window = window
+        self.buckets = buckets
+        self.log_lo = np.log10(lo)
+        self.scale = buckets / (np.log10(hi) - self.log_lo)
+        self.rows = np.zeros((window, buckets), dtype=np.int64)
+        self.total = np.zeros(buckets, dtype=np.int64)
+        self.cumulative = np.zeros(buckets, dtype=np.int64)
+        self.frame = 0
+        self.scratch = None
+        self.index = None
+        self.level = lo
+
+    def update(self, values: np.ndarray) -> float:
+        if self.scratch is None or len(values) != len(self.scratch):
+            self.scratch = np.zeros(len(values), dtype=np.float64)
+            self.index = np.zeros(len(values), dtype=np.intp)
+
+        # Bucket index = scaled log10 magnitude, clamped to the histogram
+        np.maximum(values, 1e-12, out=self.scratch)
+        np.log10(self.scratch, out=self.scratch)
+        self.scratch -= self.log_lo
+        self.scratch *= self.scale
+        np.clip(self.scratch, 0, self.buckets - 1, out=self.scratch)
+        np.copyto(self.index, self.scratch, casting="unsafe")
+
+        row = self.rows[self.frame % self.window]
+        self.total -= row
+        row[:] = 0
+        np.add.at(row, self.index, 1)
+        self.total += row
+        self.frame += 1
+
+        np.cumsum(self.total, out=self.cumulative)
+        target = self.q * self.cumulative[-1]
+        bucket = int(np.searchsorted(self.cumulative, target))
+        # Interpolate within the bucket (in log space) to avoid stepping between edges
+        below = self.cumulative[bucket - 1] if bucket else 0
+        fraction = (target - below) / max(self.total[bucket], 1)
+        self.level = 10 ** (self.log_lo + (bucket + fraction) / self.scale)
+        return self.level
+
+
+NORMALIZERS = {
+    "percentile": PercentileEMA,
+    "p2": P2Quantile,
+    "ema_peak": EMAPeak,
+    "histogram": WindowedHistogram,
+}
+
+
+def make_normalizer(method: str = "p2", **options):
+    """Build the estimator registered as ``method`` with its options"""
+    if method not in NORMALIZERS:
+        raise ValueError(f"Normalizer {method} not found (available: {', '.join(NORMALIZERS)})")
+    return NORMALIZERS[method](**options)
@@ -0,0 +1,103 @@
+"""
+One write per frame for terminal output.
+
+``print()`` per glyph goes through the text layer for every call, and often
+a newline too. A ``FrameOutput`` collects the frame's escape sequences and
+text in a list and, on ``flush()``, joins them, encodes once and hands the
+result to the terminal in a single ``os.write``. Engine visualizers get one
+from ``engine.frame_output()``: ``AudioEngine.run`` flushes it right after
+stdout each frame, so that stays the only flush point.
+
+Coordinates are the cursor escape's: ``x`` column and ``y`` row, 1-based
+(0 lands on the first row/column, as with ``\\033[0;0H``).
+
+    out = engine.frame_output()
+    out.clear()
+    out.text(x, y, "word", "\\033[91m")
+    out.sprite(x, y, pat_sprite, "\\033[95m", rows=rows)
+
+When stdout isn't the real terminal (the render benchmark's counting sink,
+the host's screen tap) the frame is written to ``sys.stdout`` instead, so
+those still see it.
+"""
+
+import os
+import sys
+import time
+
+RESET = "\033[0m"
+CLEAR = "\033[2J\033[H"
+
+
+class FrameOutput:
+    def __init__(self, fd: int = None):
+        self.fd = fd
+        self.parts = []
+        self.stats = {"frames": 0, "bytes": 0, "write_ns": 0, "last_bytes": 0}
+
+    # === Building the frame ===
+    def write(self, text: str):
+        """File-style write, so ``print(..., file=out)`` and ``CellRenderer(stream=out)`` work"""
+        self.parts.append(text)
+        return len(text)
+
+    def clear(self):
+        self.parts.append(CLEAR)
+
+    def move(self, x: int, y: int):
+        self.parts.append(f"\033[{y};{x}H")
+
+    def text(self, x: int, y: int, text: str, color: str = ""):
+        """``text`` at (x, y), in ``color`` (an SGR sequence) with a reset after it"""
+        if color:
+            self.parts.append(f"\033[{y};{x}H{color}{text}{RESET}")
+        else:
+            self.parts.append(f"\033[{y};{x}H{text}")
+
+    def sprite(self, x: int, y: int, lines, color: str = "", rows: int = None):
+        """Multi-line art with its top-left at (x, y); lines below ``rows`` are skipped"""
+        parts = self.parts
+        if color:
+            parts.append(color)
+        for i, line in enumerate(lines):
+            if rows is None or 0 <= y + i < rows:
+                parts.append(f"\033[{y + i};{x}H{line}")
+        if color:
+            parts.append(RESET)
+
+    # === Output ===
+    def flush(self) -> int:
+        """Send the frame; returns the bytes written"""
+        if not self.parts:
+            return 0
+        text = "".join(self.parts)
+        self.parts.clear()
+        data = text.encode("utf-8")
+        started = time.perf_counter_ns()
+        stream = sys.stdout
+        if self.fd is not None or stream is sys.__stdout__:
+            # Anything print()ed this frame goes out first
+            stream.flush()
+            fd = self.fd if self.fd is not None else stream.fileno()
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        else:
+            stream.write(text)
+            stream.flush()
+        stats = self.stats
+        stats["frames"] += 1
+        stats["bytes"] += len(data)
+        stats["write_ns"] += time.perf_counter_ns() - started
+        stats["last_bytes"] = len(data)
+        return len(data)
+
+    def summary(self) -> dict:
+        stats = self.stats
+        frames = stats["frames"] or 1
+        return {
+            "frames": stats["frames"],
+            "bytes_per_frame": stats["bytes"] / frames,
+            "write_ms_per_frame": stats["write_ns"] / frames / 1e6,
+            "last_bytes": stats["last_bytes"],
+        }
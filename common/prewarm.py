@@ -0,0 +1,60 @@
+"""
+Pre-warmed start of a standalone visualizer script (used by launch_random.py).
+
+    python3 -m common.prewarm <script> <ready_fd>
+
+Runs the script's top-level imports (numpy, scipy, PIL, pyaudio, ...) ahead of
+time, writes ``ready <ms>`` to ``ready_fd`` and parks on stdin. On ``go`` it
+writes ``running`` and executes the script as ``__main__``, which now finds
+every import already in ``sys.modules``. Anything else on stdin (or the
+launcher closing it) discards the candidate.
+
+Only imports run early: the scripts open the audio device and the
+framebuffer at top level, and those must wait until the previous
+visualizer has let go of them.
+"""
+
+import ast
+import os
+import runpy
+import sys
+import time
+
+
+def preload(path: str):
+    """Execute just the top-level import statements of ``path``"""
+    with open(path) as f:
+        tree = ast.parse(f.read(), path)
+    for node in tree.body:
+        if not isinstance(node, (ast.Import, ast.ImportFrom)):
+            continue
+        code = compile(ast.Module(body=[node], type_ignores=[]), path, "exec")
+        try:
+            exec(code, {"__name__": "__prewarm__"})
+        except Exception:
+            # Let the script hit (and report) the failure itself when it runs
+            pass
+
+
+def main():
+    path, ready_fd = os.path.abspath(sys.argv[1]), int(sys.argv[2])
+    started = time.perf_counter()
+    script_dir = os.path.dirname(path)
+    # The scripts open their lyric files relative to their own directory
+    os.chdir(script_dir)
+    sys.path.insert(0, script_dir)
+    preload(path)
+
+    ready = os.fdopen(ready_fd, "w", buffering=1)
+    ready.write(f"ready {(time.perf_counter() - started) * 1000:.0f}\n")
+    if sys.stdin.readline().strip() != "go":
+        return
+    ready.write("running\n")
+    ready.close()
+
+    sys.argv = [path]
+    runpy.run_path(path, run_name="__main__")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+Processor registry for the audio engine.
+
+A processor is registered by name with the features it puts in each frame.
+Its factory receives the engine at ``initialize`` time (to set up state or
+adjust ``engine.fps``) and returns the per-frame callable the engine invokes
+as ``processor(stream, config, prev_fft, debug)``.
+
+    @register_processor("mine", features=("is_silent", "samples", "fft", "prev_fft"))
+    def mine(engine):
+        def process(stream, config, prev_fft, debug):
+            ...
+        return process
+"""
+
+import numpy as np
+from scipy.ndimage import median_filter
+from .config import FFT_SIZE, STFT
+from .analysis import StreamingSTFT, PartialRFFT
+from .frame import Frame
+from .trace import TraceReplayer
+from .bus import BusReader
+
+# Features produced by the engine's built-in spectrum pipeline
+ENGINE_FEATURES = (
+    "is_silent", "samples", "fft", "prev_fft",
+    "low_energy", "high_energy", "total_energy",
+    "kick_energy", "snare_energy", "hat_energy",
+    "onset", "beat", "beat_phase", "bpm",
+)
+# Processors that keep the full spectrum can also provide perceptual bands
+SPECTRUM_FEATURES = ENGINE_FEATURES + ("bands",)
+
+PROCESSORS = {}
+
+
+# Reference-level estimator options (see common/normalize.py)
+DEFAULT_NORMALIZER = {"method": "p2", "q": 95}
+
+
+class ProcessorSpec:
+    def __init__(self, name, factory, features, normalizer):
+        self.name = name
+        self.factory = factory
+        self.features = tuple(features)
+        self.normalizer = dict(normalizer)
+
+    def build(self, engine):
+        return self.factory(engine)
+
+
+def register_processor(name: str, features=ENGINE_FEATURES, normalizer=DEFAULT_NORMALIZER):
+    """Decorator registering a processor factory under ``name``.
+
+    ``normalizer`` picks the streaming estimator the engine builds for it as
+    ``engine.normalizer`` (and ``engine.band_normalizer`` for bands).
+    """
+    def decorator(factory):
+        PROCESSORS[name] = ProcessorSpec(name, factory, features, normalizer)
+        return factory
+    return decorator
+
+
+def get_processor_spec(name: str) -> ProcessorSpec:
+    if name not in PROCESSORS:
+        raise ValueError(f"Processor {name} not found (available: {', '.join(PROCESSORS)})")
+    return PROCESSORS[name]
+
+
+# === Engine built-ins ===
+@register_processor("default", features=SPECTRUM_FEATURES)
+def _default(engine):
+    return engine._default_process_audio
+
+
+@register_processor("stft", features=SPECTRUM_FEATURES)
+def _stft(engine):
+    engine.stft = StreamingSTFT(**STFT)
+    # Analysis rate follows the hop, not the device buffer
+    engine.analysis_rate = engine.config["sample_rate"] / engine.stft.hop_size
+    engine.fps = engine.analysis_rate * 1.025
+    return engine._stft_process_audio
+
+
+@register_processor("rfft")
+def _rfft(engine):
+    config = engine.config
+    engine.rfft = PartialRFFT(config["chunk_size"], FFT_SIZE, config["channels"], config["np_format"])
+    engine.rfft_frame = Frame(engine, engine.rfft.mono, True, engine.rfft.magnitude, engine.rfft.fft)
+    return engine._rfft_process_audio
+
+
+@register_processor("replay", features=())
+def _replay(engine):
+    """Ready-made frames from a recorded trace or the feature bus (their interfaces select this)"""
+    trace = engine.stream
+    if not isinstance(trace, (TraceReplayer, BusReader)):
+        raise ValueError("Processor replay needs a trace or bus interface (source: \"trace\" or \"bus\")")
+    # Features, pacing and beat time base are whatever the producer had
+    engine.features = trace.features
+    engine.fps = trace.metadata["fps"]
+    engine.analysis_rate = trace.metadata["analysis_rate"]
+
+    def process(stream, config, prev_fft, debug):
+        return stream.next_frame()
+    return process
+
+
+# === Spectra from the standalone scripts ===
+# The scripts normalized by each frame's own percentile; a short-memory
+# estimator keeps them about as responsive without sorting every frame
+@register_processor("routercore", features=("is_silent", "samples", "fft", "prev_fft", "total_energy"),
+                    normalizer={"method": "p2", "q": 98, "decay": 0.9})
+def routercore(engine):
+    """Percentile-normalized spectrum from routercore3.py: low third of the FFT stretched over 64 bars"""
+    NOISE_GATE = 100
+
+    def process(stream, config, prev_fft, debug):
+        chunk = config["chunk_size"]
+        data = stream.read(chunk, exception_on_overflow=debug)
+        samples = np.frombuffer(data, dtype=config["np_format"])[::config["channels"]]
+        is_silent = np.max(np.abs(samples)) < NOISE_GATE
+
+        if is_silent:
+            fft = np.zeros(FFT_SIZE)
+        else:
+            full_fft = np.abs(np.fft.fft(samples))[:chunk // 2]
+            focus = full_fft[:int(FFT_SIZE * 2/3)]
+            fft = np.interp(np.linspace(0, len(focus), FFT_SIZE), np.arange(len(focus)), focus)
+            fft = fft / (engine.normalizer.update(fft) + 1e-6)
+            fft = np.clip(fft * 1.5, 0, 1)
+            fft = np.where(fft < 0.05, fft * 0.1, fft)
+            fft[fft < 0.08] = 0
+            fft = np.sqrt(fft)
+            fft = 0.3 * prev_fft + 0.7 * fft
+            prev_fft = fft
+
+        return {
+            "is_silent": is_silent,
+            "samples": samples,
+            "fft": fft,
+            "prev_fft": prev_fft,
+            "total_energy": np.mean(fft),
+        }
+
+    return process
+
+
+@register_processor("console_demo", features=("is_silent", "samples", "fft", "prev_fft", "total_energy"),
+                    normalizer={"method": "p2", "q": 95, "decay": 0.9})
+def console_demo(engine):
+    """rfft spectrum from console_demo.py's compute_spectrum: gated, square-root compressed bands"""
+    SMOOTHING = 0.2
+    SENSITIVITY = 5.0
+    GATE_THRESHOLD = 0.1
+
+    def process(stream, config, prev_fft, debug):
+        data = stream.read(config["chunk_size"], exception_on_overflow=debug)
+        samples = np.frombuffer(data, dtype=config["np_format"])[::config["channels"]]
+        is_silent = np.max(np.abs(samples)) < 100
+
+        fft = np.abs(np.fft.rfft(samples))
+        focus = fft[:len(fft)*2//3]
+        bands = np.interp(np.linspace(0, len(focus), FFT_SIZE), np.arange(len(focus)), focus)
+        bands *= SENSITIVITY
+        norm = np.clip(bands / (engine.normalizer.update(bands) + 1e-6), 0, 1)
+        norm[norm < GATE_THRESHOLD] = 0
+        fft = SMOOTHING * prev_fft + (1 - SMOOTHING) * norm**0.5
+
+        return {
+            "is_silent": is_silent,
+            "samples": samples,
+            "fft": fft,
+            "prev_fft": fft,
+            "total_energy": np.mean(fft),
+        }
+
+    return process
+
+
+@register_processor("pat", features=("is_silent", "samples", "fft", "prev_fft",
+                                     "low_energy", "high_energy", "total_energy"))
+def pat(engine):
+    """Max-normalized spectrum from pat2.py: median-filtered 64-bin FFT scaled by each frame's peak"""
+    SMOOTHING = 0.5
+
+    def process(stream, config, prev_fft, debug):
+        data = stream.read(config["chunk_size"], exception_on_overflow=debug)
+        samples = np.frombuffer(data, dtype=config["np_format"])[::config["channels"]]
+        is_silent = np.max(np.abs(samples)) < 100
+
+        if is_silent:
+            # The script skipped analysis entirely on silent chunks
+            fft = prev_fft
+        else:
+            fft = np.abs(np.fft.fft(samples))[:FFT_SIZE]
+            fft = median_filter(fft, size=3)
+            fft = fft / (np.max(fft) + 1e-6)
+            fft = SMOOTHING * prev_fft + (1 - SMOOTHING) * fft
+
+        return {
+            "is_silent": is_silent,
+            "samples": samples,
+            "fft": fft,
+            "prev_fft": fft,
+            "low_energy": np.mean(fft[:8]),
+            "high_energy": np.mean(fft[32:]),
+            "total_energy": np.mean(fft),
+        }
+
+    return process
+
+
+# A zero-decay percentile estimator is the script's own per-frame np.percentile
+@register_processor("void", features=("is_silent", "samples", "fft", "prev_fft", "total_energy"),
+                    normalizer={"method": "percentile", "q": 98, "decay": 0.0})
+def void(engine):
+    """Percentile-normalized spectrum from visualizers_midi/void.py: full FFT over 64 square-root bars"""
+    NOISE_GATE = 80
+
+    def process(stream, config, prev_fft, debug):
+        chunk = config["chunk_size"]
+        data = stream.read(chunk, exception_on_overflow=debug)
+        samples = np.frombuffer(data, dtype=config["np_format"])[::config["channels"]]
+        is_silent = np.max(np.abs(samples)) < NOISE_GATE
+
+        if is_silent:
+            fft = np.zeros(FFT_SIZE)
+        else:
+            raw = np.abs(np.fft.fft(samples))[:chunk // 2]
+            fft = np.interp(np.linspace(0, len(raw), FFT_SIZE), np.arange(len(raw)), raw)
+            fft = fft / (engine.normalizer.update(fft) + 1e-6)
+            fft = np.clip(np.sqrt(fft), 0, 1)
+        fft = 0.3 * prev_fft + 0.7 * fft
+
+        return {
+            "is_silent": is_silent,
+            "samples": samples,
+            "fft": fft,
+            "prev_fft": fft,
+            "total_energy": np.mean(fft),
+        }
+
+    return process
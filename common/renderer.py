@@ -0,0 +1,197 @@
+"""
+Diff-based terminal rendering for the visualizers.
+
+A ``CellRenderer`` keeps two cell buffers: ``back``, which the visualizer
+draws into, and ``front``, what the terminal is showing. ``present()``
+writes only the cells that differ:
+
+- changed cells close together on a row become one run with a single
+  cursor move (rewriting a short unchanged gap is cheaper than skipping it),
+- an SGR is sent only when the colors change along the output.
+
+Colors are SGR codes: ``fg`` 30-37/90-97, ``bg`` 40-47/100-107, and 0 for the
+terminal's default. Each present's byte count and write time go into
+``stats``. When ``engine.renderer`` points at the renderer, its ``summary()``
+shows up in the engine's debug summary and metrics snapshot.
+
+The two output pieces work on their own for scripts that keep their own
+grids: ``cursor_table`` precomputes every cursor-position escape for a
+terminal size, and ``encode_row`` writes a row of glyphs with one SGR per
+run of equal attributes instead of a color/reset pair around every glyph.
+
+    renderer = CellRenderer(cols, rows)
+    renderer.put(x, y, "text", fg=97)
+    renderer.present()
+"""
+
+import functools
+import sys
+import time
+import numpy as np
+
+RESET = "\033[0m"
+# Unchanged cells a run may bridge instead of starting a new run with a cursor move
+MAX_GAP = 4
+
+
+@functools.lru_cache(maxsize=4)
+def cursor_table(cols: int, rows: int):
+    """``table[y][x]`` is the escape moving the cursor to column ``x``, row ``y`` (0-based)"""
+    return [[f"\033[{y + 1};{x + 1}H" for x in range(cols)] for y in range(rows)]
+
+
+def encode_row(glyphs, attrs, sgr, current=0, fill_blanks=False):
+    """Glyphs with an SGR only where the attribute changes along the row.
+
+    ``attrs`` are keys into ``sgr``, whose entries must each fully replace
+    the previous attribute (fg-only colors, or sequences starting with a
+    reset); key 0 is the default and should map to RESET. ``current`` is the
+    attribute already in effect. With ``fill_blanks``, spaces take on the
+    attribute before them, which is only safe when no attribute sets a
+    background. Returns (text, attribute in effect after it).
+    """
+    text = glyphs if isinstance(glyphs, str) else "".join(np.asarray(glyphs).tolist())
+    attrs = np.asarray(attrs)
+    if fill_blanks:
+        solid = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32) != 32
+        last = np.where(solid, np.arange(len(text)), -1)
+        np.maximum.accumulate(last, out=last)
+        attrs = np.where(last >= 0, attrs[last], current)
+    bounds = np.flatnonzero(attrs[1:] != attrs[:-1]) + 1
+    starts = [0] + bounds.tolist()
+    ends = bounds.tolist() + [len(text)]
+    keys = attrs[starts].tolist() if len(text) else []
+    out = []
+    for start, end, attr in zip(starts, ends, keys):
+        if attr != current:
+            out.append(sgr[attr])
+            current = attr
+        out.append(text[start:end])
+    return "".join(out), current
+
+
+class Attributes(dict):
+    """SGR for a packed (fg << 8 | bg) key"""
+
+    def __missing__(self, key):
+        fg, bg = key >> 8, key & 0xFF
+        codes = ";".join(str(code) for code in (fg, bg) if code)
+        sgr = self[key] = f"\033[0;{codes}m" if codes else RESET
+        return sgr
+
+
+class Cells:
+    """One screen's worth of cells: glyph, foreground and background SGR code"""
+
+    def __init__(self, cols: int, rows: int):
+        self.chars = np.full((rows, cols), " ", dtype="<U1")
+        self.fg = np.zeros((rows, cols), dtype=np.int16)
+        self.bg = np.zeros((rows, cols), dtype=np.int16)
+
+    def copy_from(self, other):
+        np.copyto(self.chars, other.chars)
+        np.copyto(self.fg, other.fg)
+        np.copyto(self.bg, other.bg)
+
+
+class CellRenderer:
+    def __init__(self, cols: int, rows: int, stream=None):
+        self.cols, self.rows = cols, rows
+        self.back = Cells(cols, rows)
+        self.front = Cells(cols, rows)
+        # None writes to whatever sys.stdout is at present() time
+        self.stream = stream
+        # The terminal's contents are unknown until the first full paint
+        self.full = True
+        self._sgr = Attributes()
+        self.cursor = cursor_table(cols, rows)
+        self.stats = {"frames": 0, "bytes": 0, "cells": 0, "write_ns": 0,
+                      "last_bytes": 0, "last_cells": 0, "last_write_ms": 0.0, "full_bytes": 0}
+
+    # === Drawing (into the back buffer) ===
+    def clear(self, fg: int = 0, bg: int = 0):
+        self.back.chars[:] = " "
+        self.back.fg[:] = fg
+        self.back.bg[:] = bg
+
+    def put(self, x: int, y: int, text: str, fg: int = 0, bg: int = 0):
+        """Write ``text`` at column ``x``, row ``y`` (0-based), clipped to the screen"""
+        if not 0 <= y < self.rows or x >= self.cols:
+            return
+        if x < 0:
+            text, x = text[-x:], 0
+        text = text[:self.cols - x]
+        if not text:
+            return
+        end = x + len(text)
+        self.back.chars[y, x:end] = list(text)
+        self.back.fg[y, x:end] = fg
+        self.back.bg[y, x:end] = bg
+
+    def invalidate(self):
+        """Repaint every cell on the next present (after something else drew on the terminal)"""
+        self.full = True
+
+    # === Output ===
+    def render(self) -> str:
+        """Escape sequences taking the terminal from ``front`` to ``back``; updates ``front``"""
+        back, front = self.back, self.front
+        if self.full:
+            changed = np.ones(back.chars.shape, dtype=bool)
+        else:
+            changed = (back.chars != front.chars) | (back.fg != front.fg) | (back.bg != front.bg)
+        keys = (back.fg.astype(np.int32) << 8) | back.bg
+        out = []
+        current = None
+        cells = 0
+        for y in np.flatnonzero(changed.any(axis=1)).tolist():
+            xs = np.flatnonzero(changed[y])
+            breaks = np.flatnonzero(np.diff(xs) > MAX_GAP + 1)
+            starts = xs[np.concatenate(([0], breaks + 1))].tolist()
+            ends = xs[np.concatenate((breaks, [len(xs) - 1]))].tolist()
+            cursor = self.cursor[y]
+            for start, end in zip(starts, ends):
+                out.append(cursor[start])
+                text, current = encode_row(back.chars[y, start:end + 1], keys[y, start:end + 1], self._sgr, current)
+                out.append(text)
+                cells += end - start + 1
+        if out:
+            out.append(RESET)
+        front.copy_from(back)
+        self.full = False
+        self.stats["last_cells"] = cells
+        return "".join(out)
+
+    def present(self) -> int:
+        """Write the changes since the last present; returns the bytes written"""
+        full = self.full
+        text = self.render()
+        stream = self.stream or sys.stdout
+        started = time.perf_counter_ns()
+        if text:
+            stream.write(text)
+        elapsed = time.perf_counter_ns() - started
+        size = len(text.encode("utf-8"))
+        stats = self.stats
+        stats["frames"] += 1
+        stats["bytes"] += size
+        stats["cells"] += stats["last_cells"]
+        stats["write_ns"] += elapsed
+        stats["last_bytes"] = size
+        stats["last_write_ms"] = elapsed / 1e6
+        if full:
+            stats["full_bytes"] = size
+        return size
+
+    def summary(self) -> dict:
+        """Bytes and cells per frame and write time; ``full_bytes`` is the last full repaint's size"""
+        stats = self.stats
+        frames = stats["frames"] or 1
+        return {
+            "frames": stats["frames"],
+            "bytes_per_frame": stats["bytes"] / frames,
+            "cells_per_frame": stats["cells"] / frames,
+            "write_ms_per_frame": stats["write_ns"] / frames / 1e6,
+            "last_bytes": stats["last_bytes"],
+            "full_bytes": stats["full_bytes"],
+        }
@@ -0,0 +1,112 @@
+import time
+import numpy as np
+
+
+class FrameScheduler:
+    """Paces the engine loop against absolute ``perf_counter`` deadlines.
+
+    Modes:
+        "target"  fixed frame rate; deadlines advance by exactly one period, so
+                  oversleeping on one frame is taken back on the next (no drift)
+        "audio"   lock to the capture ring: wait until a frame's worth of new
+                  audio has arrived (blocking reads already pace themselves)
+        "free"    never sleep; run as fast as the loop allows
+
+    Late-frame policies (when a frame finishes after its deadline):
+        "drop"     skip the missed slots and wait for the next one on the grid
+        "catchup"  keep the grid and run the following frames back to back
+                   (bounded by ``max_catchup`` periods, then resync)
+        "stretch"  restart the grid from now
+    """
+
+    MODES = ("target", "audio", "free")
+    LATE_POLICIES = ("drop", "catchup", "stretch")
+
+    def __init__(self, mode: str = "target", fps: float = 60.0, late_policy: str = "drop",
+                 capture=None, frames_per_tick: int = 0, max_catchup: int = 4, history: int = 256):
+        if mode not in self.MODES:
+            raise ValueError(f"Scheduler mode {mode} not in {self.MODES}")
+        if late_policy not in self.LATE_POLICIES:
+            raise ValueError(f"Late policy {late_policy} not in {self.LATE_POLICIES}")
+        self.mode = mode
+        self.fps = fps
+        self.period = 1.0 / fps
+        self.late_policy = late_policy
+        self.capture = capture
+        self.frames_per_tick = frames_per_tick
+        self.max_catchup = max_catchup
+
+        self.deadline = None
+        self.started = None
+        self.frames = 0
+        self.missed = 0
+        self.dropped = 0
+        self.last_wake = None
+        # Deviation of each frame interval from the period, in seconds
+        self.jitter = np.zeros(history)
+
+    def start(self):
+        self.started = time.perf_counter()
+        self.deadline = self.started + self.period
+
+    def _sleep_until(self, deadline):
+        remaining = deadline - time.perf_counter()
+        if remaining > 0:
+            time.sleep(remaining)
+
+    def wait(self):
+        """Block until the next frame is due"""
+        if self.deadline is None:
+            self.start()
+        now = time.perf_counter()
+
+        if self.mode == "free":
+            pass
+        elif self.mode == "audio" and self.capture:
+            # Poll in quarter periods until a tick's worth of audio is in, bounded at two periods
+            give_up = now + 2 * self.period
+            while self.capture.pending() < self.frames_per_tick and time.perf_counter() < give_up:
+                time.sleep(self.period / 4)
+            if time.perf_counter() >= give_up:
+                self.missed += 1
+        elif self.mode == "audio":
+            # Blocking stream reads wait on the device themselves
+            pass
+        elif now <= self.deadline:
+            self._sleep_until(self.deadline)
+            self.deadline += self.period
+        else:
+            self.missed += 1
+            behind = now - self.deadline
+            if self.late_policy == "drop":
+                skipped = int(behind // self.period) + 1
+                self.dropped += skipped
+                self.deadline += skipped * self.period
+                self._sleep_until(self.deadline)
+                self.deadline += self.period
+            elif self.late_policy == "catchup" and behind < self.max_catchup * self.period:
+                self.deadline += self.period
+            else:
+                self.deadline = now + self.period
+
+        wake = time.perf_counter()
+        if self.last_wake is not None:
+            self.jitter[self.frames % len(self.jitter)] = (wake - self.last_wake) - self.period
+            self.frames += 1
+        self.last_wake = wake
+
+    def stats(self) -> dict:
+        """Counts and frame-interval jitter over the recent history"""
+        recent = np.abs(self.jitter[:min(self.frames, len(self.jitter))])
+        elapsed = time.perf_counter() - self.started if self.started else 0
+        return {
+            "mode": self.mode,
+            "target_fps": self.fps,
+            "actual_fps": self.frames / elapsed if elapsed else 0.0,
+            "frames": self.frames,
+            "missed_deadlines": self.missed,
+            "dropped_frames": self.dropped,
+            "jitter_mean_ms": float(recent.mean() * 1000) if len(recent) else 0.0,
+            "jitter_p99_ms": float(np.percentile(recent, 99) * 1000) if len(recent) else 0.0,
+            "jitter_max_ms": float(recent.max() * 1000) if len(recent) else 0.0,
+        }
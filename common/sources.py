@@ -0,0 +1,261 @@
+"""
+Audio sources that stand in for a PyAudio input stream.
+
+They implement the part of the stream interface the engine and processors
+use (``read``, ``stop_stream``, ``close``), so the rest of the pipeline can't
+tell them from the Focusrite. Used for offline runs, profiling and
+regression tests on machines without sound hardware.
+"""
+
+import struct
+import time
+import numpy as np
+from scipy.signal import lfilter
+
+
+def _wav_layout(path):
+    """(data offset, data bytes, channels, sample rate, bits) from a RIFF/WAVE header"""
+    with open(path, "rb") as f:
+        riff, _, wave = struct.unpack("<4sI4s", f.read(12))
+        if riff != b"RIFF" or wave != b"WAVE":
+            raise ValueError(f"{path} is not a RIFF/WAVE file")
+        fmt = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError(f"{path} has no data chunk")
+            chunk_id, size = struct.unpack("<4sI", header)
+            if chunk_id == b"fmt ":
+                audio_format, channels, rate, _, _, bits = struct.unpack("<HHIIHH", f.read(16))
+                if audio_format not in (1, 0xFFFE):
+                    raise ValueError(f"{path} is not PCM (format {audio_format})")
+                fmt = (channels, rate, bits)
+                f.seek(size - 16 + (size & 1), 1)
+            elif chunk_id == b"data":
+                if fmt is None:
+                    raise ValueError(f"{path} has data before fmt")
+                return (f.tell(), size) + fmt
+            else:
+                f.seek(size + (size & 1), 1)
+
+
+class FileSource:
+    """Memory-mapped WAV or raw PCM file read in chunk-size slices.
+
+    WAV files supply their own channel count and sample rate; raw files use
+    the interface config's. With ``realtime`` each read waits until that much
+    audio would have played, otherwise reads return immediately. At the end of
+    the file it wraps around when ``loop`` is set, else ``read`` raises
+    ``EOFError``.
+    """
+
+    def __init__(self, path: str, channels: int = 2, sample_rate: int = 48000, dtype=np.int16,
+                 realtime: bool = True, loop: bool = True):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.realtime = realtime
+        self.loop = loop
+
+        if path.lower().endswith(".wav"):
+            offset, size, channels, sample_rate, bits = _wav_layout(path)
+            if bits != self.dtype.itemsize * 8:
+                raise ValueError(f"{path} is {bits}-bit, engine expects {self.dtype.itemsize * 8}-bit")
+        else:
+            offset, size = 0, None
+        self.channels = channels
+        self.sample_rate = sample_rate
+
+        data = np.memmap(path, dtype=self.dtype, mode="r", offset=offset)
+        if size is not None:
+            data = data[:size // self.dtype.itemsize]
+        # Whole frames only, shaped (frames, channels)
+        self.frames = len(data) // channels
+        if not self.frames:
+            raise ValueError(f"{path} contains no audio")
+        self.data = data[:self.frames * channels].reshape(self.frames, channels)
+
+        self.position = 0
+        self.frames_read = 0
+        self.started = None
+
+    def read_frames(self, num_frames: int) -> np.ndarray:
+        """Next ``num_frames`` frames as a (frames, channels) array (a view when no wrap is needed)"""
+        if self.started is None:
+            self.started = time.perf_counter()
+        end = self.position + num_frames
+        if end <= self.frames:
+            block = self.data[self.position:end]
+            self.position = end % self.frames if self.loop else end
+        elif self.loop:
+            wrapped = np.take(self.data, np.arange(self.position, end) % self.frames, axis=0)
+            self.position = end % self.frames
+            block = wrapped
+        else:
+            raise EOFError(f"End of {self.path}")
+        self.frames_read += num_frames
+
+        if self.realtime:
+            due = self.started + self.frames_read / self.sample_rate
+            remaining = due - time.perf_counter()
+            if remaining > 0:
+                time.sleep(remaining)
+        return block
+
+    def read(self, num_frames: int, exception_on_overflow: bool = False) -> bytes:
+        return self.read_frames(num_frames).tobytes()
+
+    def is_active(self):
+        return True
+
+    def stop_stream(self):
+        pass
+
+    def close(self):
+        # Drop the view so the memory map can be released
+        self.data = None
+
+
+class SynthSource:
+    """Deterministic test signals generated into the engine's chunk format.
+
+    Signals:
+        "sweep"  logarithmic sine sweep from ``fmin`` to ``fmax`` every ``period`` seconds
+        "pink"   pink noise (white noise through a -3 dB/octave filter)
+        "clicks" short broadband clicks on every beat at ``bpm``
+        "drums"  a one-bar kick/snare/hat pattern at ``bpm``
+
+    Everything except pink noise is rendered once as a loop and played from
+    it. With ``record_events``, ``events`` collects ``(sample_index, kind)``
+    for every hit handed out so far, as ground truth for onset and percussion
+    detection; it grows for as long as the source runs, so it is off by default.
+    """
+
+    # 16 steps per bar
+    PATTERN = {
+        "kick": (0, 6, 8),
+        "snare": (4, 12),
+        "hat": (0, 2, 4, 6, 8, 10, 12, 14),
+    }
+
+    def __init__(self, signal: str = "drums", channels: int = 2, sample_rate: int = 48000, dtype=np.int16,
+                 realtime: bool = True, bpm: float = 120.0, amplitude: float = 0.5,
+                 fmin: float = 30.0, fmax: float = 16000.0, period: float = 10.0, seed: int = 0,
+                 record_events: bool = False):
+        self.signal = signal
+        self.channels = channels
+        self.sample_rate = sample_rate
+        self.dtype = np.dtype(dtype)
+        self.realtime = realtime
+        self.bpm = bpm
+        self.scale = amplitude * np.iinfo(self.dtype).max
+        self.rng = np.random.default_rng(seed)
+
+        self.loop_events = []
+        self.pink_state = None
+        if signal == "sweep":
+            self.loop = self._sweep(fmin, fmax, period)
+        elif signal == "clicks":
+            self.loop = self._clicks()
+        elif signal == "drums":
+            self.loop = self._drums()
+        elif signal == "pink":
+            self.loop = None
+        else:
+            raise ValueError(f"Unknown synth signal {signal}")
+
+        self.events = [] if record_events else None
+        self.frames_read = 0
+        self.started = None
+
+    # === Loop renderers (float, -1..1) ===
+    def _sweep(self, fmin, fmax, period):
+        t = np.arange(int(period * self.sample_rate)) / self.sample_rate
+        k = np.log(fmax / fmin)
+        phase = 2 * np.pi * fmin * period / k * (np.exp(t / period * k) - 1)
+        return np.sin(phase)
+
+    def _beat_samples(self):
+        return 60.0 / self.bpm * self.sample_rate
+
+    def _clicks(self):
+        beat = self._beat_samples()
+        loop = np.zeros(int(round(beat * 4)))
+        click = self.rng.uniform(-1, 1, int(0.002 * self.sample_rate))
+        for i in range(4):
+            start = int(round(i * beat))
+            loop[start:start + len(click)] += click
+            self.loop_events.append((start, "click"))
+        return loop
+
+    def _drums(self):
+        sr = self.sample_rate
+        step = self._beat_samples() / 4
+        loop = np.zeros(int(round(step * 16)))
+
+        t = np.arange(int(0.25 * sr)) / sr
+        kick = np.sin(2 * np.pi * (45 * t + 60 * (1 - np.exp(-t * 30)) / 30)) * np.exp(-t * 12)
+        t = np.arange(int(0.15 * sr)) / sr
+        snare = (0.6 * self.rng.uniform(-1, 1, len(t)) + 0.4 * np.sin(2 * np.pi * 190 * t)) * np.exp(-t * 25)
+        t = np.arange(int(0.04 * sr)) / sr
+        hat_noise = self.rng.uniform(-1, 1, len(t))
+        hat = np.diff(hat_noise, prepend=0) * 0.5 * np.exp(-t * 90)
+        sounds = {"kick": kick, "snare": snare, "hat": hat * 0.6}
+
+        for kind, steps in self.PATTERN.items():
+            sound = sounds[kind]
+            for s in steps:
+                start = int(round(s * step))
+                end = min(start + len(sound), len(loop))
+                loop[start:end] += sound[:end - start]
+                self.loop_events.append((start, kind))
+        self.loop_events.sort()
+        return loop / max(1.0, np.abs(loop).max())
+
+    def _pink(self, n):
+        b = [0.049922035, -0.095993537, 0.050612699, -0.004408786]
+        a = [1, -2.494956002, 2.017265875, -0.522189400]
+        if self.pink_state is None:
+            self.pink_state = np.zeros(3)
+        pink, self.pink_state = lfilter(b, a, self.rng.standard_normal(n), zi=self.pink_state)
+        return np.clip(pink * 3, -1, 1)
+
+    # === Stream interface ===
+    def read_frames(self, num_frames: int) -> np.ndarray:
+        if self.started is None:
+            self.started = time.perf_counter()
+        start = self.frames_read
+        if self.loop is None:
+            mono = self._pink(num_frames)
+        else:
+            length = len(self.loop)
+            mono = np.take(self.loop, np.arange(start, start + num_frames) % length)
+        if self.events is not None and self.loop is not None:
+            # Ground truth for every loop event inside this block
+            first_loop, last_loop = start // length, (start + num_frames - 1) // length
+            for k in range(first_loop, last_loop + 1):
+                for offset, kind in self.loop_events:
+                    position = k * length + offset
+                    if start <= position < start + num_frames:
+                        self.events.append((position, kind))
+        self.frames_read += num_frames
+
+        if self.realtime:
+            due = self.started + self.frames_read / self.sample_rate
+            remaining = due - time.perf_counter()
+            if remaining > 0:
+                time.sleep(remaining)
+
+        block = (mono * self.scale).astype(self.dtype)
+        return np.repeat(block[:, None], self.channels, axis=1)
+
+    def read(self, num_frames: int, exception_on_overflow: bool = False) -> bytes:
+        return self.read_frames(num_frames).tobytes()
+
+    def is_active(self):
+        return True
+
+    def stop_stream(self):
+        pass
+
+    def close(self):
+        pass
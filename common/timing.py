@@ -0,0 +1,174 @@
+"""
+Per-stage frame timing that is cheap enough to leave on.
+
+Each stage keeps its last ``size`` durations (``perf_counter_ns``) in a ring
+buffer and a rolling log-linear histogram of the same samples (HDR style:
+8 sub-buckets per power of two, so about 6% resolution at any scale). A
+sample leaving the ring is taken back out of the histogram, so percentiles
+always describe the recent window. Nothing is logged per frame; callers ask
+for ``summary()`` when they want one.
+
+Stages nest: opening "display_grid" while "loop_func" is open records it as
+"loop_func/display_grid".
+
+    with engine.stage("next_generation"):
+        grid = next_generation(grid)
+"""
+
+import time
+import numpy as np
+
+SUB_BITS = 3
+SUB_BUCKETS = 1 << SUB_BITS
+# Covers up to 2^40 ns (about 18 minutes)
+NUM_BUCKETS = (40 - SUB_BITS) * SUB_BUCKETS + 2 * SUB_BUCKETS
+
+
+def _bucket(ns: int) -> int:
+    """Histogram bucket of a duration: exact below 16 ns, then 8 per octave"""
+    if ns < 2 * SUB_BUCKETS:
+        return max(ns, 0)
+    shift = ns.bit_length() - SUB_BITS - 1
+    return min(shift * SUB_BUCKETS + (ns >> shift), NUM_BUCKETS - 1)
+
+
+def _bucket_values():
+    """Midpoint duration (ns) of every bucket"""
+    values = np.zeros(NUM_BUCKETS)
+    for index in range(NUM_BUCKETS):
+        if index < 2 * SUB_BUCKETS:
+            values[index] = index
+        else:
+            shift, top = divmod(index, SUB_BUCKETS)
+            shift -= 1
+            low = (top + SUB_BUCKETS) << shift
+            values[index] = low + (1 << shift) / 2
+    return values
+
+
+BUCKET_VALUES = _bucket_values()
+
+
+class StageStats:
+    """Ring buffer and rolling histogram of one stage's durations"""
+
+    __slots__ = ("ring", "ring_buckets", "histogram", "count", "started")
+
+    def __init__(self, size: int = 1024):
+        # Plain lists: per-item updates on them are several times cheaper than on numpy arrays
+        self.ring = [0] * size
+        self.ring_buckets = [0] * size
+        self.histogram = [0] * NUM_BUCKETS
+        self.count = 0
+        self.started = 0
+
+    def record(self, ns: int):
+        size = len(self.ring)
+        slot = self.count % size
+        if self.count >= size:
+            self.histogram[self.ring_buckets[slot]] -= 1
+        bucket = _bucket(ns)
+        self.ring[slot] = ns
+        self.ring_buckets[slot] = bucket
+        self.histogram[bucket] += 1
+        self.count += 1
+
+    def percentiles(self, qs=(50, 95, 99)):
+        """Percentiles (ns) of the recent window from the histogram"""
+        total = min(self.count, len(self.ring))
+        if not total:
+            return [0.0] * len(qs)
+        cumulative = np.cumsum(self.histogram)
+        return [float(BUCKET_VALUES[np.searchsorted(cumulative, q / 100 * total)]) for q in qs]
+
+    def summary(self) -> dict:
+        window = np.array(self.ring[:min(self.count, len(self.ring))])
+        peak = float(window.max()) if len(window) else 0.0
+        # Bucket midpoints can overshoot the largest sample in the top bucket
+        p50, p95, p99 = (min(p, peak) for p in self.percentiles())
+        return {
+            "count": self.count,
+            "mean_ms": float(window.mean()) / 1e6 if len(window) else 0.0,
+            "p50_ms": p50 / 1e6,
+            "p95_ms": p95 / 1e6,
+            "p99_ms": p99 / 1e6,
+            "max_ms": peak / 1e6,
+        }
+
+
+class _StageContext:
+    __slots__ = ("timer", "name")
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.timer.start(self.name)
+        return self
+
+    def __exit__(self, *exc):
+        self.timer.stop(self.name)
+
+
+class StageTimer:
+    """Named, nestable stage timings plus whole-frame time"""
+
+    def __init__(self, size: int = 1024, summary_interval: float = 5.0):
+        self.size = size
+        self.summary_interval = summary_interval
+        self.stages = {}
+        self.stack = []
+        self.frame_started = 0
+        self.last_summary = time.perf_counter()
+
+    def _stats(self, name):
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = StageStats(self.size)
+        return stats
+
+    def start(self, name: str):
+        path = f"{self.stack[-1]}/{name}" if self.stack else name
+        self.stack.append(path)
+        self._stats(path).started = time.perf_counter_ns()
+
+    def stop(self, name: str):
+        end = time.perf_counter_ns()
+        path = self.stack.pop()
+        stats = self.stages[path]
+        stats.record(end - stats.started)
+
+    def stage(self, name: str) -> _StageContext:
+        """Context manager timing ``name`` as a stage (nested under any open stage)"""
+        return _StageContext(self, name)
+
+    def frame_start(self):
+        self.frame_started = time.perf_counter_ns()
+        # A stage left open by an exception shouldn't swallow the next frame's stages
+        self.stack.clear()
+
+    def frame_end(self):
+        self._stats("frame").record(time.perf_counter_ns() - self.frame_started)
+
+    def summary_due(self) -> bool:
+        now = time.perf_counter()
+        if now - self.last_summary >= self.summary_interval:
+            self.last_summary = now
+            return True
+        return False
+
+    def summary(self) -> dict:
+        """{stage: count, mean/p50/p95/p99/max ms} over each stage's recent window"""
+        # A copy: the metrics thread calls this while the engine thread may be adding stages
+        return {name: stats.summary() for name, stats in list(self.stages.items())}
+
+    def format_summary(self) -> str:
+        frame = self.stages.get("frame")
+        frame_p50 = frame.percentiles((50,))[0] if frame else 0
+        lines = []
+        for name, s in self.summary().items():
+            share = f" ({s['p50_ms'] * 1e6 / frame_p50 * 100:.0f}% of frame)" if frame_p50 and name != "frame" else ""
+            lines.append(f"{name}: p50 {s['p50_ms']:.3f} p95 {s['p95_ms']:.3f} p99 {s['p99_ms']:.3f} "
+                         f"max {s['max_ms']:.3f} ms over {min(s['count'], self.size)}{share}")
+        return "\n".join(lines)
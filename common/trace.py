@@ -0,0 +1,194 @@
+"""
+Feature traces: per-frame processor output recorded to disk and replayed.
+
+A trace is two files: ``<path>`` holds fixed-size binary records, one per
+frame (a numpy structured dtype), and ``<path>.json`` holds that dtype plus
+the run's metadata (sample rate, chunk size, fps, processor, features).
+Records are appended as frames are produced, so a run that is killed still
+leaves a readable trace up to its last whole frame.
+
+Replay memory-maps the records and hands ``loop_func`` one frame at a time
+with no audio or FFT work, which makes render-side profiling repeatable.
+
+Only features the visualizer has computed by the end of the first frame are
+recorded (``Frame.is_computed``): asking for ``bands`` or the beat features
+would start the filterbank or beat tracker and change the run being timed.
+``all_features`` (VISPI_RECORD_ALL=1) records everything the processor can
+provide, so the trace replays into any visualizer, at that extra cost.
+
+    VISPI_RECORD=/tmp/run.trace python3 bilbo3.py
+    VISPI_INTERFACE=replay VISPI_TRACE=/tmp/run.trace python3 conway.py
+"""
+
+import json
+import os
+import time
+import numpy as np
+
+# Per-frame scalar features and their on-disk types
+SCALAR_FIELDS = {
+    "is_silent": "?",
+    "low_energy": "<f4",
+    "high_energy": "<f4",
+    "total_energy": "<f4",
+    "kick_energy": "<f4",
+    "snare_energy": "<f4",
+    "hat_energy": "<f4",
+    "onset": "?",
+    "beat": "?",
+    "beat_phase": "<f4",
+    "bpm": "<f4",
+}
+# Per-frame arrays; their length is fixed by the first recorded frame
+ARRAY_FIELDS = {
+    "fft": "<f4",
+    "bands": "<f4",
+    "samples": None,  # the engine's sample dtype
+}
+
+
+def recorded_features(features):
+    """The subset of ``features`` that has an on-disk field (prev_fft is the same array as fft)"""
+    return [f for f in features if f in SCALAR_FIELDS or f in ARRAY_FIELDS]
+
+
+def record_dtype(features, frame) -> np.dtype:
+    """Structured record dtype for ``features``, array lengths taken from ``frame``"""
+    fields = [("t", "<f8")]
+    for name in features:
+        if name in SCALAR_FIELDS:
+            fields.append((name, SCALAR_FIELDS[name]))
+        else:
+            value = np.asarray(frame[name])
+            fields.append((name, ARRAY_FIELDS[name] or value.dtype.str, value.shape))
+    return np.dtype(fields)
+
+
+def dtype_from_descr(descr) -> np.dtype:
+    """Inverse of ``dtype.descr`` after a JSON round trip (tuples and shapes come back as lists)"""
+    return np.dtype([(field[0], field[1]) + tuple(tuple(shape) for shape in field[2:]) for field in descr])
+
+
+def fill_record(record, features, frame, t):
+    record["t"] = t
+    for name in features:
+        record[name] = frame[name]
+
+
+class TraceRecorder:
+    """Appends one record per frame for the features the processor provides"""
+
+    def __init__(self, path: str, features, metadata=None, all_features: bool = False):
+        self.path = path
+        self.features = recorded_features(features)
+        self.all_features = all_features
+        self.metadata = dict(metadata or {})
+        self.file = None
+        self.record = None
+        self.started = None
+        self.frames = 0
+
+    def _start(self, frame):
+        if not self.all_features and hasattr(frame, "is_computed"):
+            self.features = [name for name in self.features if frame.is_computed(name)]
+        dtype = record_dtype(self.features, frame)
+        self.record = np.zeros(1, dtype=dtype)
+        self.metadata.update(features=self.features, dtype=dtype.descr, itemsize=dtype.itemsize)
+        with open(self.path + ".json", "w") as f:
+            json.dump(self.metadata, f, indent=2)
+        self.file = open(self.path, "wb")
+        self.started = time.perf_counter()
+
+    def write(self, frame):
+        """Append ``frame`` (a Frame or dict with the recorded features)"""
+        if self.file is None:
+            self._start(frame)
+        fill_record(self.record[0], self.features, frame, time.perf_counter() - self.started)
+        self.file.write(self.record.tobytes())
+        self.frames += 1
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+
+class TraceFrame:
+    """One replayed record with the dict-style access visualizers use"""
+
+    __slots__ = ("record", "features")
+
+    def __init__(self, record, features):
+        self.record = record
+        self.features = features
+
+    def __getitem__(self, key):
+        if key == "prev_fft":
+            key = "fft"
+        if key not in self.features:
+            raise KeyError(key)
+        value = self.record[key]
+        # Scalars come back as Python bool/float like the live Frame's
+        return value.item() if value.ndim == 0 else value
+
+    def __getattr__(self, key):
+        try:
+            return self[key]
+        except KeyError:
+            raise AttributeError(key) from None
+
+    def __contains__(self, key):
+        return key in self.features or key == "prev_fft" and "fft" in self.features
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return self.features
+
+
+class TraceReplayer:
+    """Memory-mapped trace read back one frame per ``next_frame``.
+
+    Stands in for the engine's stream (``stop_stream``/``close``). At the end
+    of the trace it wraps around when ``loop`` is set, else raises
+    ``EOFError``. Pacing is left to the engine's scheduler, which runs at the
+    recorded fps.
+    """
+
+    def __init__(self, path: str, loop: bool = True):
+        self.path = path
+        self.loop = loop
+        with open(path + ".json") as f:
+            self.metadata = json.load(f)
+        dtype = dtype_from_descr(self.metadata["dtype"])
+        # Whole records only: a killed recording can end mid-record
+        count = os.path.getsize(path) // dtype.itemsize
+        if not count:
+            raise ValueError(f"{path} contains no frames")
+        # Copy-on-write so a visualizer scribbling on data["fft"] can't touch the file
+        self.records = np.memmap(path, dtype=dtype, mode="c", shape=(count,))
+        self.features = tuple(self.metadata["features"]) + (("prev_fft",) if "fft" in self.metadata["features"] else ())
+        self.frames = len(self.records)
+        self.position = 0
+
+    def next_frame(self) -> TraceFrame:
+        if self.position >= self.frames:
+            if not self.loop:
+                raise EOFError(f"End of {self.path}")
+            self.position = 0
+        frame = TraceFrame(self.records[self.position], self.features)
+        self.position += 1
+        return frame
+
+    def is_active(self):
+        return True
+
+    def stop_stream(self):
+        pass
+
+    def close(self):
+        self.records = None
@@ -0,0 +1,373 @@
+"""
+Transitions between visualizers in the in-process host (vis_host.py).
+
+Instead of clearing the screen on a swap, the host keeps the outgoing
+visualizer's last picture and composites the incoming one over it for
+``TRANSITION["frames"]`` frames:
+
+- terminal: a ``ScreenTap`` on stdout keeps recent output, which is parsed
+  into a cell grid (``Screen``) at the swap. The incoming visualizer's output
+  is held back and parsed into its own grid, and per frame the cells that
+  have switched over (random order for "dissolve", left to right for "wipe")
+  are written out, only where they differ from what is on screen.
+- framebuffer: the outgoing image is copied at the swap and blended with
+  what the incoming visualizer drew each frame, on the RGB565 pixels.
+
+Each step is timed as the "transition" stage; one that would overrun the
+frame budget ends the transition on the next frame.
+"""
+
+import collections
+import re
+import time
+import numpy as np
+
+from .framebuffer import (FB_PATH, COUNT_WRITES, counters, framebuffer_geometry, framebuffer_size,
+                          open_framebuffer, map_framebuffer)
+
+CLEAR = "\033[2J"
+RESET = "\033[0m"
+# Older output is dropped from the tap; visualizers repaint well within this
+MAX_HISTORY = 32768
+
+_TOKEN = re.compile(r"\x1b\[([0-9;?]*)([@-~])|\x1b[^\[]?|([\r\n])|([^\x1b\r\n]+)")
+
+
+class ScreenTap:
+    """Stands in for sys.stdout: passes output through and remembers what is on screen.
+
+    Keeps the output since the last full clear (up to ``MAX_HISTORY``
+    characters). While ``holding``, output is collected for the compositor
+    instead of reaching the terminal.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.history = collections.deque()
+        self.history_size = 0
+        self.holding = False
+        self.held = []
+
+    def write(self, text):
+        if self.holding:
+            self.held.append(text)
+            return len(text)
+        return self.emit(text)
+
+    def emit(self, text):
+        """Write to the terminal even while holding"""
+        clear = text.rfind(CLEAR)
+        if clear >= 0:
+            self.history.clear()
+            self.history_size = 0
+            text_kept = text[clear:]
+        else:
+            text_kept = text
+        self.history.append(text_kept)
+        self.history_size += len(text_kept)
+        while self.history_size > MAX_HISTORY and len(self.history) > 1:
+            self.history_size -= len(self.history.popleft())
+        return self.stream.write(text)
+
+    def take_held(self) -> str:
+        text = "".join(self.held)
+        self.held.clear()
+        return text
+
+    def snapshot(self, screen):
+        """Replay the remembered output onto ``screen``"""
+        screen.feed("".join(self.history))
+        return screen
+
+    def flush(self):
+        self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+class Styles:
+    """SGR attribute strings by id, shared by the screens being composited (0 is the default)"""
+
+    def __init__(self):
+        self.sgr = [""]
+        self.ids = {(): 0}
+
+    def id(self, params: tuple) -> int:
+        style = self.ids.get(params)
+        if style is None:
+            style = self.ids[params] = len(self.sgr)
+            self.sgr.append(f"\033[{';'.join(params)}m")
+        return style
+
+
+class Screen:
+    """A terminal's cells (glyph + SGR style id) built by interpreting its output.
+
+    Parsing works on plain lists, which is several times faster than numpy
+    for one-cell writes; ``cells()`` hands the grid over as arrays.
+    """
+
+    def __init__(self, cols: int, rows: int, styles: Styles = None):
+        self.cols, self.rows = cols, rows
+        self.chars = [[" "] * cols for _ in range(rows)]
+        self.attrs = [[0] * cols for _ in range(rows)]
+        self.styles = styles or Styles()
+        self.x = self.y = 0
+        self.params = ()
+        self.style = 0
+        # (current params, SGR parameters) -> (params, style id)
+        self._sgr_cache = {}
+
+    def cells(self):
+        """(chars, style ids) as (rows, cols) arrays"""
+        return np.array(self.chars, dtype="<U1"), np.array(self.attrs, dtype=np.int32)
+
+    def _clear_rows(self, start, stop):
+        for y in range(start, stop):
+            self.chars[y] = [" "] * self.cols
+            self.attrs[y] = [0] * self.cols
+
+    def _newline(self):
+        self.x = 0
+        self.y += 1
+        if self.y >= self.rows:
+            self.chars.append(self.chars.pop(0))
+            self.attrs.append(self.attrs.pop(0))
+            self._clear_rows(self.rows - 1, self.rows)
+            self.y = self.rows - 1
+
+    def _text(self, run):
+        while run:
+            if self.x >= self.cols:
+                self._newline()
+            take = min(len(run), self.cols - self.x)
+            x = self.x
+            self.chars[self.y][x:x + take] = run[:take]
+            self.attrs[self.y][x:x + take] = [self.style] * take
+            self.x += take
+            run = run[take:]
+
+    def _sgr(self, params):
+        key = (self.params, params)
+        cached = self._sgr_cache.get(key)
+        if cached is None:
+            codes = tuple(params.split(";"))
+            if codes in (("",), ("0",)):
+                new = ()
+            elif codes[0] in ("", "0"):
+                new = codes[1:]
+            else:
+                new = self.params + codes
+            cached = self._sgr_cache[key] = (new, self.styles.id(new))
+        self.params, self.style = cached
+
+    def _csi(self, params, command):
+        if command == "m":
+            self._sgr(params)
+            return
+        args = [int(p) if p.isdigit() else 0 for p in params.split(";")]
+        if command in "Hf":
+            row = args[0] if args[0] else 1
+            col = args[1] if len(args) > 1 and args[1] else 1
+            self.y, self.x = min(row, self.rows) - 1, min(col, self.cols) - 1
+        elif command == "J":
+            if args[0] in (2, 3):
+                self._clear_rows(0, self.rows)
+            elif args[0] == 0:
+                self._clear_rows(self.y + 1, self.rows)
+                self._erase_line(self.x, self.cols)
+        elif command == "K":
+            if args[0] == 0:
+                self._erase_line(self.x, self.cols)
+            elif args[0] == 1:
+                self._erase_line(0, self.x + 1)
+            else:
+                self._erase_line(0, self.cols)
+        elif command == "A":
+            self.y = max(0, self.y - max(1, args[0]))
+        elif command == "B":
+            self.y = min(self.rows - 1, self.y + max(1, args[0]))
+        elif command == "C":
+            self.x = min(self.cols - 1, self.x + max(1, args[0]))
+        elif command == "D":
+            self.x = max(0, self.x - max(1, args[0]))
+        # Anything else (cursor visibility, modes) doesn't change cells
+
+    def _erase_line(self, start, stop):
+        stop = min(stop, self.cols)
+        if start < stop:
+            self.chars[self.y][start:stop] = [" "] * (stop - start)
+            self.attrs[self.y][start:stop] = [0] * (stop - start)
+
+    def feed(self, text: str):
+        # Rows are replaced in place, so these stay valid
+        chars, attrs, cols, rows = self.chars, self.attrs, self.cols, self.rows
+        for params, command, control, run in _TOKEN.findall(text):
+            if run:
+                # Most writes are one glyph at a time
+                if len(run) == 1 and self.x < cols:
+                    x = self.x
+                    chars[self.y][x] = run
+                    attrs[self.y][x] = self.style
+                    self.x = x + 1
+                else:
+                    self._text(run)
+            elif command == "m":
+                self._sgr(params)
+            elif command == "H" and params:
+                row, _, col = params.partition(";")
+                self.y = max(min(int(row or 1), rows), 1) - 1
+                self.x = max(min(int(col or 1), cols), 1) - 1
+            elif command:
+                self._csi(params, command)
+            elif control == "\n":
+                # The tty turns \n into \r\n
+                self._newline()
+            elif control == "\r":
+                self.x = 0
+
+
+class TerminalTransition:
+    """Composites the incoming visualizer's cells over the outgoing ones"""
+
+    def __init__(self, before: Screen, style: str = "dissolve"):
+        self.styles = before.styles
+        self.before_chars, self.before_attrs = before.cells()
+        self.after = Screen(before.cols, before.rows, before.styles)
+        shape = self.before_chars.shape
+        if style == "wipe":
+            self.order = np.broadcast_to(np.arange(before.cols) / before.cols, shape)
+        else:
+            self.order = np.random.random(shape)
+        # What the terminal shows right now: the outgoing visualizer's last frame
+        self.shown_chars, self.shown_attrs = self.before_chars, self.before_attrs
+
+    def step(self, progress: float, incoming: str) -> str:
+        """Escape sequences that move the screen to ``progress`` (0..1) of the way over"""
+        self.after.feed(incoming)
+        after_chars, after_attrs = self.after.cells()
+        switched = self.order < progress
+        chars = np.where(switched, after_chars, self.before_chars)
+        attrs = np.where(switched, after_attrs, self.before_attrs)
+        changed = (chars != self.shown_chars) | (attrs != self.shown_attrs)
+        self.shown_chars, self.shown_attrs = chars, attrs
+
+        sgr = self.styles.sgr
+        out = []
+        current = -1
+        for y in np.flatnonzero(changed.any(axis=1)).tolist():
+            xs = np.flatnonzero(changed[y])
+            row_chars, row_attrs = chars[y].tolist(), attrs[y].tolist()
+            # Split the row's changed cells into runs of neighbours: one cursor move per run
+            breaks = np.flatnonzero(np.diff(xs) > 1) + 1
+            for run in np.split(xs, breaks):
+                run = run.tolist()
+                out.append(f"\033[{y + 1};{run[0] + 1}H")
+                for x in run:
+                    style = row_attrs[x]
+                    if style != current:
+                        out.append(RESET + sgr[style])
+                        current = style
+                    out.append(row_chars[x])
+        if out:
+            out.append(RESET)
+        return "".join(out)
+
+
+def uses_framebuffer(module) -> bool:
+    """Whether a visualizer module draws through common/framebuffer.py"""
+    return any(value is open_framebuffer or value is map_framebuffer for value in vars(module).values())
+
+
+def _spread(pixels):
+    """RGB565 to 0x07E0F81F-spaced uint32, leaving room to scale all channels in one multiply"""
+    wide = pixels.astype(np.uint32)
+    return (wide | (wide << 16)) & 0x07E0F81F
+
+
+class FramebufferTransition:
+    """Blends the incoming visualizer's framebuffer frames with the outgoing image"""
+
+    def __init__(self, style: str = "dissolve"):
+        pixels = framebuffer_size() // 2
+        self.fb = np.memmap(FB_PATH, dtype=np.uint16, mode="r+", shape=(pixels,))
+        self.before = _spread(self.fb)
+        self.outgoing = None
+        if style == "wipe":
+            self.outgoing = np.array(self.fb)
+            try:
+                width = framebuffer_geometry()[0]
+            except OSError:
+                # A plain file stand-in: wipe top to bottom instead
+                width = pixels
+            self.edge = (np.arange(pixels) % width) / width
+
+    def step(self, progress: float):
+        if self.outgoing is not None:
+            # Incoming pixels where the edge has passed, outgoing elsewhere
+            np.copyto(self.fb, self.outgoing, where=self.edge >= progress)
+        else:
+            alpha = int(progress * 32)
+            mixed = (self.before * (32 - alpha) + _spread(self.fb) * alpha) >> 5
+            mixed &= 0x07E0F81F
+            self.fb[:] = (mixed | (mixed >> 16)).astype(np.uint16)
+        if COUNT_WRITES:
+            counters["bytes"] += self.fb.nbytes
+
+    def close(self):
+        self.fb.flush()
+        self.fb = None
+
+
+class Transition:
+    """One swap's transition, stepped once per frame after the incoming visualizer drew"""
+
+    def __init__(self, tap: ScreenTap, cols: int, rows: int, frames: int, style: str = "dissolve",
+                 framebuffer: bool = False):
+        started = time.perf_counter()
+        self.tap = tap
+        self.frames = frames
+        self.frame = 0
+        self.overran = False
+        self.step_ms = 0.0
+        self.terminal = TerminalTransition(tap.snapshot(Screen(cols, rows)), style)
+        self.framebuffer = None
+        if framebuffer:
+            try:
+                self.framebuffer = FramebufferTransition(style)
+            except (OSError, ValueError):
+                pass
+        tap.holding = True
+        self.setup_ms = (time.perf_counter() - started) * 1000
+
+    @property
+    def done(self) -> bool:
+        return self.frame >= self.frames
+
+    def step(self, budget: float = None):
+        """Composite this frame after the incoming visualizer drew.
+
+        A step that takes more than half of ``budget`` (the frame period, in
+        seconds) leaves too little for the visualizer, so the next step
+        jumps straight to the end.
+        """
+        started = time.perf_counter()
+        self.frame = self.frames if self.overran else self.frame + 1
+        progress = self.frame / self.frames
+        if self.framebuffer:
+            self.framebuffer.step(progress)
+        output = self.terminal.step(progress, self.tap.take_held())
+        self.tap.emit(output)
+        self.step_ms = (time.perf_counter() - started) * 1000
+        if budget and self.step_ms > budget * 500:
+            self.overran = True
+        if self.done:
+            self.close()
+
+    def close(self):
+        self.tap.holding = False
+        self.tap.take_held()
+        if self.framebuffer:
+            self.framebuffer.close()
+            self.framebuffer = None
@@ -16,23 +16,24 @@ Features:
 - Explosion/flurry effect on break
 - Ultra-low latency single-buffer writes
 """
-import os, sys, time, random, subprocess, shutil
+import os, sys, time, random, subprocess
 import numpy as np
-import pyaudio
-from scipy.ndimage import median_filter
 from PIL import Image, ImageDraw, ImageFont
 import colorsys
+from common import engine
+
+# === Initialize Engine ===
+# Gated, square-root compressed rfft bands: the "console_demo" processor (common/processors.py)
+engine_data = engine.initialize(
+    interface_type="focusrite2i4",
+    processor_type="console_demo",
+    debug=False
+)
 
 # === Configuration ===
-CHUNK, RATE = 1024, 44100
-CHANNELS, FORMAT = 2, pyaudio.paInt16
-INPUT_INDEX = 1
 NUM_BARS = 64
-SMOOTHING = 0.2
-SENSITIVITY = 5.0
-GATE_THRESHOLD = 0.1
-FPS = 30
-DELAY = 1.0 / FPS
+# Frames per second the engine runs this at; durations below are in frames
+FPS = engine_data["frame_rate"]
 MAX_INT16 = 32768.0
 GRID_COLS, GRID_ROWS = 8, 8
 WIDTH, HEIGHT = 480, 360
@@ -43,12 +44,11 @@ CELL_WORD_THRESHOLD = 0.7
 
 # Countdown-break and explosion
 COUNTDOWN_START = 10
-BREAK_DURATION = FPS
-EXPLOSION_DURATION = FPS // 2
+BREAK_DURATION = round(FPS)
+EXPLOSION_DURATION = round(FPS / 2)
 
 # Terminal geometry
-TERM_GEO = shutil.get_terminal_size(fallback=(80, 24))
-TERM_ROWS, TERM_COLS = TERM_GEO.lines, TERM_GEO.columns
+TERM_ROWS, TERM_COLS = engine_data["rows"], engine_data["cols"]
 SCROLL_Y_TOP1 = 2
 SCROLL_Y_TOP2 = 4
 SCROLL_Y_BOTTOM = TERM_ROWS - 2
@@ -80,34 +80,9 @@ try:
 except:
     FONT = ImageFont.load_default()
 
-# Audio engine
-class AudioEngine:
-    def __init__(self):
-        pa = pyaudio.PyAudio()
-        self.stream = pa.open(format=FORMAT, channels=CHANNELS,
-                              rate=RATE, input=True,
-                              input_device_index=INPUT_INDEX,
-                              frames_per_buffer=CHUNK)
-    def read(self):
-        data = self.stream.read(CHUNK, exception_on_overflow=False)
-        return np.frombuffer(data, np.int16)[::CHANNELS]
-
-# Spectrum compute
-def compute_spectrum(samples, prev):
-    fft = np.abs(np.fft.rfft(samples))
-    focus = fft[:len(fft)*2//3]
-    bands = np.interp(np.linspace(0, len(focus), NUM_BARS), np.arange(len(focus)), focus)
-    bands *= SENSITIVITY
-    p95 = np.percentile(bands, 95) + 1e-6
-    norm = np.clip(bands / p95, 0, 1)
-    norm[norm < GATE_THRESHOLD] = 0
-    smooth = median_filter(norm**0.5, 1)
-    return SMOOTHING * prev + (1 - SMOOTHING) * smooth
-
 # Framebuffer visualizer
 class FramebufferVisualizer:
     def __init__(self):
-        self.prev = np.zeros(NUM_BARS)
         # scrolling text bands
         self.text_fb_top1 = self._new_text(); self.x_fb_top1 = WIDTH
         self.text_fb_top2 = self._new_text(); self.x_fb_top2 = WIDTH
@@ -253,15 +228,13 @@ class TerminalScroller:
         sys.stdout.flush()
 
 # Main
+viz = FramebufferVisualizer(); glitch = TerminalGlitch(); scroller = TerminalScroller()
+
+def main_loop(data):
+    viz.render(data["fft"])
+    glitch.render()
+    scroller.render()
+
 if __name__=='__main__':
-    audio = AudioEngine(); viz = FramebufferVisualizer(); glitch = TerminalGlitch(); scroller = TerminalScroller()
-    try:
-        while True:
-            samples = audio.read()
-            spec = compute_spectrum(samples, viz.prev); viz.prev = spec
-            viz.render(spec)
-            glitch.render()
-            scroller.render()
-            time.sleep(DELAY)
-    except KeyboardInterrupt:
-        print('\nBye')
+    engine.run(engine_data, main_loop)
+    print('\nBye')
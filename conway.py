@@ -1,13 +1,13 @@
 import numpy as np
-import pyaudio
 import random
 import sys
 import shutil
 import time
 import os
-from scipy.ndimage import median_filter
 from typing import Tuple, List
 from common.engine import AudioEngine
+from common.renderer import encode_row
+from common import glyphs
 
 # === Initialize Engine ===
 engine = AudioEngine()
@@ -77,22 +77,25 @@ colors = [
 ]
 RESET = "\033[0m"
 
+# encode_row attributes: 0 is the default, 1.. index colors
+cell_glyphs = np.array(cell_chars)
+color_sgr = [RESET] + colors
+
 def display_grid(grid: List[List[int]], use_color: bool = False):
     """Display the grid using cell_chars and optional colors."""
-    print('\033[H', end='')
-    for row in grid:
-        line = []
-        for cell in row:
-            if cell:
-                char = random.choice(cell_chars)
-                if use_color:
-                    color = random.choice(colors)
-                    line.append(f"{color}{char}{RESET}")
-                else:
-                    line.append(char)
-            else:
-                line.append(' ')
-        print(''.join(line), end='\r\n', flush=True)
+    live = np.asarray(grid, dtype=bool)
+    chars = np.where(live, cell_glyphs[np.random.randint(len(cell_chars), size=live.shape)], " ")
+    if not use_color:
+        print('\033[H' + '\r\n'.join(''.join(row) for row in chars.tolist()), end='\r\n')
+        return
+    attrs = np.where(live, np.random.randint(1, len(colors) + 1, size=live.shape), 0)
+    # A color is sent only where it changes, not as a color/reset pair around every cell
+    lines = []
+    current = 0
+    for row_glyphs, row_attrs in zip(chars, attrs):
+        line, current = encode_row(row_glyphs, row_attrs, color_sgr, current, fill_blanks=True)
+        lines.append(line)
+    print('\033[H' + '\r\n'.join(lines) + (RESET if current else ''), end='\r\n')
 
 def generate_triplet(grid: List[List[int]]) -> None:
     """Generate a triplet (three cells in a line) at a random location."""
@@ -214,11 +217,7 @@ def display_status(kick_val: int, hat_val: float, total_energy: float, patterns_
     print("\033[K", end='')
     
     # Create FFT histogram using blocks
-    blocks = '▁▂▃▄▅▆▇█'
-    histogram = ''
-    for val in fft:
-        block_idx = min(int(val * len(blocks)), len(blocks) - 1)
-        histogram += blocks[block_idx]
+    histogram = glyphs.row(fft, "blocks")
     
     # Display FFT histogram
     print(histogram, end='\r\n', flush=True)
@@ -248,8 +247,10 @@ def main_loop(data):
     
     if data["is_silent"]:
         # Continue evolution even during silence, but don't generate new patterns
-        state["grid"] = next_generation(state["grid"])
-        display_grid(state["grid"], use_color=False)
+        with engine.stage("next_generation"):
+            state["grid"] = next_generation(state["grid"])
+        with engine.stage("display_grid"):
+            display_grid(state["grid"], use_color=False)
         return
 
     # Get processed audio data from engine
@@ -287,23 +288,37 @@ def main_loop(data):
     patterns_to_generate = int((data["kick_energy"] + data["snare_energy"] + data["hat_energy"]) * gen_coeff)
     
     # Generate patterns proportional to energy
-    for _ in range(patterns_to_generate):
-        generate_pattern(state["grid"], fft)
-        state["patterns_generated"] += 1
+    with engine.stage("generate_patterns"):
+        for _ in range(patterns_to_generate):
+            generate_pattern(state["grid"], fft)
+            state["patterns_generated"] += 1
 
     # Update and display the game state
     use_color = data["kick_energy"] > 0.2
-    display_grid(state["grid"], use_color=use_color)
-    display_status(lo_energy, hi_energy, total_energy, state["patterns_generated"], fft)
-    state["grid"] = next_generation(state["grid"])
+    with engine.stage("display_grid"):
+        display_grid(state["grid"], use_color=use_color)
+    with engine.stage("display_status"):
+        display_status(lo_energy, hi_energy, total_energy, state["patterns_generated"], fft)
+    with engine.stage("next_generation"):
+        state["grid"] = next_generation(state["grid"])
     time.sleep(min(0.2 / engine.fps, (0.4 / engine.fps) * ((data["kick_energy"] + data["snare_energy"] + data["hat_energy"])/gen_coeff)))
 
-# === Run Engine ===
-print('\033[?25l', end='')  # Hide cursor
-print("[conway] Starting Conway's Game of Life with engine...")
-try:
-    engine.run(main_loop)
-except KeyboardInterrupt:
+# === Plugin hooks (vis_host.py) ===
+def setup():
+    print('\033[?25l', end='')  # Hide cursor
+
+
+def teardown():
     print('\033[?25h', end='')  # Show cursor
     print(RESET)
-    print("\nVisualizer stopped.")
+
+
+# === Run Engine ===
+if __name__ == "__main__":
+    setup()
+    print("[conway] Starting Conway's Game of Life with engine...")
+    try:
+        engine.run(main_loop)
+    except KeyboardInterrupt:
+        teardown()
+        print("\nVisualizer stopped.")
@@ -5,15 +5,16 @@ Full-screen display of all energy values from the audio engine
 """
 
 import time
+import numpy as np
 from common import engine
+from common import glyphs
+from common.canvas import HalfBlockCanvas
 
 # === SETUP ===
 engine_data = engine.initialize(debug=True)
 cols = engine_data["cols"]
 rows = engine_data["rows"]
 
-# Clear screen once at startup
-print("\033[2J\033[H", end="")
 
 # === STATE ===
 state = {
@@ -25,9 +26,21 @@ state = {
         "snare_energy": [],
         "hat_energy": []
     },
-    "max_history": cols - 20  # Leave space for labels
+    "max_history": cols - 20,  # Leave space for labels
+    "spectrum": None
 }
 
+# FFT spectrum in half-block pixels (two per cell row), blue at the bottom to red at the top;
+# it gets the rows left under the text, up to 6
+SPECTRUM_ROWS = max(1, min(6, rows - 19))
+SPECTRUM_COLORS = (94, 96, 92, 93, 91)
+
+def spectrum_canvas(width):
+    canvas = state["spectrum"]
+    if canvas is None or canvas.cols != width:
+        canvas = state["spectrum"] = HalfBlockCanvas(width, SPECTRUM_ROWS, colors=SPECTRUM_COLORS)
+    return canvas
+
 def draw_bar(value, max_width, label, color_code, center_padding):
     """Draw a horizontal bar with label"""
     bar_width = int(value * max_width)
@@ -42,15 +55,11 @@ def draw_history_graph(history, max_width, label, color_code, center_padding):
     if len(history) == 0:
         graph = "░" * max_width
     else:
-        # Normalize history for display
-        if max(history) > 0:
-            normalized = [int((val / max(history)) * 3) for val in history[-max_width:]]
-        else:
-            normalized = [0] * len(history[-max_width:])
-        
-        # Create graph with different characters for different heights
-        chars = ["░", "▒", "▓", "█"]
-        graph = "".join(chars[min(val, 3)] for val in normalized)
+        # Normalize history to 0-3 so only the peak reaches the top shade
+        recent = np.asarray(history[-max_width:])
+        peak = max(history)
+        normalized = recent * (3 / peak) if peak > 0 else np.zeros(len(recent))
+        graph = glyphs.row(normalized, "shades", hi=4)
         graph += "░" * (max_width - len(graph))  # Fill remaining space
     
     current_val = history[-1] if history else 0
@@ -139,24 +148,26 @@ def main_loop(data):
     fft_title = " " * center_padding + f"\033[1;33mFFT SPECTRUM (all {fft_len} bins):\033[0m"
     print(fft_title + " " * max(0, cols - len(fft_title)))
     
-    fft_display = ""
+    fft = np.asarray(data["fft"])
     if spectrum_width < fft_len:
         # If we need to compress, sample evenly across the spectrum
-        step = fft_len / spectrum_width
-        for i in range(spectrum_width):
-            fft_index = int(i * step)
-            height = int(data["fft"][fft_index] * 4)
-            chars = ["░", "▒", "▓", "█"]
-            fft_display += chars[min(height, 3)]
-    else:
-        # If we have enough space, show all bins
-        for i in range(fft_len):
-            height = int(data["fft"][i] * 4)
-            chars = ["░", "▒", "▓", "█"]
-            fft_display += chars[min(height, 3)]
-    
-    fft_line = " " * center_padding + f"\033[96m{fft_display}\033[0m"
-    print(fft_line + " " * max(0, cols - len(fft_line)))
+        fft = fft[(np.arange(spectrum_width) * (fft_len / spectrum_width)).astype(int)]
+    canvas = spectrum_canvas(spectrum_width)
+    canvas.clear()
+    # Color index per pixel row, top first
+    gradient = len(SPECTRUM_COLORS) - np.arange(canvas.height) * len(SPECTRUM_COLORS) // canvas.height
+    canvas.fill_columns(fft, value=gradient)
+    right_padding = " " * max(0, cols - center_padding - spectrum_width)
+    for line in canvas.lines():
+        print(" " * center_padding + line + right_padding)
+
+# === Plugin hooks (vis_host.py) ===
+def setup():
+    # Clear screen once at startup
+    print("\033[2J\033[H", end="")
+
 
 # === RUN ===
-engine.run(engine_data, main_loop)
\ No newline at end of file
+if __name__ == "__main__":
+    setup()
+    engine.run(engine_data, main_loop)
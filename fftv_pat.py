@@ -12,6 +12,9 @@ import random
 import colorsys
 import shutil
 from common.engine import AudioEngine
+from common.config import BANDS
+from common.framebuffer import open_framebuffer
+from common import glyphs
 
 # === Initialize Engine ===
 engine = AudioEngine()
@@ -23,8 +26,7 @@ engine.initialize(
 
 # === Configuration ===
 WIDTH, HEIGHT = 480, 360
-FB_PATH = "/dev/fb0"
-NUM_BARS = 64
+NUM_BARS = BANDS["num_bands"]
 BAR_WIDTH = WIDTH // NUM_BARS
 
 # === State ===
@@ -100,7 +102,7 @@ def main_loop(data):
     # Get processed audio data from engine
     samples = data["samples"]
     is_silent = data["is_silent"]
-    engine_fft = data["fft"]  # This is already processed by the engine
+    bands = data["bands"]  # Mel-spaced bars, normalized by the engine
     
     # Detect transitions
     just_became_loud = state["prev_silent"] and not is_silent
@@ -115,10 +117,10 @@ def main_loop(data):
     import time
     hue_offset = (time.time() % 10) / 10.0
     for i in range(NUM_BARS):
-        bar_height = int(engine_fft[i] * HEIGHT)
+        bar_height = int(bands[i] * HEIGHT)
         x = i * BAR_WIDTH
         hue = (i / NUM_BARS + hue_offset) % 1.0
-        brightness = min(1.0, engine_fft[i] * 1.2)
+        brightness = min(1.0, bands[i] * 1.2)
         color = hsv_to_rgb(hue, 1.0, brightness)
         draw.rectangle((x, HEIGHT - bar_height, x + BAR_WIDTH - 1, HEIGHT), fill=color)
 
@@ -153,7 +155,7 @@ def main_loop(data):
 
     # Write to framebuffer
     buf = rgb888_to_rgb565(img)
-    with open(FB_PATH, "rb+") as f:
+    with open_framebuffer() as f:
         for row in range(HEIGHT):
             offset = ((y_offset + row) * FB_WIDTH + x_offset) * 2
             f.seek(offset)
@@ -173,12 +175,8 @@ def main_loop(data):
 
     # === ASCII waveform ===
     wave = samples[::len(samples) // cols][:cols]
-    norm_wave = np.interp(wave, (-30000, 30000), (0, 7)).astype(int)
-    wave_chars = ['▁', '▂', '▃', '▄', '▅', '▆', '▇', '█']
-    print("\033[%d;0H" % (rows - 2), end='')
-    for idx in norm_wave:
-        print(f"\033[92m{wave_chars[idx]}\033[0m", end='')
-    print("\033[0m")
+    # One color for the whole run instead of a color/reset pair per glyph
+    print(f"\033[{rows - 2};0H\033[92m{glyphs.row(wave, 'blocks', lo=-30000, hi=30000)}\033[0m")
 
 # === Run Engine ===
 if __name__ == "__main__":
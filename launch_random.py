@@ -2,9 +2,12 @@ import subprocess
 import time
 import random
 import os
+import select
 import signal
 import sys
 
+from common.heartbeat import HeartbeatMonitor
+
 # === Init Log ===
 LOGFILE = "/tmp/vis_log.txt"
 def log(msg):
@@ -28,6 +31,18 @@ VISUALIZERS = [
 ]
 SWITCH_INTERVAL = 12
 SWITCH_CHANCE = 0.65
+# Next candidates kept spawned with their imports done, parked until activated
+POOL_SIZE = 2
+# How long a retiring visualizer gets to release the audio device
+STOP_TIMEOUT = 2.0
+READY_TIMEOUT = 30.0
+# Watchdog on the engine's per-frame heartbeat (common/heartbeat.py)
+WATCH_TICK = 0.1
+STALL_AFTER = 0.5           # no frame for this long: frozen
+SLOW_FRAME = 0.25           # frames slower than this...
+SLOW_FRAMES = 4             # ...this many in a row: too slow to keep
+FIRST_FRAME_TIMEOUT = 10.0  # no frame by then: a stall if the engine started, else watch the process only
+STALL_STOP_TIMEOUT = 0.2    # a frozen visualizer gets no grace period
 
 # === Detect if visualizer is terminal-based ===
 def is_terminal_visualizer(script):
@@ -35,61 +50,213 @@ def is_terminal_visualizer(script):
         "fftv_pat"
     ])
 
-# === Launch visualizer ===
-def launch(script):
-    path = os.path.join(VISUALIZER_DIR, script)
-    log(f"Launching visualizer: {script}")
-
-    try:
-        if is_terminal_visualizer(script):
-            return subprocess.Popen(
-                ["python3", path],
-                stdout=open("/dev/tty1", "w"),
-                stderr=subprocess.STDOUT,
-                preexec_fn=os.setsid
-            )
-        else:
-            return subprocess.Popen(
-                ["python3", path],
-                preexec_fn=os.setsid
-            )
-    except Exception as e:
-        log(f"Error launching {script}: {e}")
+# === Pre-warmed candidates ===
+class Candidate:
+    """A visualizer process parked in common/prewarm.py until ``activate``"""
+
+    def __init__(self, script):
+        self.script = script
+        self.spawned = time.perf_counter()
+        self.ready_ms = None
+        self.monitor = None
+        self.unsupervised = False
+        path = os.path.join(VISUALIZER_DIR, script)
+        ready_r, ready_w = os.pipe()
+        self.heartbeat_r, heartbeat_w = os.pipe()
+        output = {"stdout": open("/dev/tty1", "w"), "stderr": subprocess.STDOUT} if is_terminal_visualizer(script) else {}
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "common.prewarm", path, str(ready_w)],
+            cwd=VISUALIZER_DIR,
+            stdin=subprocess.PIPE,
+            pass_fds=(ready_w, heartbeat_w),
+            env={**os.environ, "VISPI_HEARTBEAT": str(heartbeat_w)},
+            preexec_fn=os.setsid,
+            **output
+        )
+        os.close(ready_w)
+        os.close(heartbeat_w)
+        if output:
+            output["stdout"].close()
+        self.ready = os.fdopen(ready_r, "r")
+
+    def _read_line(self, timeout):
+        if select.select([self.ready], [], [], timeout)[0]:
+            return self.ready.readline().strip()
         return None
 
+    def poll_ready(self, timeout=0.0):
+        """True once the child has finished its imports"""
+        if self.ready_ms is None:
+            line = self._read_line(timeout)
+            if line and line.startswith("ready"):
+                self.ready_ms = float(line.split()[1])
+                log(f"Pre-warmed {self.script}: imports {self.ready_ms:.0f} ms, "
+                    f"{(time.perf_counter() - self.spawned) * 1000:.0f} ms since spawn")
+        return self.ready_ms is not None
+
+    def activate(self):
+        """Start rendering; returns ms from 'go' to the script running"""
+        started = time.perf_counter()
+        self.proc.stdin.write(b"go\n")
+        self.proc.stdin.flush()
+        line = self._read_line(READY_TIMEOUT)
+        if line != "running":
+            raise RuntimeError(f"{self.script} did not start ({line!r})")
+        self.ready.close()
+        self.monitor = HeartbeatMonitor(self.heartbeat_r, stall_after=STALL_AFTER, slow_frame=SLOW_FRAME,
+                                        slow_frames=SLOW_FRAMES, startup_grace=FIRST_FRAME_TIMEOUT)
+        return (time.perf_counter() - started) * 1000
+
+    def stop(self, timeout=STOP_TIMEOUT):
+        try:
+            os.killpg(os.getpgid(self.proc.pid), signal.SIGTERM)
+            self.proc.wait(timeout)
+        except subprocess.TimeoutExpired:
+            os.killpg(os.getpgid(self.proc.pid), signal.SIGKILL)
+            self.proc.wait()
+        except ProcessLookupError:
+            pass
+        if not self.ready.closed:
+            self.ready.close()
+        if self.monitor:
+            self.monitor.close()
+        elif self.heartbeat_r is not None:
+            os.close(self.heartbeat_r)
+        self.heartbeat_r = None
+
+def refill(pool, current_script):
+    """Top the pool up with scripts that aren't running or already waiting"""
+    taken = {current_script} | {c.script for c in pool}
+    while len(pool) < POOL_SIZE:
+        choices = [v for v in VISUALIZERS if v not in taken]
+        if not choices:
+            break
+        script = random.choice(choices)
+        pool.append(Candidate(script))
+        taken.add(script)
+
+def take_next(pool, current_script):
+    """A ready candidate if there is one, else the longest-waiting one"""
+    for candidate in list(pool):
+        if candidate.proc.poll() is not None:
+            log(f"Candidate {candidate.script} exited while parked")
+            candidate.stop()
+            pool.remove(candidate)
+    refill(pool, current_script)
+    for candidate in pool:
+        if candidate.poll_ready():
+            break
+    else:
+        candidate = pool[0]
+        log(f"No candidate ready yet, waiting on {candidate.script}")
+        candidate.poll_ready(READY_TIMEOUT)
+    pool.remove(candidate)
+    return candidate
+
+def switch_to(candidate, current, stop_timeout=STOP_TIMEOUT):
+    """Tear the old visualizer down, then let the new one open the device"""
+    started = time.perf_counter()
+    if current:
+        current.stop(stop_timeout)
+    stopped = time.perf_counter()
+    startup_ms = candidate.activate()
+    log(f"Switched to {candidate.script}: stop {(stopped - started) * 1000:.0f} ms, "
+        f"start {startup_ms:.0f} ms, total {(time.perf_counter() - started) * 1000:.0f} ms")
+    return candidate
+
+def switch_next(pool, current, stop_timeout=STOP_TIMEOUT):
+    """switch_to the next candidate from the pool; one that died while parked is dropped for the one after"""
+    current_script = current.script if current else None
+    while True:
+        candidate = take_next(pool, current_script)
+        try:
+            return switch_to(candidate, current, stop_timeout)
+        except (RuntimeError, OSError) as e:
+            log(f"Candidate {candidate.script} failed to start ({e}); trying the next one")
+            candidate.stop()
+            # switch_to already stopped the old visualizer
+            current = None
+
+def watch(current, pool, duration, recovering=None):
+    """Supervise ``current`` for ``duration`` s on its heartbeat.
+
+    Returns None if it kept up, else why it has to go ("stall", "slow loop",
+    "exit"). A script that never beats is only checked for exiting.
+    ``recovering`` is (problem, detected at) from the previous visualizer;
+    the new one's first frame is logged against it. An engine script that
+    hangs before its first frame counts as a stall.
+    """
+    deadline = time.perf_counter() + duration
+    monitor = current.monitor
+    while True:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            return None
+        monitor.poll(min(WATCH_TICK, remaining))
+        # Pick up ready messages so the log shows warm-up times as they finish
+        for candidate in pool:
+            candidate.poll_ready()
+
+        if recovering and monitor.frame is not None:
+            problem, detected = recovering
+            log(f"Recovered: {current.script} first frame {(time.perf_counter() - detected) * 1000:.0f} ms "
+                f"after the {problem} was detected")
+            recovering = None
+
+        status = monitor.status()
+        if status == "exited" or current.proc.poll() is not None:
+            log(f"Visualizer {current.script} exited unexpectedly (last frame {monitor.frame}).")
+            return "exit"
+        if status == "unsupervised" and not current.unsupervised:
+            current.unsupervised = True
+            log(f"No heartbeat from {current.script} after {FIRST_FRAME_TIMEOUT:.0f} s; "
+                f"watching for exit only")
+        if status == "stalled":
+            if monitor.frame is None:
+                log(f"Stall: {current.script} started the engine but drew no frame in {FIRST_FRAME_TIMEOUT:.0f} s")
+            else:
+                log(f"Stall: {current.script} no frame for {monitor.silence() * 1000:.0f} ms "
+                    f"(last frame {monitor.frame})")
+            return "stall"
+        if status == "slow":
+            log(f"Slow: {current.script} {monitor.slow_run} frames over {SLOW_FRAME * 1000:.0f} ms "
+                f"(last {monitor.frame_ms:.0f} ms)")
+            return "slow loop"
+
 # === Controller Loop ===
+pool = []
+current = None
 try:
-    current_script = random.choice(VISUALIZERS)
-    current_proc = launch(current_script)
+    first = Candidate(random.choice(VISUALIZERS))
+    first.poll_ready(READY_TIMEOUT)
+    log(f"Launching visualizer: {first.script}")
+    pool.append(first)
+    current = switch_next(pool, None)
+    refill(pool, current.script)
+    recovering = None
 
     while True:
-        time.sleep(SWITCH_INTERVAL)
-
-        if current_proc and current_proc.poll() is not None:
-            log(f"Visualizer {current_script} exited unexpectedly.")
-            current_script = random.choice(VISUALIZERS)
-            current_proc = launch(current_script)
+        problem = watch(current, pool, SWITCH_INTERVAL, recovering)
+        recovering = None
+        if problem:
+            recovering = (problem, time.perf_counter())
+            current = switch_next(pool, current, STALL_STOP_TIMEOUT)
+            refill(pool, current.script)
             continue
 
         if random.random() < SWITCH_CHANCE:
             log(f"Switching visualizer...")
-
-            if current_proc:
-                os.killpg(os.getpgid(current_proc.pid), signal.SIGTERM)
-
-            next_script = random.choice([v for v in VISUALIZERS if v != current_script])
-            current_proc = launch(next_script)
-            current_script = next_script
+            current = switch_next(pool, current)
+            refill(pool, current.script)
         else:
-            log(f"Holding current visualizer: {current_script}")
+            log(f"Holding current visualizer: {current.script}")
 
 except KeyboardInterrupt:
     log("Visualizer controller interrupted by keyboard.")
-    if current_proc:
-        os.killpg(os.getpgid(current_proc.pid), signal.SIGTERM)
 
 except Exception as e:
     log(f"Unhandled error: {e}")
-    if current_proc:
-        os.killpg(os.getpgid(current_proc.pid), signal.SIGTERM)
 
+finally:
+    for candidate in pool + ([current] if current else []):
+        candidate.stop()
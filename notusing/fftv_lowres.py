@@ -3,6 +3,7 @@ import pyaudio
 from PIL import Image, ImageDraw
 import time
 from scipy.ndimage import median_filter
+from common import glyphs
 import subprocess
 
 import colorsys
@@ -148,11 +149,7 @@ try:
                 f.write(buf[start:end])
 
         # ASCII terminal bars (optional debug overlay)
-        ascii_bar = ''.join(['█' if val > 0.7 else
-                     '▓' if val > 0.5 else
-                     '▒' if val > 0.3 else
-                     '░' if val > 0.1 else
-                     ' ' for val in fft])
+        ascii_bar = glyphs.row(fft, " ░▒▓█", bins=[0.1, 0.3, 0.5, 0.7])
         print(ascii_bar)
 
         time.sleep(1 / TARGET_FPS)
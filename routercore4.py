@@ -10,7 +10,8 @@ import random
 import shutil
 import os
 from common import engine
-import mmap
+from common.framebuffer import map_framebuffer
+from common.renderer import CellRenderer
 
 # === Initialize Engine ===
 engine_data = engine.initialize(
@@ -23,13 +24,15 @@ cols = engine_data["cols"]
 rows = engine_data["rows"]
 
 # === State ===
-canvas = [[" " for _ in range(cols)] for _ in range(rows)]
-age = [[0 for _ in range(cols)] for _ in range(rows)]
+# The bottom row stays free, as it was when the canvas was printed line by line
+renderer = CellRenderer(cols, rows - 1)
+canvas = renderer.back
+age = np.zeros((rows - 1, cols), dtype=np.int16)
 max_age = 20
 
-chars = list("░▒▓█@#%&$+=~:;,. ")  # glitchy decay set
-colors = [f"\033[9{c}m" for c in range(1, 7)]
-RESET = "\033[0m"
+chars = np.array(list("░▒▓█@#%&$+=~:;,. "))  # glitchy decay set
+colors = list(range(91, 97))  # bright red .. cyan
+WHITE = 97
 
 # === Load Lyrics ===
 with open("./out_there.txt") as f:
@@ -46,8 +49,7 @@ def draw_waveform(samples):
             fb_width, fb_height = get_fb_geometry()
             fb_size = fb_width * fb_height * 2  # 2 bytes per pixel
             
-            fb_file = open("/dev/fb0", "rb+")
-            draw_waveform.fb_mmap = mmap.mmap(fb_file.fileno(), fb_size)
+            draw_waveform.fb_mmap = map_framebuffer(fb_size)
             draw_waveform.fb_width = fb_width
             draw_waveform.fb_height = fb_height
         
@@ -97,30 +99,33 @@ def get_fb_geometry():
         return (320, 240)  # Default fallback
 
 def draw_line(text, x, y, color):
-    for i, char in enumerate(text):
-        if 0 <= x + i < cols and 0 <= y < rows:
-            canvas[y][x + i] = f"{color}{char}{RESET}"
-            age[y][x + i] = max_age
+    if 0 <= y < rows - 1:
+        renderer.put(x, y, text, fg=color)
+        start, end = max(x, 0), min(x + len(text), cols)
+        age[y, start:end] = max_age
 
 def decay_canvas():
-    for y in range(rows):
-        for x in range(cols):
-            if age[y][x] > 0:
-                age[y][x] -= 1
-                if age[y][x] == 0:
-                    canvas[y][x] = " "
-                elif random.random() < 0.02:
-                    canvas[y][x] = random.choice(chars)
+    alive = age > 0
+    age[alive] -= 1
+    expired = alive & (age == 0)
+    canvas.chars[expired] = " "
+    canvas.fg[expired] = 0
+    # Surviving cells occasionally glitch into an uncolored decay glyph
+    glitch = alive & ~expired & (np.random.random(age.shape) < 0.02)
+    canvas.chars[glitch] = np.random.choice(chars, np.count_nonzero(glitch))
+    canvas.fg[glitch] = 0
 
 def render():
-    print("\033[2J\033[H", end="")
-    for y in range(rows - 1):
-        line = ""
-        for x in range(cols):
-            cell = canvas[y][x]
-            line += cell
-        print(line)
-    print(RESET, end="")
+    # Only the cells that changed since the last frame are sent
+    renderer.present()
+
+def setup():
+    # Whatever was on screen before isn't this canvas: repaint it all
+    renderer.invalidate()
+    engine.AudioEngine.get_instance().renderer = renderer
+
+def teardown():
+    engine.AudioEngine.get_instance().renderer = None
 
 # === Main Loop Function ===
 def main_loop(data):
@@ -149,7 +154,7 @@ def main_loop(data):
 
         color_chance = random.random()
         if color_chance < 0.9:
-            color = "\033[97m"  # Mostly white
+            color = WHITE  # Mostly white
         else:
             color = random.choice(colors)
 
@@ -161,8 +166,9 @@ def main_loop(data):
         for _ in range(3):
             gx = random.randint(0, cols - 1)
             gy = random.randint(0, rows - 2)
-            canvas[gy][gx] = random.choice(chars)
-            age[gy][gx] = random.randint(3, max_age)
+            canvas.chars[gy, gx] = random.choice(chars)
+            canvas.fg[gy, gx] = 0
+            age[gy, gx] = random.randint(3, max_age)
 
     # Update display
     decay_canvas()
@@ -170,8 +176,11 @@ def main_loop(data):
     draw_waveform(samples)
 
 # === Run Engine ===
-print("[lyric_canvas] Starting with engine...")
-try:
-    engine.run(engine_data, main_loop)
-except KeyboardInterrupt:
-    print("\033[0m\n[lyric_canvas] Terminated.")
+if __name__ == "__main__":
+    print("[lyric_canvas] Starting with engine...")
+    print("\033[2J", end="")
+    setup()
+    try:
+        engine.run(engine_data, main_loop)
+    except KeyboardInterrupt:
+        print("\033[0m\n[lyric_canvas] Terminated.")
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Long-lived visualizer host: one engine and audio stream, visualizers swapped in-process.
+
+Visualizer modules are loaded as plugins. A plugin is any engine visualizer
+module with a ``main_loop(data)``; optional ``setup()`` and ``teardown()``
+run when it becomes active and when it is swapped out. Their import-time
+``engine.initialize(...)`` calls get the already-running engine back, and
+their ``engine.run(...)`` sits behind ``if __name__ == "__main__"``, so
+importing them only defines state and functions.
+
+Swaps happen between frames when the engine's random ``frames_left`` budget
+(``min_frames``..``max_frames`` in config) runs out. All plugins are imported
+up front, so a swap costs one teardown/setup rather than a new process. The
+outgoing picture then dissolves into the incoming one over
+``TRANSITION["frames"]`` frames (see common/transition.py).
+
+    python3 vis_host.py
+    python3 vis_host.py --interface synth conway bilbo3
+"""
+
+import argparse
+import importlib
+import random
+import sys
+import time
+import traceback
+
+from common.config import supported_visualizers, TRANSITION
+from common.engine import AudioEngine
+from common.transition import ScreenTap, Transition, uses_framebuffer
+
+# === Init Log ===
+# stdout is the display, so the host only logs to the file
+LOGFILE = "/tmp/vis_host_log.txt"
+def log(msg):
+    timestamp = time.strftime("[%Y-%m-%d %H:%M:%S]")
+    with open(LOGFILE, "a") as f:
+        f.write(f"{timestamp} {msg}\n")
+
+
+class VisualizerHost:
+    def __init__(self, engine, names, tap=None, transition_frames=TRANSITION["frames"]):
+        self.engine = engine
+        self.tap = tap
+        self.transition_frames = transition_frames
+        self.transition = None
+        self.plugins = {}
+        for name in names:
+            started = time.perf_counter()
+            try:
+                self.plugins[name] = importlib.import_module(name)
+            except Exception as e:
+                log(f"Skipping {name}: {e!r}")
+                continue
+            log(f"Loaded {name} in {(time.perf_counter() - started) * 1000:.0f} ms")
+        if not self.plugins:
+            raise RuntimeError("No visualizer could be loaded")
+        self.current = None
+
+    def _guarded(self, name, main_loop):
+        def loop_func(data):
+            try:
+                main_loop(data)
+            except Exception:
+                # A broken plugin shouldn't take the stream down; move on at the end of this frame
+                log(f"{name} failed:\n{traceback.format_exc()}")
+                self.engine.frames_left = 0
+            if self.transition:
+                self._step_transition()
+        return loop_func
+
+    def _step_transition(self):
+        transition = self.transition
+        with self.engine.stage("transition"):
+            transition.step(1 / self.engine.fps)
+        if transition.overran and not transition.done:
+            log(f"Transition step took {transition.step_ms:.1f} ms, finishing it")
+        if transition.done:
+            self.transition = None
+
+    def _start_transition(self, previous, name):
+        """Composite ``previous``'s last picture into ``name``; False when cutting straight over"""
+        if self.transition:
+            self.transition.close()
+            self.transition = None
+        if not (self.tap and previous and self.transition_frames > 0):
+            return False
+        framebuffer = uses_framebuffer(self.plugins[previous]) or uses_framebuffer(self.plugins[name])
+        self.transition = Transition(self.tap, self.engine.cols, self.engine.rows, self.transition_frames,
+                                     TRANSITION["style"], framebuffer=framebuffer)
+        log(f"Transition over {self.transition_frames} frames (screen captured in {self.transition.setup_ms:.1f} ms)")
+        return True
+
+    def activate(self, name):
+        """Swap to plugin ``name``; returns its loop function"""
+        started = time.perf_counter()
+        previous = self.current
+        if previous and hasattr(self.plugins[previous], "teardown"):
+            self.plugins[previous].teardown()
+        if not self._start_transition(previous, name):
+            print("\033[0m\033[2J\033[H", end="")
+        plugin = self.plugins[name]
+        if hasattr(plugin, "setup"):
+            plugin.setup()
+        self.current = name
+        self.engine.active_visualizer = name
+        log(f"Switched {previous} -> {name} in {(time.perf_counter() - started) * 1000:.1f} ms")
+        return self._guarded(name, plugin.main_loop)
+
+    def next(self):
+        """Random plugin other than the current one (when there is a choice)"""
+        choices = [name for name in self.plugins if name != self.current] or list(self.plugins)
+        return self.activate(random.choice(choices))
+
+    def teardown(self):
+        if self.transition:
+            self.transition.close()
+            self.transition = None
+        if self.current and hasattr(self.plugins[self.current], "teardown"):
+            self.plugins[self.current].teardown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("visualizers", nargs="*", default=supported_visualizers)
+    parser.add_argument("--interface", default="focusrite2i4")
+    parser.add_argument("--processor", default="default")
+    parser.add_argument("--transition-frames", type=int, default=TRANSITION["frames"],
+                        help="frames to dissolve over at each swap (0 cuts straight over)")
+    parser.add_argument("--debug", action="store_true")
+    args = parser.parse_args()
+
+    log("Visualizer host started")
+    engine = AudioEngine()
+    engine.initialize(interface_type=args.interface, processor_type=args.processor, debug=args.debug)
+    # From here on, plugins' own initialize() calls return this engine as is
+    engine.hosted = True
+    # Remembers what is on screen so a swap can dissolve from it
+    tap = sys.stdout = ScreenTap(sys.stdout)
+    host = VisualizerHost(engine, args.visualizers, tap, args.transition_frames)
+
+    # run() draws the first budget; the plugin gets the frames it leaves
+    loop_func = host.next()
+    try:
+        engine.run(loop_func, loop=True, on_expire=host.next)
+    finally:
+        host.teardown()
+        log("Visualizer host stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -28,6 +28,7 @@ import termios
 import fcntl
 import tty
 from scipy.ndimage import median_filter
+from common.renderer import cursor_table, encode_row
 
 # === Terminal Geometry ===
 def get_terminal_size():
@@ -79,8 +80,15 @@ text_cool = 0
 text_lines = []
 
 # Grid buffers
-grid = [[" "]*cols for _ in range(rows)]
-age  = [[0]*cols for _ in range(rows)]
+grid = np.full((rows, cols), " ", dtype="<U1")
+age  = np.zeros((rows, cols), dtype=np.int16)
+
+# === Output tables ===
+RESET = "\033[0m"
+# encode_row attributes: 0 default, 1-6 rainbow, then white and dim
+WHITE, DIM = 7, 8
+sgr = [RESET] + [f"\033[9{c}m" for c in range(1, 7)] + ["\033[97m", "\033[90m"]
+cursor = cursor_table(cols, rows)
 
 # === Terminal input setup ===
 fd = sys.stdin.fileno()
@@ -197,12 +205,9 @@ try:
             trigger_text_event()
 
         # — fade grid —
-        for y in range(rows):
-            for x in range(cols):
-                if age[y][x]>0:
-                    age[y][x] -=1
-                    if age[y][x]==0:
-                        grid[y][x] = " "
+        alive = age > 0
+        age[alive] -= 1
+        grid[alive & (age == 0)] = " "
 
         # — spawn new chars —
         for _ in range(density):
@@ -213,24 +218,23 @@ try:
             else:
                 idx = int(energy * (len(palette)-1))
                 c = palette[random.randint(0, idx)]
-            grid[y][x] = str(c)[0]
-            age[y][x] = random.randint(1, fade_dur)
+            grid[y, x] = str(c)[0]
+            age[y, x] = random.randint(1, fade_dur)
 
         # — render —
-        sys.stdout.write("\033[2J\033[H")
-        for y in range(rows):
-            line = []
-            for x in range(cols):
-                if age[y][x]>0:
-                    ch = grid[y][x]
-                    if rainbow and random.random()<0.02:
-                        color = f"\033[9{random.randint(1,6)}m"
-                    else:
-                        color = "\033[97m" if not invert else "\033[90m"
-                    line.append(f"{color}{ch}\033[0m")
-                else:
-                    line.append(" ")
-            sys.stdout.write("".join(line) + "\n")
+        alive = age > 0
+        attrs = np.where(alive, DIM if invert else WHITE, 0)
+        if rainbow:
+            flicker = alive & (np.random.random(alive.shape) < 0.02)
+            attrs[flicker] = np.random.randint(1, 7, np.count_nonzero(flicker))
+        glyphs = np.where(alive, grid, " ")
+        # One SGR per color change along the row instead of a color/reset pair per cell
+        lines = []
+        current = 0
+        for row_glyphs, row_attrs in zip(glyphs, attrs):
+            line, current = encode_row(row_glyphs, row_attrs, sgr, current, fill_blanks=True)
+            lines.append(line)
+        sys.stdout.write("\033[2J\033[H" + "\n".join(lines) + RESET + "\n")
         sys.stdout.flush()
 
         # — draw text event overlay —
@@ -240,7 +244,8 @@ try:
                 y = start + i
                 if 0 <= y < rows:
                     pad = max(0, (cols - len(txt))//2)
-                    sys.stdout.write(f"\033[{y};{pad}H\033[1;37m{txt[:cols]}\033[0m")
+                    # Row/column 0 in the escape meant the first one, as index 0 does here
+                    sys.stdout.write(f"{cursor[max(y - 1, 0)][max(pad - 1, 0)]}\033[1;37m{txt[:cols]}\033[0m")
             text_timer -= 1
         if text_cool>0:
             text_cool -= 1
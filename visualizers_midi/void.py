@@ -7,10 +7,18 @@ hold multiple keys at once to blend them.
 ‘/’, ‘*’, ‘-’ spawn ASCII explosions. Press ‘0’ for info.
 Ctrl+C to quit.
 """
-import os, sys, random, time, shutil
+import os, sys, random
 import termios, tty, fcntl
-import numpy as np, pyaudio
-from scipy.ndimage import median_filter
+import numpy as np
+from common import engine
+
+# === Initialize Engine ===
+# Percentile-normalized square-root spectrum: the "void" processor (common/processors.py)
+engine_data = engine.initialize(
+    interface_type="behringer",
+    processor_type="void",
+    debug=False
+)
 
 # === Load random words/phrases ===
 WORDS_FILE = os.path.expanduser("~/visualizers/out_there.txt")
@@ -18,20 +26,8 @@ with open(WORDS_FILE, "r") as f:
     WORDS = [w.strip() for w in f if w.strip()]
 
 # === Terminal geometry ===
-def get_terminal_size():
-    ts = shutil.get_terminal_size(fallback=(80,24))
-    return ts.columns, ts.lines - 1
-cols, rows = get_terminal_size()
-
-# === Audio setup ===
-CHUNK, RATE = 1024, 44100
-FORMAT, CHANNELS = pyaudio.paInt16, 2
-INPUT_INDEX = 1
-p = pyaudio.PyAudio()
-stream = p.open(format=FORMAT, channels=CHANNELS,
-                rate=RATE, input=True,
-                input_device_index=INPUT_INDEX,
-                frames_per_buffer=CHUNK)
+cols, rows = engine_data["cols"], engine_data["rows"] - 1
+# Smoothed spectrum of the current frame, for the bar and waveform events
 prev_fft = np.zeros(64)
 
 # === Terminal input setup ===
@@ -162,46 +158,37 @@ EXPLOSIONS = {'/':explosion_radial,'*':explosion_asterisk,'-':explosion_shockwav
 # === Main Loop ===
 active_events=set(); current_event=None
 scroll_pos=0; phrase=''; explosion_key=None
-clear_screen()
-try:
-    while True:
-        # key input
-        try: ch=sys.stdin.read(1)
-        except: ch=None
-        if ch in EVENTS:
-            # toggle event
-            if ch in active_events: active_events.remove(ch)
-            else: active_events.add(ch)
-            clear_screen()
-        elif ch in EXPLOSIONS:
-            explosion_key=ch
-        elif ch=='0':
-            draw_info(); active_events.clear(); continue
-
-        # audio FFT
-        data=stream.read(CHUNK,exception_on_overflow=False)
-        samples=np.frombuffer(data,dtype=np.int16)[::2]
-        if np.max(np.abs(samples))<80:
-            fft=np.zeros_like(prev_fft)
-        else:
-            raw=np.abs(np.fft.fft(samples))[:CHUNK//2]
-            fft=np.interp(np.linspace(0,len(raw),len(prev_fft)),np.arange(len(raw)),raw)
-            fft/=(np.percentile(fft,98)+1e-6)
-            fft=np.clip(np.sqrt(fft),0,1)
-            fft=median_filter(fft,size=1)
-        prev_fft[:]=0.3*prev_fft+0.7*fft
-        energy=float(np.mean(prev_fft))
-
-        # draw events
+
+def main_loop(data):
+    global prev_fft, explosion_key
+    # key input
+    try: ch=sys.stdin.read(1)
+    except: ch=None
+    if ch in EVENTS:
+        # toggle event
+        if ch in active_events: active_events.remove(ch)
+        else: active_events.add(ch)
         clear_screen()
-        for ev in active_events: EVENTS[ev](energy)
-        if explosion_key:
-            EXPLOSIONS[explosion_key](energy)
-            explosion_key=None
+    elif ch in EXPLOSIONS:
+        explosion_key=ch
+    elif ch=='0':
+        draw_info(); active_events.clear(); return
 
-        sys.stdout.flush(); time.sleep(1/30)
+    # audio FFT (the "void" processor)
+    prev_fft=data["fft"]
+    energy=float(data["total_energy"])
 
-except KeyboardInterrupt: pass
-finally:
-    restore_terminal(); stream.stop_stream(); stream.close(); p.terminate()
-    print("\033[0m\n[voidcore_events] Exited.")
+    # draw events
+    clear_screen()
+    for ev in active_events: EVENTS[ev](energy)
+    if explosion_key:
+        EXPLOSIONS[explosion_key](energy)
+        explosion_key=None
+
+if __name__ == "__main__":
+    clear_screen()
+    try:
+        engine.run(engine_data, main_loop)
+    finally:
+        restore_terminal()
+        print("\033[0m\n[voidcore_events] Exited.")
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Live view of a running engine's metrics (start it with VISPI_METRICS set).
+
+    python3 watch_metrics.py                      # default socket, refresh every second
+    python3 watch_metrics.py 127.0.0.1:9100 -i 0.5
+    python3 watch_metrics.py --once               # one JSON snapshot, for scripts
+"""
+
+import argparse
+import json
+import time
+
+from common.metrics import DEFAULT_SOCKET, fetch
+
+
+def render(m: dict) -> str:
+    lines = [
+        f"{m['visualizer']} (pid {m['pid']}, up {m['uptime_s']:.0f}s)  {m['interface']} / {m['processor']}",
+        f"fps {m['fps']:6.1f} / {m['target_fps'] or 0:.1f}   frames {m['frames']}   left {m['frames_left']}",
+        f"dropped {m['dropped_frames']}   missed {m['missed_deadlines']}   jitter p99 {m['jitter_p99_ms']:.2f} ms"
+        f"   input overflows {m['input_overflows']}   torn reads {m['capture_overruns']}"
+        f"   capture behind {m['capture_pending']}",
+    ]
+    if "cpu_percent" in m:
+        lines.append(f"cpu {m['cpu_percent']:5.1f}%   rss {m['rss_mb']:.1f} MB   "
+                     f"system cpu {m['system_cpu_percent']:.1f}%   memory {m['system_memory_percent']:.1f}%")
+    if m.get("output"):
+        o = m["output"]
+        lines.append(f"output {o['bytes_per_frame']:.0f} B/frame (full repaint {o['full_bytes']} B)   "
+                     f"{o['cells_per_frame']:.0f} cells/frame   write {o['write_ms_per_frame']:.3f} ms")
+    if m.get("frame_output"):
+        o = m["frame_output"]
+        lines.append(f"frame output {o['bytes_per_frame']:.0f} B/frame   write {o['write_ms_per_frame']:.3f} ms")
+    lines.append("")
+    lines.append(f"{'stage':<32}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for name, s in m["stages"].items():
+        lines.append(f"{name:<32}{s['p50_ms']:>9.3f}{s['p95_ms']:>9.3f}{s['p99_ms']:>9.3f}{s['max_ms']:>9.3f}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("address", nargs="?", default=DEFAULT_SOCKET, help="socket path or host:port")
+    parser.add_argument("-i", "--interval", type=float, default=1.0)
+    parser.add_argument("--once", action="store_true", help="print one snapshot as JSON and exit")
+    args = parser.parse_args()
+
+    if args.once:
+        print(json.dumps(fetch(args.address), indent=2))
+        return
+    try:
+        while True:
+            try:
+                screen = render(fetch(args.address))
+            except (OSError, ValueError) as e:
+                screen = f"No engine at {args.address} ({e})"
+            print("\033[2J\033[H" + screen, flush=True)
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ import time
 import sys
 import shutil
 from scipy.ndimage import median_filter
+from common.canvas import BrailleCanvas
 
 # === TERMINAL CONFIG ===
 def get_terminal_size():
@@ -14,7 +15,9 @@ cols, rows = get_terminal_size()
 # Initialize waveform buffer
 WAVEFORM_WIDTH = cols
 WAVEFORM_HEIGHT = rows - 1  # Leave one line for cursor
-waveform_buffer = np.zeros(WAVEFORM_WIDTH)
+# Braille cells: 2x4 dots each, so the waveform scrolls and rises in sub-cell steps
+canvas = BrailleCanvas(WAVEFORM_WIDTH, WAVEFORM_HEIGHT)
+waveform_buffer = np.zeros(canvas.width)
 
 def display_waveform(bounce_energy: float):
     """Display the bounce energy as a tall scrolling waveform using the full screen height."""
@@ -24,30 +27,11 @@ def display_waveform(bounce_energy: float):
     waveform_buffer = np.roll(waveform_buffer, 1)
     waveform_buffer[0] = bounce_energy
     
-    # Move cursor to top-left without clearing screen
-    print('\033[H', end='')
+    canvas.clear()
+    canvas.fill_columns(waveform_buffer)
     
-    # Create a 2D array for the full height display
-    display = np.zeros((WAVEFORM_HEIGHT, WAVEFORM_WIDTH))
-    
-    # Fill the display array based on the waveform height
-    for x in range(WAVEFORM_WIDTH):
-        height = int(waveform_buffer[x] * WAVEFORM_HEIGHT)
-        if height > 0:
-            display[WAVEFORM_HEIGHT-height:, x] = 1
-    
-    # Display using block characters
-    blocks = '▁▂▃▄▅▆▇█'
-    for row in range(WAVEFORM_HEIGHT):
-        waveform_line = ''
-        for col in range(WAVEFORM_WIDTH):
-            if display[row, col]:
-                # Use different blocks based on position in the waveform
-                block_idx = min(int((WAVEFORM_HEIGHT - row) / WAVEFORM_HEIGHT * len(blocks)), len(blocks) - 1)
-                waveform_line += blocks[block_idx]
-            else:
-                waveform_line += ' '
-        print(waveform_line, end='\r\n', flush=True)
+    # Move cursor to top-left without clearing screen, then the whole frame in one print
+    print('\033[H' + '\r\n'.join(canvas.lines()), end='\r\n', flush=True)
 
 # === AUDIO CONFIG ===
 CHUNK = 1024